@@ -1,20 +1,34 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.v1.endpoints import auth, protected_example, mentors, resources, users
+from app.api.v1.endpoints import auth, protected_example, mentors, resources, users, chat, quiz, flashcards
+from app.core.ratelimit import rate_limit
 
 api_router = APIRouter()
 
+# Every authenticated route takes a token from the user's "api" bucket;
+# uploads and chat also take one from their own, smaller buckets
+api_limit = [Depends(rate_limit("api"))]
+
 # Include authentication routes
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 
 # Include user management routes
-api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(users.router, prefix="/users", tags=["users"], dependencies=api_limit)
 
 # Include mentor management routes
-api_router.include_router(mentors.router, prefix="/mentors", tags=["mentors"])
+api_router.include_router(mentors.router, prefix="/mentors", tags=["mentors"], dependencies=api_limit)
+
+# Include mentor chat routes
+api_router.include_router(chat.router, prefix="/mentors", tags=["chat"], dependencies=api_limit)
+
+# Include mentor quiz routes
+api_router.include_router(quiz.router, prefix="/mentors", tags=["quiz"], dependencies=api_limit)
+
+# Include flashcard routes
+api_router.include_router(flashcards.router, prefix="/flashcards", tags=["flashcards"], dependencies=api_limit)
 
 # Include resource management routes
-api_router.include_router(resources.router, prefix="/resources", tags=["resources"])
+api_router.include_router(resources.router, prefix="/resources", tags=["resources"], dependencies=api_limit)
 
 # Include example protected routes (remove in production)
-api_router.include_router(protected_example.router, prefix="/examples", tags=["examples"])
+api_router.include_router(protected_example.router, prefix="/examples", tags=["examples"], dependencies=api_limit)
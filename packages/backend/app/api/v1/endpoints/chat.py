@@ -0,0 +1,70 @@
+import time
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.core.ratelimit import rate_limit
+from app.schemas.user import User
+from app.schemas.chat import ChatRequest
+from app.db.client import async_supabase
+
+router = APIRouter()
+
+@router.post("/{mentor_id}/chat")
+async def chat_with_mentor(
+    mentor_id: str,
+    chat_request: ChatRequest,
+    current_user: User = Depends(rate_limit("chat"))
+):
+    """
+    Ask a mentor a question and stream the answer over Server-Sent Events.
+
+    Retrieval over the mentor's resources and the conversation-history load
+    run concurrently before the first token; the answer is then streamed as
+    ``sources``, ``token`` and ``done`` events. The ``done`` event carries
+    time-to-first-token and tokens/sec for the request.
+
+    Args:
+        mentor_id: ID of the mentor to ask
+        chat_request: ChatRequest schema with the user's message
+        current_user: Authenticated user from JWT token
+
+    Returns:
+        StreamingResponse: ``text/event-stream`` response with the answer
+
+    Raises:
+        HTTPException: 404 if mentor not found, 400 if the context cannot be loaded
+    """
+    started = time.perf_counter()
+    asked_at = datetime.utcnow()
+
+    # The chat pipeline (retrieval, numpy, LLM client) loads on the first
+    # chat request instead of at startup
+    from app.services.chat import load_chat_context, stream_chat_events
+    from app.services.llm import get_llm_client
+
+    try:
+        client = async_supabase()
+        llm = get_llm_client()
+        context = await load_chat_context(client, mentor_id, current_user.id, chat_request.message)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to start chat: {str(e)}"
+        )
+
+    if context is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Mentor not found"
+        )
+
+    return StreamingResponse(
+        stream_chat_events(client, llm, context, chat_request.message, current_user.id, asked_at, started),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Disable proxy buffering so tokens reach the client immediately
+            "X-Accel-Buffering": "no"
+        }
+    )
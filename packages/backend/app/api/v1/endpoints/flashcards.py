@@ -0,0 +1,131 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.ratelimit import rate_limit
+from app.core.security import get_current_user
+from app.schemas.user import User
+from app.schemas.mentor import Mentor
+from app.schemas.flashcard import (
+    DueFlashcards,
+    FlashcardGenerate,
+    FlashcardGeneration,
+    FlashcardReviewBatch,
+    FlashcardReviewResult
+)
+from app.crud.crud_mentor import get_mentor_by_id
+from app.db.client import async_supabase
+from app.services.cache import get_response_cache, mentor_scope
+from app.services.flashcards import get_due_cards, submit_reviews
+from workers.enqueue import enqueue_flashcard_generation
+
+router = APIRouter()
+
+@router.post("/generate", response_model=FlashcardGeneration, status_code=status.HTTP_202_ACCEPTED)
+async def generate_flashcards(
+    generate_data: FlashcardGenerate,
+    current_user: User = Depends(rate_limit("chat"))
+):
+    """
+    Generate a batch of flashcards from a mentor's resources.
+    
+    Generation runs in the background (it shares the chat rate limit, as
+    both spend LLM tokens); the new cards are due immediately and show up
+    in ``/flashcards/due`` once written.
+    
+    Args:
+        generate_data: FlashcardGenerate schema with the mentor, resource and card count
+        current_user: Authenticated user from JWT token
+        
+    Returns:
+        FlashcardGeneration: The accepted request
+        
+    Raises:
+        HTTPException: 404 if mentor not found or not owned by user, 400 if it cannot be scheduled
+    """
+    try:
+        client = async_supabase()
+        mentor = await get_response_cache().get_or_load(
+            [mentor_scope(generate_data.mentor_id)],
+            f"mentor:{current_user.id}:{generate_data.mentor_id}",
+            Mentor,
+            lambda: get_mentor_by_id(client, generate_data.mentor_id, current_user.id)
+        )
+        
+        if not mentor:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Mentor not found"
+            )
+        
+        await asyncio.to_thread(
+            enqueue_flashcard_generation,
+            current_user.id, generate_data.mentor_id, generate_data.resource_id, generate_data.card_count
+        )
+        
+        return FlashcardGeneration(
+            mentor_id=generate_data.mentor_id,
+            resource_id=generate_data.resource_id,
+            card_count=generate_data.card_count
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to schedule flashcard generation: {str(e)}"
+        )
+
+@router.get("/due", response_model=DueFlashcards)
+async def get_due_flashcards(
+    mentor_id: Optional[str] = Query(None, description="Only cards of this mentor"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of cards"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the current user's cards that are due for review, earliest first.
+    
+    Args:
+        mentor_id: Only return cards of this mentor
+        limit: Maximum number of cards
+        current_user: Authenticated user from JWT token
+        
+    Returns:
+        DueFlashcards: Due cards and when the next one becomes due
+    """
+    try:
+        client = async_supabase()
+        return await get_due_cards(client, current_user.id, mentor_id, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to retrieve due flashcards: {str(e)}"
+        )
+
+@router.post("/reviews", response_model=FlashcardReviewResult)
+async def review_flashcards(
+    review_data: FlashcardReviewBatch,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Record a study session's reviews in one request.
+    
+    Clients should buffer answers and submit them in batches (e.g. every
+    few cards and at the end of the session); each batch is stored with a
+    single write.
+    
+    Args:
+        review_data: FlashcardReviewBatch schema with the reviews
+        current_user: Authenticated user from JWT token
+        
+    Returns:
+        FlashcardReviewResult: Rescheduled cards and IDs that were not found
+    """
+    try:
+        client = async_supabase()
+        return await submit_reviews(client, current_user.id, review_data.reviews)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to store flashcard reviews: {str(e)}"
+        )
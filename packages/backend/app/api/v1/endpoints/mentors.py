@@ -1,9 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 
+from app.core.etag import conditional_response, rows_etag
 from app.core.security import get_current_user
 from app.schemas.user import User
 from app.schemas.mentor import MentorCreate, MentorUpdate, Mentor
+from app.schemas.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
 from app.crud.crud_mentor import (
     create_mentor,
     get_mentors_by_user,
@@ -11,7 +14,9 @@ from app.crud.crud_mentor import (
     update_mentor,
     delete_mentor
 )
-from app.db.client import supabase
+from app.db.client import async_supabase
+from app.services.cache import get_response_cache, mentor_resources_scope, mentor_scope, user_mentors_scope
+from workers.enqueue import enqueue_mentor_cleanup
 
 router = APIRouter()
 
@@ -34,8 +39,11 @@ async def create_new_mentor(
         HTTPException: 400 if creation fails
     """
     try:
-        client = supabase()
-        mentor = create_mentor(client, mentor_data, current_user.id)
+        client = async_supabase()
+        mentor = await create_mentor(client, mentor_data, current_user.id)
+        
+        await get_response_cache().invalidate(user_mentors_scope(current_user.id))
+        
         return mentor
     except Exception as e:
         raise HTTPException(
@@ -43,24 +51,44 @@ async def create_new_mentor(
             detail=f"Failed to create mentor: {str(e)}"
         )
 
-@router.get("/", response_model=List[Mentor])
-async def get_user_mentors(current_user: User = Depends(get_current_user)):
+@router.get("/", response_model=Page[Mentor])
+async def get_user_mentors(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user)
+):
     """
-    Get all mentors belonging to the authenticated user.
+    Get a page of the mentors belonging to the authenticated user.
+    
+    The response carries an ETag built from the mentors' versions; a request
+    whose If-None-Match matches gets an empty 304.
     
     Args:
+        response: Outgoing response (for the ETag header)
+        limit: Maximum number of mentors to return
+        cursor: next_cursor from the previous page (omit for the first page)
+        if_none_match: ETag of the copy the client already has
         current_user: Authenticated user from JWT token
         
     Returns:
-        List[Mentor]: List of user's mentors
+        Page[Mentor]: Page of user's mentors and the next page's cursor
         
     Raises:
-        HTTPException: 400 if retrieval fails
+        HTTPException: 400 if retrieval fails or the cursor is invalid
     """
     try:
-        client = supabase()
-        mentors = get_mentors_by_user(client, current_user.id)
-        return mentors
+        client = async_supabase()
+        mentors = await get_response_cache().get_or_load(
+            [user_mentors_scope(current_user.id)],
+            f"mentors:{current_user.id}:{limit}:{cursor or ''}",
+            Page[Mentor],
+            lambda: get_mentors_by_user(client, current_user.id, limit, cursor)
+        )
+        
+        not_modified = conditional_response(response, rows_etag(mentors.items, mentors.next_cursor), if_none_match)
+        return not_modified or mentors
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,13 +98,20 @@ async def get_user_mentors(current_user: User = Depends(get_current_user)):
 @router.get("/{mentor_id}", response_model=Mentor)
 async def get_mentor(
     mentor_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get a specific mentor by ID.
     
+    Supports conditional requests: If-None-Match with the current ETag gets
+    an empty 304.
+    
     Args:
         mentor_id: ID of the mentor to retrieve
+        response: Outgoing response (for the ETag header)
+        if_none_match: ETag of the copy the client already has
         current_user: Authenticated user from JWT token
         
     Returns:
@@ -86,8 +121,13 @@ async def get_mentor(
         HTTPException: 404 if mentor not found or not owned by user
     """
     try:
-        client = supabase()
-        mentor = get_mentor_by_id(client, mentor_id, current_user.id)
+        client = async_supabase()
+        mentor = await get_response_cache().get_or_load(
+            [mentor_scope(mentor_id)],
+            f"mentor:{current_user.id}:{mentor_id}",
+            Mentor,
+            lambda: get_mentor_by_id(client, mentor_id, current_user.id)
+        )
         
         if not mentor:
             raise HTTPException(
@@ -95,7 +135,8 @@ async def get_mentor(
                 detail="Mentor not found"
             )
         
-        return mentor
+        not_modified = conditional_response(response, rows_etag([mentor]), if_none_match)
+        return not_modified or mentor
     except HTTPException:
         raise
     except Exception as e:
@@ -125,8 +166,8 @@ async def update_existing_mentor(
         HTTPException: 404 if mentor not found, 400 if update fails
     """
     try:
-        client = supabase()
-        mentor = update_mentor(client, mentor_id, update_data, current_user.id)
+        client = async_supabase()
+        mentor = await update_mentor(client, mentor_id, update_data, current_user.id)
         
         if not mentor:
             raise HTTPException(
@@ -134,6 +175,8 @@ async def update_existing_mentor(
                 detail="Mentor not found"
             )
         
+        await get_response_cache().invalidate(user_mentors_scope(current_user.id), mentor_scope(mentor_id))
+        
         return mentor
     except HTTPException:
         raise
@@ -151,6 +194,9 @@ async def delete_existing_mentor(
     """
     Delete a mentor.
     
+    The mentor's stored files and vector index are removed by a background
+    job, so the request returns immediately.
+    
     Args:
         mentor_id: ID of the mentor to delete
         current_user: Authenticated user from JWT token
@@ -159,8 +205,8 @@ async def delete_existing_mentor(
         HTTPException: 404 if mentor not found, 400 if deletion fails
     """
     try:
-        client = supabase()
-        success = delete_mentor(client, mentor_id, current_user.id)
+        client = async_supabase()
+        success = await delete_mentor(client, mentor_id, current_user.id)
         
         if not success:
             raise HTTPException(
@@ -168,6 +214,16 @@ async def delete_existing_mentor(
                 detail="Mentor not found"
             )
         
+        # The mentor's resources are deleted with it
+        await get_response_cache().invalidate(
+            user_mentors_scope(current_user.id),
+            mentor_scope(mentor_id),
+            mentor_resources_scope(mentor_id)
+        )
+        
+        # Remove the mentor's stored files in the background
+        await asyncio.to_thread(enqueue_mentor_cleanup, current_user.id, mentor_id)
+        
         return None
     except HTTPException:
         raise
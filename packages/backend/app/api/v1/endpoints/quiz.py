@@ -0,0 +1,89 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.schemas.user import User
+from app.schemas.quiz import Quiz, QuizPool, QuizRequest
+from app.crud.crud_quiz import get_quiz_pool
+from app.db.client import async_supabase
+from app.services.cache import get_response_cache, mentor_quiz_scope, mentor_resources_scope, mentor_scope
+from app.services.quiz import request_pool_refresh, select_questions
+
+router = APIRouter()
+
+@router.post("/{mentor_id}/quiz", response_model=Quiz)
+async def generate_quiz(
+    mentor_id: str,
+    quiz_request: QuizRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Build a multiple-choice quiz over a mentor's resources.
+    
+    Questions are drawn from the mentor's precomputed question pool, so no
+    LLM call is made while the user waits. When the mentor's analyzed
+    resources changed since the pool was generated, the quiz is built from
+    the questions of the resources already pooled and a background refresh
+    generates questions for the rest.
+    
+    Args:
+        mentor_id: ID of the mentor
+        quiz_request: QuizRequest schema with the resource, length and difficulty
+        current_user: Authenticated user from JWT token
+        
+    Returns:
+        Quiz: Up to ``num_questions`` questions with their answers
+        
+    Raises:
+        HTTPException: 404 if the mentor or resource is not found, 409 while
+        the pool is still being generated, 422 if the resources have no
+        material to ask about
+    """
+    try:
+        client = async_supabase()
+        pool = await get_response_cache().get_or_load(
+            [mentor_scope(mentor_id), mentor_resources_scope(mentor_id), mentor_quiz_scope(mentor_id)],
+            f"quiz_pool:{current_user.id}:{mentor_id}:{quiz_request.difficulty.value}",
+            QuizPool,
+            lambda: get_quiz_pool(client, mentor_id, current_user.id, quiz_request.difficulty),
+            ttl=settings.quiz_pool_cache_ttl_seconds
+        )
+        
+        if pool is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Mentor not found"
+            )
+        
+        if quiz_request.resource_id is not None and quiz_request.resource_id not in pool.resource_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resource not found or not analyzed yet"
+            )
+        
+        if pool.stale:
+            await asyncio.to_thread(request_pool_refresh, mentor_id)
+        
+        questions = select_questions(pool, quiz_request)
+        
+        if not questions and pool.stale:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Quiz questions are still being generated",
+                headers={"Retry-After": "30"}
+            )
+        if not questions:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="No analyzed resource has material for a quiz"
+            )
+        
+        return Quiz(mentor_id=mentor_id, difficulty=quiz_request.difficulty, questions=questions)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to generate quiz: {str(e)}"
+        )
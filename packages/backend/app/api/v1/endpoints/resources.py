@@ -1,16 +1,44 @@
+import asyncio
 import os
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from typing import TYPE_CHECKING, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status, UploadFile, File, Form
 import mimetypes
 
+from app.core.config import settings
+from app.core.etag import conditional_response, rows_etag
+from app.core.ratelimit import RateLimitedRoute, get_rate_limiter, rate_limit
 from app.core.security import get_current_user
 from app.schemas.user import User
-from app.schemas.resource import Resource, ResourceCreate, ResourceType, ResourceStatus
-from app.crud.crud_resource import create_resource, get_resources_by_mentor, delete_resource
-from app.db.client import supabase
+from app.schemas.resource import (
+    Resource,
+    ResourceBulkDelete,
+    ResourceBulkDeleteResult,
+    ResourceCreate,
+    ResourceType,
+    ResourceStatus,
+    ResourceUploadResult
+)
+from app.schemas.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+from app.crud.crud_mentor import get_mentor_by_id
+from app.crud.crud_resource import (
+    create_resource,
+    create_resources,
+    get_resources_by_mentor,
+    delete_resource,
+    delete_resources
+)
+from app.db.client import async_supabase
+from app.services.cache import get_response_cache, mentor_resources_scope
+from app.services.storage import STORAGE_BUCKET, resource_folder, upload_file_to_storage
+from workers.enqueue import enqueue_resource, enqueue_resource_cleanup, enqueue_resources
 
-router = APIRouter()
+# Imported for type hints only; the SDK loads when the first client is created
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+# Upload buckets are checked before the request body is received
+router = APIRouter(route_class=RateLimitedRoute)
 
 # Allowed file types for upload
 ALLOWED_EXTENSIONS = {
@@ -33,15 +61,68 @@ def is_allowed_file(mimetype: str) -> bool:
             return True
     return False
 
+async def store_uploaded_file(client: "AsyncClient", user_id: str, mentor_id: str, file: UploadFile) -> ResourceCreate:
+    """
+    Validate an uploaded file and stream it to Supabase Storage.
+    
+    Args:
+        client: Async Supabase client instance
+        user_id: ID of the uploading user
+        mentor_id: ID of the mentor the file belongs to
+        file: The uploaded file
+        
+    Returns:
+        ResourceCreate: The resource record to create for the stored file
+        
+    Raises:
+        ValueError: If the file type is not allowed
+        Exception: If the storage upload fails
+    """
+    # Validate file type
+    file_mimetype = file.content_type
+    if not is_allowed_file(file_mimetype):
+        raise ValueError(f"File type not allowed. Supported types: {list(ALLOWED_EXTENSIONS.keys())}")
+    
+    # Determine resource type from file
+    resource_type = get_resource_type_from_mimetype(file_mimetype)
+    
+    # Generate unique filename
+    file_extension = os.path.splitext(file.filename)[1] if file.filename else ""
+    unique_filename = f"{uuid.uuid4()}{file_extension}"
+    
+    # Create storage path: {user_id}/{mentor_id}/{filename}
+    storage_path = resource_folder(user_id, mentor_id) + unique_filename
+    
+    # Stream the file to Supabase Storage in fixed-size chunks
+    try:
+        await upload_file_to_storage(client, storage_path, file, file_mimetype)
+    except Exception as storage_error:
+        raise Exception(f"Storage upload failed: {str(storage_error)}")
+    
+    # Get the public URL for the uploaded file
+    file_url = await client.storage.from_(STORAGE_BUCKET).get_public_url(storage_path)
+    
+    return ResourceCreate(
+        name=file.filename or unique_filename,
+        type=resource_type,
+        mentor_id=mentor_id,
+        url=file_url,
+        status=ResourceStatus.PENDING,
+        storage_path=storage_path
+    )
+
 @router.post("/upload", response_model=Resource, status_code=status.HTTP_201_CREATED)
 async def upload_resource_file(
     file: UploadFile = File(...),
     mentor_id: str = Form(...),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(rate_limit("upload"))
 ):
     """
     Upload a resource file to Supabase Storage and create a database record.
     
+    The file is streamed to storage in fixed-size chunks (resumable for large
+    files), so memory per upload does not grow with the file size.
+    
     Args:
         file: The uploaded file
         mentor_id: ID of the mentor to associate the resource with
@@ -51,61 +132,21 @@ async def upload_resource_file(
         Resource: The created resource object
     """
     try:
-        # Validate file type
-        file_mimetype = file.content_type
-        if not is_allowed_file(file_mimetype):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File type not allowed. Supported types: {list(ALLOWED_EXTENSIONS.keys())}"
-            )
-        
-        # Determine resource type from file
+        client = async_supabase()
         try:
-            resource_type = get_resource_type_from_mimetype(file_mimetype)
+            resource_data = await store_uploaded_file(client, current_user.id, mentor_id, file)
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e)
             )
         
-        # Generate unique filename
-        file_extension = os.path.splitext(file.filename)[1] if file.filename else ""
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        
-        # Create storage path: {user_id}/{mentor_id}/{filename}
-        storage_path = f"{current_user.id}/{mentor_id}/{unique_filename}"
-        
-        # Read file content
-        file_content = await file.read()
-        
-        # Upload to Supabase Storage
-        client = supabase()
-        try:
-            storage_response = client.storage.from_("resources").upload(
-                path=storage_path,
-                file=file_content,
-                file_options={
-                    "content-type": file_mimetype,
-                    "upsert": False
-                }
-            )
-        except Exception as storage_error:
-            raise Exception(f"Storage upload failed: {str(storage_error)}")
-        
-        # Get the public URL for the uploaded file
-        public_url_response = client.storage.from_("resources").get_public_url(storage_path)
-        file_url = public_url_response
+        resource = await create_resource(client, resource_data, current_user.id)
+        await get_response_cache().invalidate(mentor_resources_scope(mentor_id))
         
-        # Create resource record in database
-        resource_data = ResourceCreate(
-            name=file.filename or unique_filename,
-            type=resource_type,
-            mentor_id=mentor_id,
-            url=file_url,
-            status=ResourceStatus.PENDING
-        )
+        # Hand the resource to the background ingestion workers
+        await asyncio.to_thread(enqueue_resource, resource.id)
         
-        resource = create_resource(client, resource_data, current_user.id)
         return resource
         
     except HTTPException:
@@ -116,25 +157,132 @@ async def upload_resource_file(
             detail=f"Failed to upload resource: {str(e)}"
         )
 
-@router.get("/mentor/{mentor_id}", response_model=List[Resource])
+@router.post("/upload/batch", response_model=List[ResourceUploadResult])
+async def upload_resource_files(
+    files: List[UploadFile] = File(...),
+    mentor_id: str = Form(...),
+    current_user: User = Depends(rate_limit("upload"))
+):
+    """
+    Upload several files to one mentor in a single request.
+    
+    Mentor ownership is checked once for the whole batch, files are streamed
+    to storage concurrently (at most ``storage_upload_concurrency`` at a
+    time) and all resource records are created in one bulk insert. A file
+    that fails does not abort the others: the response has one result per
+    file, in request order, with either the created resource or an error.
+    
+    Args:
+        files: The uploaded files
+        mentor_id: ID of the mentor to associate the resources with
+        current_user: Authenticated user from JWT token
+        
+    Returns:
+        List[ResourceUploadResult]: Outcome of each file
+        
+    Raises:
+        HTTPException: 400 if the batch is too large, 404 if mentor not found,
+            429 if the user's upload bucket cannot cover every file
+    """
+    if len(files) > settings.storage_batch_max_files:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files. Maximum per batch: {settings.storage_batch_max_files}"
+        )
+    
+    # Uploads are charged per file: the route took one token before the
+    # body arrived, take the rest now (never more than the bucket holds)
+    limiter = get_rate_limiter()
+    extra_cost = min(len(files), limiter.policies["upload"].burst) - 1
+    if extra_cost > 0:
+        await limiter.check(current_user.id, "upload", cost=extra_cost)
+    
+    try:
+        client = async_supabase()
+        mentor = await get_mentor_by_id(client, mentor_id, current_user.id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to upload resources: {str(e)}"
+        )
+    
+    if not mentor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Mentor not found"
+        )
+    
+    # Bound concurrent storage uploads (and the chunks they hold in memory)
+    semaphore = asyncio.Semaphore(settings.storage_upload_concurrency)
+    
+    async def store(file: UploadFile) -> ResourceCreate:
+        async with semaphore:
+            return await store_uploaded_file(client, current_user.id, mentor_id, file)
+    
+    stored = await asyncio.gather(*(store(file) for file in files), return_exceptions=True)
+    
+    results = [ResourceUploadResult(filename=file.filename or "") for file in files]
+    uploaded = []
+    for result, outcome in zip(results, stored):
+        if isinstance(outcome, BaseException):
+            result.error = str(outcome)
+        else:
+            uploaded.append((result, outcome))
+    
+    if uploaded:
+        try:
+            resources = await create_resources(client, [resource_data for _, resource_data in uploaded])
+        except Exception as e:
+            for result, _ in uploaded:
+                result.error = str(e)
+        else:
+            for (result, _), resource in zip(uploaded, resources):
+                result.resource = resource
+            
+            await get_response_cache().invalidate(mentor_resources_scope(mentor_id))
+            
+            # Hand the resources to the background ingestion workers
+            await asyncio.to_thread(enqueue_resources, [resource.id for resource in resources])
+    
+    return results
+
+@router.get("/mentor/{mentor_id}", response_model=Page[Resource])
 async def get_mentor_resources(
     mentor_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all resources for a specific mentor.
+    Get a page of the resources for a specific mentor.
+    
+    The response carries an ETag built from the resources' versions (status
+    changes included); a request whose If-None-Match matches gets an empty 304.
     
     Args:
         mentor_id: ID of the mentor whose resources to retrieve
+        response: Outgoing response (for the ETag header)
+        limit: Maximum number of resources to return
+        cursor: next_cursor from the previous page (omit for the first page)
+        if_none_match: ETag of the copy the client already has
         current_user: Authenticated user from JWT token
         
     Returns:
-        List[Resource]: List of resources belonging to the mentor
+        Page[Resource]: Page of resources belonging to the mentor and the next page's cursor
     """
     try:
-        client = supabase()
-        resources = get_resources_by_mentor(client, mentor_id, current_user.id)
-        return resources
+        client = async_supabase()
+        resources = await get_response_cache().get_or_load(
+            [mentor_resources_scope(mentor_id)],
+            f"resources:{current_user.id}:{mentor_id}:{limit}:{cursor or ''}",
+            Page[Resource],
+            lambda: get_resources_by_mentor(client, mentor_id, current_user.id, limit, cursor)
+        )
+        
+        not_modified = conditional_response(response, rows_etag(resources.items, resources.next_cursor), if_none_match)
+        return not_modified or resources
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -149,6 +297,9 @@ async def delete_resource_endpoint(
     """
     Delete a resource and its associated file.
     
+    Only the database row is deleted in the request; the stored file and
+    the resource's index data are removed by a background job.
+    
     Args:
         resource_id: ID of the resource to delete
         current_user: Authenticated user from JWT token
@@ -157,17 +308,19 @@ async def delete_resource_endpoint(
         HTTPException: If deletion fails or resource doesn't belong to user
     """
     try:
-        client = supabase()
-        success = delete_resource(client, resource_id, current_user.id)
+        client = async_supabase()
+        resource = await delete_resource(client, resource_id, current_user.id)
         
-        if not success:
+        if not resource:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Resource not found"
             )
         
-        # Note: In a production system, you might also want to delete the file from storage
-        # This would require getting the file path from the resource URL first
+        await get_response_cache().invalidate(mentor_resources_scope(resource.mentor_id))
+        
+        # Remove the stored file in the background
+        await asyncio.to_thread(enqueue_resource_cleanup, current_user.id, [resource])
         
         return None
     except HTTPException:
@@ -178,12 +331,56 @@ async def delete_resource_endpoint(
             detail=f"Failed to delete resource: {str(e)}"
         )
 
+@router.post("/delete", response_model=ResourceBulkDeleteResult)
+async def delete_resources_endpoint(
+    delete_data: ResourceBulkDelete,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delete several resources in one request.
+    
+    The rows are deleted in a single statement; stored files and index data
+    are removed by a background job, so the request returns immediately.
+    
+    Args:
+        delete_data: ResourceBulkDelete schema with the IDs to delete
+        current_user: Authenticated user from JWT token
+        
+    Returns:
+        ResourceBulkDeleteResult: Deleted IDs and IDs that were not found
+            or not owned by the user
+        
+    Raises:
+        HTTPException: 400 if deletion fails
+    """
+    try:
+        client = async_supabase()
+        resources = await delete_resources(client, delete_data.resource_ids, current_user.id)
+        
+        mentor_ids = {resource.mentor_id for resource in resources}
+        await get_response_cache().invalidate(*(mentor_resources_scope(mentor_id) for mentor_id in mentor_ids))
+        
+        # Remove the stored files in the background
+        if resources:
+            await asyncio.to_thread(enqueue_resource_cleanup, current_user.id, resources)
+        
+        deleted = {resource.id for resource in resources}
+        return ResourceBulkDeleteResult(
+            deleted=[resource_id for resource_id in delete_data.resource_ids if resource_id in deleted],
+            not_found=[resource_id for resource_id in delete_data.resource_ids if resource_id not in deleted]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to delete resources: {str(e)}"
+        )
+
 @router.post("/url", response_model=Resource, status_code=status.HTTP_201_CREATED)
 async def create_url_resource(
     url: str = Form(...),
     name: str = Form(...),
     mentor_id: str = Form(...),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(rate_limit("upload"))
 ):
     """
     Create a resource from a URL (e.g., YouTube link).
@@ -210,8 +407,13 @@ async def create_url_resource(
             status=ResourceStatus.PENDING
         )
         
-        client = supabase()
-        resource = create_resource(client, resource_data, current_user.id)
+        client = async_supabase()
+        resource = await create_resource(client, resource_data, current_user.id)
+        await get_response_cache().invalidate(mentor_resources_scope(mentor_id))
+        
+        # Hand the resource to the background ingestion workers
+        await asyncio.to_thread(enqueue_resource, resource.id)
+        
         return resource
         
     except Exception as e:
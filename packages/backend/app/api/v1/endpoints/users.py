@@ -2,9 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from typing import Optional
 
+from app.core.config import settings
 from app.core.security import get_current_user
-from app.schemas.user import User
-from app.db.client import supabase
+from app.schemas.user import User, UserProfile
+from app.crud.crud_user import get_or_create_user_profile, upsert_user_profile
+from app.db.client import async_supabase
+from app.services.cache import get_response_cache, user_profile_scope
 
 router = APIRouter()
 
@@ -14,10 +17,10 @@ async def test_user_access(current_user: User = Depends(get_current_user)):
     Test endpoint to verify user authentication and basic database access.
     """
     try:
-        client = supabase()
+        client = async_supabase()
         
         # Test basic table access
-        test_response = client.table("user_profiles").select("count", count="exact").execute()
+        test_response = await client.table("user_profiles").select("count", count="exact").execute()
         
         return {
             "user_id": current_user.id,
@@ -62,7 +65,7 @@ async def update_user_profile(
         HTTPException: 400 if update fails
     """
     try:
-        client = supabase()
+        client = async_supabase()
         
         # Prepare update data, excluding None values
         update_dict = {}
@@ -80,26 +83,14 @@ async def update_user_profile(
                 "user_id": current_user.id
             }
         
-        # Check if user_profiles record exists
-        profile_response = client.table("user_profiles").select("*").eq("id", current_user.id).execute()
+        # Create or update the profile in one atomic upsert
+        profile = await upsert_user_profile(client, current_user.id, update_dict)
         
-        if profile_response.data:
-            # Update existing profile
-            response = client.table("user_profiles").update(update_dict).eq("id", current_user.id).execute()
-        else:
-            # Create new profile record
-            update_dict["id"] = current_user.id
-            response = client.table("user_profiles").insert(update_dict).execute()
-        
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to update user profile"
-            )
+        await get_response_cache().invalidate(user_profile_scope(current_user.id))
         
         return {
             "message": "Profile updated successfully",
-            "profile": response.data[0],
+            "profile": profile.model_dump(),
             "user_id": current_user.id
         }
         
@@ -123,31 +114,17 @@ async def get_user_profile(current_user: User = Depends(get_current_user)):
         dict: User profile information with preferences
     """
     try:
-        client = supabase()
-        
-        # Get user profile data
-        profile_response = client.table("user_profiles").select("*").eq("id", current_user.id).execute()
-        
-        # Handle case where user doesn't have a profile yet
-        profile_data = profile_response.data[0] if profile_response.data else {}
-        
-        # If no profile exists, create one with default values
-        if not profile_data:
-            default_profile = {
-                "id": current_user.id,
-                "notifications_enabled": True,
-                "subscription_status": "free",
-                "mentor_count": 0,
-                "resource_upload_mb": 0
-            }
-            
-            try:
-                # Try to create the profile record
-                insert_response = client.table("user_profiles").insert(default_profile).execute()
-                profile_data = insert_response.data[0] if insert_response.data else default_profile
-            except Exception as insert_error:
-                # If insert fails (maybe due to permissions), return defaults
-                profile_data = default_profile
+        client = async_supabase()
+        
+        # Served from the short-lived profile cache on most app opens; a miss
+        # reads (or creates) the profile in one round trip
+        profile = await get_response_cache().get_or_load(
+            [user_profile_scope(current_user.id)],
+            f"profile:{current_user.id}",
+            UserProfile,
+            lambda: get_or_create_user_profile(client, current_user.id),
+            ttl=settings.user_profile_cache_ttl_seconds
+        )
         
         return {
             "user": {
@@ -158,13 +135,8 @@ async def get_user_profile(current_user: User = Depends(get_current_user)):
                 "created_at": current_user.created_at,
                 "updated_at": current_user.updated_at
             },
-            "profile": {
-                "notifications_enabled": profile_data.get("notifications_enabled", True),
-                "subscription_status": profile_data.get("subscription_status", "free"),
-                "mentor_count": profile_data.get("mentor_count", 0),
-                "resource_upload_mb": profile_data.get("resource_upload_mb", 0),
-                **profile_data
-            }
+            # Every preference is present: UserProfile fills in the defaults
+            "profile": profile.model_dump()
         }
         
     except Exception as e:
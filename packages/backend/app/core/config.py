@@ -15,17 +15,141 @@ class Settings(BaseSettings):
     supabase_key: Optional[str] = None
     database_url: Optional[str] = None
     
+    # Direct Postgres pool for hot reads (only used when DATABASE_URL is set)
+    database_pool_min_size: int = 1
+    database_pool_max_size: int = 10
+    database_pool_max_idle_seconds: float = 300.0
+    database_statement_cache_size: int = 100  # Prepared statements per connection (0 behind a transaction pooler)
+    database_command_timeout: float = 10.0
+    
+    # Supabase HTTP connection pool settings (shared per process)
+    supabase_http2: bool = True
+    supabase_pool_max_connections: int = 100
+    supabase_pool_max_keepalive: int = 20
+    supabase_pool_keepalive_expiry: float = 30.0
+    supabase_request_timeout: float = 30.0
+    
+    # Production server settings (python main.py)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    web_concurrency: Optional[int] = None  # Worker processes (default: one per available core)
+    server_max_requests: int = 10000  # Recycle a worker after this many requests (0 disables)
+    server_max_requests_jitter: int = 1000
+    server_graceful_timeout: int = 30  # Seconds a recycled worker gets to finish in-flight requests
+    server_worker_timeout: int = 60
+    server_keepalive_seconds: int = 5
+    server_access_log: bool = False
+    
+    # Storage upload settings
+    # Supabase resumable (TUS) uploads require 6 MB chunks
+    storage_upload_chunk_size: int = 6 * 1024 * 1024
+    storage_upload_max_retries: int = 3
+    storage_upload_concurrency: int = 4  # Parallel storage uploads per batch request
+    storage_batch_max_files: int = 50
+    
+    # Storage garbage collection (orphaned files of deleted resources/mentors)
+    storage_gc_interval_seconds: int = 6 * 3600
+    storage_gc_grace_seconds: int = 3600  # Never collect files younger than this (upload in flight)
+    storage_gc_batch_size: int = 100
+    
+    # URL resource download settings (public http/https hosts only)
+    url_fetch_max_bytes: int = 20 * 1024 * 1024  # Larger downloads fail the resource
+    url_fetch_max_redirects: int = 5
+    
     # JWT settings
     secret_key: str = "dev-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    auth_token_cache_size: int = 10000
     
     # AI/LLM settings
     openai_api_key: Optional[str] = None
     groq_api_key: Optional[str] = None
     
+    # Chat settings
+    llm_provider: str = "openai"  # "openai", "groq" or "fake" (local streaming model, for tests)
+    llm_model: str = "gpt-4o"
+    chat_history_limit: int = 10
+    chat_retrieval_k: int = 5
+    chat_answer_cache_threshold: float = 0.95  # Min cosine similarity for a question to reuse a cached answer
+    chat_answer_cache_max_bytes: int = 64 * 1024 * 1024  # Per process; 0 disables the cache
+    
+    # Quiz settings (questions are pooled per mentor ahead of time)
+    quiz_model: Optional[str] = None  # Model writing pool questions (default: llm_model)
+    quiz_source_max_chars: int = 12000  # Material sent per generation request
+    quiz_pool_cache_ttl_seconds: int = 300
+    quiz_refresh_debounce_seconds: int = 60  # Min seconds between refreshes enqueued for one stale pool
+    quiz_generation_max_retries: int = 4  # Retries of failed question sets before waiting for a resource change
+    quiz_generation_retry_seconds: int = 300  # Delay of the first retry, doubled on each following one
+    
+    # Flashcard settings
+    flashcard_model: Optional[str] = None  # Model writing flashcards (default: llm_model)
+    flashcard_source_max_chars: int = 12000  # Material sent per generation request
+    flashcard_queue_window: int = 200  # Earliest due cards held in memory per due queue
+    flashcard_queue_max_queues: int = 10000  # Due queues (users x mentor filters) kept per worker
+    flashcard_queue_ttl_seconds: int = 300
+    
+    # Embedding settings
+    # The embedding cache and vector indexes live under data/ (relative to
+    # the working directory, /app in the image). The workers write them and
+    # the API reads them, so every API and worker process must see the same
+    # directory: one host, or a volume shared by all of them (in docker-compose,
+    # the backend-data volume at /app/data).
+    embedding_provider: str = "openai"  # "openai" or "fake" (deterministic, for tests)
+    embedding_model: str = "text-embedding-3-small"
+    embedding_dimensions: int = 1536
+    embedding_batch_size: int = 512
+    embedding_cache_path: str = "data/embedding_cache.sqlite3"
+    chunk_size: int = 1000
+    chunk_overlap: int = 150
+    
+    # Vector index settings
+    vector_index_dir: str = "data/vector_index"
+    vector_ivf_min_rows: int = 20000
+    vector_ivf_nprobe: int = 8
+    
+    # Retrieval settings (BM25 keyword hits fused with vector hits)
+    retrieval_hybrid: bool = True  # False searches the vector index only
+    retrieval_candidates: int = 20  # Hits taken from each index before fusion
+    retrieval_rrf_k: int = 60  # Reciprocal rank fusion constant
+    lexical_max_postings: int = 10000  # Matching chunks scored per keyword query, rarest terms first
+    
+    # Response cache settings
+    # "redis" (shared, uses REDIS_URL), "memory" or "none"; default: redis when REDIS_URL is set.
+    # The memory backend only sees its own process's invalidations, so it is
+    # only used when background jobs run eagerly in a single process
+    response_cache_backend: Optional[str] = None
+    response_cache_ttl_seconds: int = 60
+    response_cache_generation_ttl_seconds: int = 24 * 3600  # Generations of idle scopes expire (redis)
+    response_cache_max_entries: int = 10000
+    # Per-process tier in front of redis, validated against the shared generations (0 disables)
+    response_cache_local_max_entries: int = 2000
+    response_cache_local_ttl_seconds: int = 30
+    user_profile_cache_ttl_seconds: int = 30  # Profiles are read on every app open
+    
+    # Rate limiting (per-user token buckets) and load shedding settings
+    rate_limit_backend: str = "memory"  # "memory" (per worker), "redis" (shared, uses REDIS_URL) or "none"
+    rate_limit_max_keys: int = 100000  # Buckets kept per worker by the memory backend
+    rate_limit_api_per_minute: int = 600
+    rate_limit_api_burst: int = 120
+    rate_limit_upload_per_minute: int = 30
+    rate_limit_upload_burst: int = 10
+    rate_limit_chat_per_minute: int = 20
+    rate_limit_chat_burst: int = 5
+    max_in_flight_requests: int = 256  # Per worker; above it requests get 503 (0 disables)
+    shed_retry_after_seconds: int = 1
+    
+    # Background worker settings
+    redis_url: Optional[str] = None
+    worker_concurrency: Optional[int] = None
+    worker_eager: bool = False
+    pending_sweep_interval_seconds: int = 60
+    processing_stale_after_seconds: int = 900
+    
     # Monitoring settings
     sentry_dsn: Optional[str] = None
+    sentry_traces_sample_rate: float = 0.1
+    sentry_traces_target_per_second: float = 1.0  # Adaptive cap on traced requests/sec (0 disables)
     
     # CORS settings
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:5173"]
@@ -0,0 +1,73 @@
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional, Protocol
+from fastapi import Response, status
+
+class VersionedRow(Protocol):
+    """A response row that carries its own version (Mentor, Resource)."""
+    id: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+# Browsers may keep private copies but must revalidate them on every use
+CACHE_CONTROL = "private, no-cache"
+
+def rows_etag(rows: Iterable[VersionedRow], *extra: Optional[str]) -> str:
+    """
+    Build a strong ETag from row versions.
+
+    Every write through the API (and every status change by the workers)
+    bumps ``updated_at``, so the IDs and versions of the rows identify the
+    representation without serializing it.
+
+    Args:
+        rows: Rows in the response, in response order
+        extra: Other values that shape the response (e.g. the next cursor)
+
+    Returns:
+        str: Quoted ETag value
+    """
+    digest = hashlib.sha256()
+    for row in rows:
+        version = row.updated_at or row.created_at
+        digest.update(f"{row.id}@{version.isoformat()}\n".encode())
+    for value in extra:
+        digest.update(f"+{value or ''}\n".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an ``If-None-Match`` header against an ETag (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+def conditional_response(response: Response, etag: str, if_none_match: Optional[str]) -> Optional[Response]:
+    """
+    Apply validators to a GET response.
+
+    Sets ``ETag`` and ``Cache-Control`` on the outgoing response and, when
+    the client already has this version, returns an empty 304 that the
+    endpoint should return instead of the body.
+
+    Args:
+        response: The endpoint's ``Response`` parameter
+        etag: ETag of the current representation
+        if_none_match: The request's ``If-None-Match`` header
+
+    Returns:
+        Optional[Response]: A 304 response, or None if the body must be sent
+    """
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
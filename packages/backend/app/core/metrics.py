@@ -0,0 +1,369 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import httpx
+
+# Latency buckets in seconds, from cache hits to slow uploads
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Metric:
+    """Base class for a metric family with optional labels."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+class Counter(Metric):
+    """Monotonically increasing value (requests, bytes)."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels: str) -> None:
+        """Mirror a monotonic counter kept elsewhere (used by collectors)."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+class Gauge(Metric):
+    """Value that goes up and down (requests in flight)."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+class Histogram(Metric):
+    """Distribution of observed values (latencies) over fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [(key, list(counts), total[0]) for key, (counts, total) in self._values.items()]
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+
+class Registry:
+    """
+    Process-local metric registry rendered in the Prometheus text format.
+
+    Collectors are callbacks that refresh gauges from other components'
+    counters (e.g. cache stats) right before rendering, so those components
+    need no metrics code on their hot path.
+    """
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# HTTP server
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests handled, by route and status.", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled."
+))
+requests_rate_limited_total = registry.register(Counter(
+    "requests_rate_limited_total", "Requests rejected with 429 by the per-user rate limiter.", ("route_class",)
+))
+requests_shed_total = registry.register(Counter(
+    "requests_shed_total", "Requests rejected with 503 while the process was overloaded."
+))
+
+# Upstream (Supabase) calls
+supabase_request_duration_seconds = registry.register(Histogram(
+    "supabase_request_duration_seconds", "Supabase call latency (to response headers) by table and operation.",
+    ("service", "table", "operation")
+))
+supabase_request_errors_total = registry.register(Counter(
+    "supabase_request_errors_total", "Supabase calls that failed or returned an error status.",
+    ("service", "table", "operation")
+))
+
+# Storage uploads
+storage_upload_bytes_total = registry.register(Counter(
+    "storage_upload_bytes_total", "Bytes uploaded to storage, by upload mode.", ("mode",)
+))
+storage_uploads_total = registry.register(Counter(
+    "storage_uploads_total", "Files uploaded to storage, by upload mode.", ("mode",)
+))
+
+# Chat streaming
+chat_time_to_first_token_seconds = registry.register(Histogram(
+    "chat_time_to_first_token_seconds", "Time from chat request to the first streamed token."
+))
+chat_tokens_per_second = registry.register(Histogram(
+    "chat_tokens_per_second", "Generation throughput of streamed chat answers.",
+    buckets=(5, 10, 20, 30, 50, 75, 100, 150, 200, 300)
+))
+chat_answer_cache_saved_tokens_total = registry.register(Counter(
+    "chat_answer_cache_saved_tokens_total", "LLM tokens not spent thanks to cached chat answers (prompt tokens estimated).",
+    ("kind",)
+))
+chat_answer_cache_evictions_total = registry.register(Counter(
+    "chat_answer_cache_evictions_total", "Cached chat answers dropped, by reason (memory, stale).", ("reason",)
+))
+chat_answer_cache_bytes = registry.register(Gauge(
+    "chat_answer_cache_bytes", "Memory held by cached chat answers."
+))
+
+# Caches (refreshed from their own counters by collectors)
+cache_hits_total = registry.register(Counter(
+    "cache_hits_total", "Cache hits since process start.", ("cache",)
+))
+cache_misses_total = registry.register(Counter(
+    "cache_misses_total", "Cache misses since process start.", ("cache",)
+))
+
+def register_cache(name: str, stats: Callable[[], Dict[str, object]]) -> None:
+    """Export a cache's ``stats()`` hit/miss counters."""
+    def collect() -> None:
+        values = stats()
+        cache_hits_total.set_total(float(values.get("hits", 0)), cache=name)
+        cache_misses_total.set_total(float(values.get("misses", 0)), cache=name)
+
+    registry.add_collector(collect)
+
+def _route_template(scope) -> str:
+    """
+    Route template of a handled request, e.g. ``/api/v1/mentors/{mentor_id}``.
+
+    Built from the matched path and its path parameters, so it does not
+    depend on how nested routers record their prefixes.
+    """
+    if scope.get("route") is None:
+        return "unmatched"
+
+    path_params = scope.get("path_params") or {}
+    if not path_params:
+        return scope["path"]
+
+    names_by_value = {str(value): name for name, value in path_params.items()}
+    return "/".join(
+        f"{{{names_by_value[segment]}}}" if segment in names_by_value else segment
+        for segment in scope["path"].split("/")
+    )
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency, status and in-flight requests.
+
+    Requests are labelled with the route template (``/api/v1/mentors/{mentor_id}``),
+    not the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app, skip_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+
+            route_path = _route_template(scope)
+            method = scope["method"]
+            http_request_duration_seconds.observe(elapsed, method=method, route=route_path)
+            http_requests_total.inc(method=method, route=route_path, status=str(status_code))
+
+def _classify_supabase_request(request: httpx.Request) -> Tuple[str, str, str]:
+    """Map a Supabase API request to (service, table, operation) labels."""
+    path = request.url.path
+    method = request.method
+
+    if path.startswith("/rest/v1/rpc/"):
+        return "rest", path[len("/rest/v1/rpc/"):], "rpc"
+    if path.startswith("/rest/v1/"):
+        table = path[len("/rest/v1/"):].split("/", 1)[0]
+        operation = {
+            "GET": "select", "HEAD": "count", "POST": "insert", "PATCH": "update", "DELETE": "delete"
+        }.get(method, method.lower())
+        return "rest", table, operation
+    if path.startswith("/storage/v1/"):
+        parts = path[len("/storage/v1/"):].split("/")
+        operation = f"{parts[0]}_{method.lower()}" if parts and parts[0] else method.lower()
+        return "storage", "", operation
+    service = path.strip("/").split("/", 1)[0] or "unknown"
+    return service, "", method.lower()
+
+def _record_supabase_call(request: httpx.Request, started: float, failed: bool) -> None:
+    service, table, operation = _classify_supabase_request(request)
+    supabase_request_duration_seconds.observe(
+        time.perf_counter() - started, service=service, table=table, operation=operation
+    )
+    if failed:
+        supabase_request_errors_total.inc(service=service, table=table, operation=operation)
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """httpx transport wrapper timing Supabase calls (sync client)."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = self._transport.handle_request(request)
+        except Exception:
+            _record_supabase_call(request, started, failed=True)
+            raise
+        _record_supabase_call(request, started, failed=response.status_code >= 400)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+class InstrumentedAsyncTransport(httpx.AsyncBaseTransport):
+    """httpx transport wrapper timing Supabase calls (async client)."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            _record_supabase_call(request, started, failed=True)
+            raise
+        _record_supabase_call(request, started, failed=response.status_code >= 400)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text format."""
+    return registry.render()
@@ -0,0 +1,308 @@
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Sequence
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from fastapi.security.utils import get_authorization_scheme_param
+
+from app.core.config import settings
+from app.core.metrics import http_requests_in_flight, requests_rate_limited_total, requests_shed_total
+from app.core.security import get_current_user, verify_access_token
+from app.schemas.user import User
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    """Token bucket: ``burst`` tokens, refilled at ``rate`` tokens per second."""
+    rate: float
+    burst: float
+
+    @classmethod
+    def per_minute(cls, requests: int, burst: int) -> "BucketPolicy":
+        return cls(rate=requests / 60.0, burst=float(burst))
+
+class RateLimitBackend(ABC):
+    """Storage of per-key token buckets."""
+
+    @abstractmethod
+    async def acquire(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> float:
+        """
+        Take ``cost`` tokens from a bucket.
+
+        Returns:
+            float: 0 if the tokens were taken, else seconds until they will be available
+        """
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process buckets (each server worker limits independently).
+
+    Buckets are kept in LRU order and the least recently used are dropped
+    above ``max_keys``; a dropped bucket comes back full, which is what an
+    idle bucket would have refilled to anyway.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def acquire(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [policy.burst, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+
+            tokens = min(policy.burst, bucket[0] + (now - bucket[1]) * policy.rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return 0.0
+            bucket[0] = tokens
+            return (cost - tokens) / policy.rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+# Atomic refill-and-take on a Redis hash {tokens, ts}, timed by the Redis
+# clock so that every API worker sees the same buckets
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Buckets shared by every API worker, in Redis (or a compatible server)."""
+
+    def __init__(self, url: str, prefix: str = "mentoria:ratelimit:"):
+        import redis.asyncio as redis_asyncio
+
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, policy: BucketPolicy, cost: float = 1.0) -> float:
+        wait = await self._script(keys=[self.prefix + key], args=[policy.rate, policy.burst, cost])
+        return float(wait)
+
+class RateLimiter:
+    """
+    Per-user token buckets, one per route class.
+
+    Route classes separate expensive work from ordinary API calls: uploads
+    and LLM-backed chat have their own small buckets, so a user exhausting
+    them can still browse. Backend failures are logged and let the request
+    through; a broken limiter must not take the API down.
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend], policies: Dict[str, BucketPolicy]):
+        self.backend = backend
+        self.policies = policies
+        self.allowed = 0
+        self.limited = 0
+
+    async def check(self, user_id: str, route_class: str, cost: float = 1.0) -> None:
+        """
+        Take a token from the user's bucket of a route class.
+
+        Raises:
+            HTTPException: 429 with Retry-After if the bucket is empty
+        """
+        policy = self.policies[route_class]
+        if self.backend is None:
+            return
+
+        try:
+            wait = await self.backend.acquire(f"{route_class}:{user_id}", policy, cost)
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable, admitting request: {str(e)}")
+            return
+
+        if wait <= 0:
+            self.allowed += 1
+            return
+
+        self.limited += 1
+        requests_rate_limited_total.inc(route_class=route_class)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded for {route_class} requests",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))}
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Admission counters for monitoring."""
+        return {
+            "backend": settings.rate_limit_backend,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+# Per-process singleton
+_rate_limiter: Optional[RateLimiter] = None
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get or create the configured rate limiter.
+
+    Raises:
+        ValueError: If the backend is unknown or Redis is selected without REDIS_URL
+    """
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        backend_name = settings.rate_limit_backend
+
+        if backend_name == "none":
+            backend = None
+        elif backend_name == "memory":
+            backend = MemoryRateLimitBackend(settings.rate_limit_max_keys)
+        elif backend_name == "redis":
+            if not settings.redis_url:
+                raise ValueError("Redis rate limiting requires REDIS_URL to be set.")
+            backend = RedisRateLimitBackend(settings.redis_url)
+        else:
+            raise ValueError(f"Unknown rate limit backend: {backend_name}")
+
+        _rate_limiter = RateLimiter(backend, {
+            "api": BucketPolicy.per_minute(settings.rate_limit_api_per_minute, settings.rate_limit_api_burst),
+            "upload": BucketPolicy.per_minute(settings.rate_limit_upload_per_minute, settings.rate_limit_upload_burst),
+            "chat": BucketPolicy.per_minute(settings.rate_limit_chat_per_minute, settings.rate_limit_chat_burst),
+        })
+
+    return _rate_limiter
+
+def rate_limit(route_class: str):
+    """
+    Dependency taking a token from the current user's bucket of a route class.
+
+    Resolves the user through ``get_current_user`` (cached per request by
+    FastAPI, so the token is verified once however many limits apply).
+    On a ``RateLimitedRoute`` the token was already taken before the body
+    was read, and the dependency only returns the user.
+
+    Example:
+        ``@router.post("/upload", dependencies=[Depends(rate_limit("upload"))])``
+    """
+    async def dependency(request: Request, current_user: User = Depends(get_current_user)) -> User:
+        if route_class not in getattr(request.state, "rate_limited", ()):
+            await get_rate_limiter().check(current_user.id, route_class)
+        return current_user
+
+    dependency.route_class = route_class
+    return dependency
+
+def _route_classes(dependant) -> List[str]:
+    """Route classes of the ``rate_limit`` dependencies of an endpoint, in order."""
+    classes: List[str] = []
+    for sub_dependant in dependant.dependencies:
+        for route_class in [getattr(sub_dependant.call, "route_class", None), *_route_classes(sub_dependant)]:
+            if route_class is not None and route_class not in classes:
+                classes.append(route_class)
+    return classes
+
+class RateLimitedRoute(APIRoute):
+    """
+    Route applying its ``rate_limit`` dependencies before the body is read.
+
+    FastAPI reads (and spools to disk) the whole request body before it
+    resolves dependencies, so on its own ``rate_limit`` would only reject
+    an upload after receiving it. This route class takes the tokens first,
+    identifying the user from the bearer token (verified tokens are
+    cached, so ``get_current_user`` does not verify it again). Requests
+    without a token go on to the regular authentication error.
+
+    Example:
+        ``router = APIRouter(route_class=RateLimitedRoute)``
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        route_classes = _route_classes(self.dependant)
+        if not route_classes:
+            return handler
+
+        async def rate_limited_handler(request: Request) -> Response:
+            scheme, token = get_authorization_scheme_param(request.headers.get("authorization"))
+            if scheme.lower() == "bearer" and token:
+                user = verify_access_token(token)
+                limiter = get_rate_limiter()
+                for route_class in route_classes:
+                    await limiter.check(user.id, route_class)
+                request.state.rate_limited = route_classes
+            return await handler(request)
+
+        return rate_limited_handler
+
+class LoadSheddingMiddleware:
+    """
+    ASGI middleware rejecting requests with 503 while the process is overloaded.
+
+    Overload is measured by ``http_requests_in_flight``, so this middleware
+    must be installed inside ``MetricsMiddleware`` (which maintains the
+    gauge and counts the request being admitted). Health and metrics
+    endpoints are never shed, so orchestrators can still see the process.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_in_flight: int,
+        retry_after_seconds: int = 1,
+        skip_paths: Sequence[str] = ("/", "/health", "/metrics")
+    ):
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.retry_after = str(retry_after_seconds)
+        self.skip_paths = set(skip_paths)
+        self.shed = 0
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or self.max_in_flight <= 0
+            or scope["path"] in self.skip_paths
+            or http_requests_in_flight.get() <= self.max_in_flight
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self.shed += 1
+        requests_shed_total.inc()
+        await send({
+            "type": "http.response.start",
+            "status": status.HTTP_503_SERVICE_UNAVAILABLE,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"retry-after", self.retry_after.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b'{"detail":"Server overloaded, retry later"}'})
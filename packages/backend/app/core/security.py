@@ -1,7 +1,10 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Dict, Tuple, Union, Optional
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import logging
@@ -11,8 +14,18 @@ from app.db.client import supabase
 from app.schemas.user import User
 from app.schemas.token import TokenData
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context, created on first use (passlib is slow to import)
+_pwd_context = None
+
+def _get_pwd_context():
+    global _pwd_context
+    
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    
+    return _pwd_context
 
 # Logger for debugging
 logger = logging.getLogger(__name__)
@@ -28,7 +41,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """
@@ -40,7 +53,7 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: The hashed password
     """
-    return pwd_context.hash(password)
+    return _get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
     """
@@ -63,6 +76,68 @@ def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of already-verified JWTs.
+
+    Entries are keyed by the SHA-256 digest of the token (the raw token is
+    never stored) and expire at the token's own ``exp`` claim, so a cached
+    token is never accepted after it would have failed verification.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, User]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[User]:
+        """Return the cached user for a token, or None on a miss or expired entry."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, user: User, expires_at: float) -> None:
+        """Cache a verified token until ``expires_at`` (Unix time)."""
+        if self.maxsize <= 0:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+# Verified-token cache shared by every request in this process
+token_cache = VerifiedTokenCache(settings.auth_token_cache_size)
+
 # Security scheme for JWT authentication
 security = HTTPBearer()
 
@@ -70,6 +145,9 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     """
     FastAPI dependency to get the current authenticated user from JWT token.
     
+    Verified tokens are cached until they expire, so repeated requests with
+    the same token skip signature verification and model construction.
+    
     Args:
         credentials: HTTPAuthorizationCredentials from the Authorization header
         
@@ -79,6 +157,26 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     Raises:
         HTTPException: 401 if token is invalid, expired, or missing
     """
+    return verify_access_token(credentials.credentials)
+
+def verify_access_token(token: str) -> User:
+    """
+    Get the user of a JWT access token, verifying it on first use.
+    
+    Args:
+        token: The bearer token
+        
+    Returns:
+        User: The authenticated user
+        
+    Raises:
+        HTTPException: 401 if token is invalid or expired
+    """
+    # Fast path: token already verified and not yet expired
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -88,7 +186,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     try:
         # Decode the JWT token
         payload = jwt.decode(
-            credentials.credentials, 
+            token, 
             settings.secret_key, 
             algorithms=[settings.algorithm]
         )
@@ -122,4 +220,9 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         updated_at=None
     )
     
+    # Only tokens with an expiry can be cached safely
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        token_cache.put(token, user, float(expires_at))
+    
     return user
\ No newline at end of file
@@ -0,0 +1,135 @@
+import gc
+import math
+import os
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+# Worker class: gunicorn process management around uvicorn's event loop
+WORKER_CLASS = "uvicorn_worker.UvicornWorker"
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """CPU quota of the container (cgroup v2 or v1), or None if unlimited."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+def available_cpus() -> int:
+    """
+    Number of cores this process may actually use.
+
+    Takes the smaller of the CPU affinity mask and the container's CPU
+    quota, so a 2-CPU container on a 64-core host counts as 2.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
+
+def worker_count() -> int:
+    """
+    Number of server workers: ``WEB_CONCURRENCY`` if set, else one per core.
+
+    Workers are async, so one per core keeps every core busy on CPU-bound
+    work (JWT checks, serialization) without oversubscribing it.
+    """
+    if settings.web_concurrency:
+        return max(1, settings.web_concurrency)
+    return available_cpus()
+
+def _when_ready(server) -> None:
+    """
+    Runs in the master after the app is loaded, before the first fork.
+
+    Moves every object allocated so far (the imported app) to the
+    collector's permanent generation, so collections in the workers do
+    not write to those objects and their pages stay shared copy-on-write.
+    """
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"App preloaded, forking {server.num_workers} workers")
+
+def gunicorn_options(workers: Optional[int] = None) -> Dict[str, Any]:
+    """Gunicorn configuration of the production server, from settings."""
+    return {
+        "bind": f"{settings.server_host}:{settings.server_port}",
+        "workers": workers or worker_count(),
+        "worker_class": WORKER_CLASS,
+        # Import the app once in the master; workers inherit it through fork
+        "preload_app": True,
+        # Recycle workers after a jittered number of requests, so slow
+        # leaks or fragmentation never build up and workers restart one by one
+        "max_requests": settings.server_max_requests,
+        "max_requests_jitter": settings.server_max_requests_jitter,
+        "graceful_timeout": settings.server_graceful_timeout,
+        "timeout": settings.server_worker_timeout,
+        "keepalive": settings.server_keepalive_seconds,
+        "accesslog": "-" if settings.server_access_log else None,
+        "errorlog": "-",
+        "when_ready": _when_ready,
+    }
+
+def run_production_server(app, workers: Optional[int] = None) -> None:
+    """
+    Serve ``app`` with preforked workers (blocks until shutdown).
+
+    The app is already imported by the caller, so it is loaded once in the
+    master process and shared with the workers copy-on-write. Connection
+    pools and clients are created lazily, so each worker opens its own
+    after the fork.
+
+    Args:
+        app: The ASGI application to serve
+        workers: Worker count (defaults to ``worker_count()``)
+
+    Raises:
+        RuntimeError: If background jobs are set to run eagerly in the API,
+            or responses to be cached per process
+    """
+    if settings.worker_eager:
+        raise RuntimeError(
+            "WORKER_EAGER runs the ingestion pipeline inside the API workers; "
+            "unset it and run Celery workers against REDIS_URL in production"
+        )
+    if settings.response_cache_backend == "memory":
+        raise RuntimeError(
+            "RESPONSE_CACHE_BACKEND=memory only sees invalidations made by its own process, so the other "
+            "workers and the background jobs would leave it serving stale responses; use redis or none"
+        )
+
+    from gunicorn.app.base import BaseApplication
+
+    options = gunicorn_options(workers)
+
+    class ProductionServer(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    ProductionServer().run()
@@ -0,0 +1,77 @@
+import builtins
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+# Application packages are reported per module, third-party ones per package
+APP_PACKAGES = ("app", "workers")
+
+class ImportProfiler:
+    """
+    Attribute the time spent importing modules at boot.
+
+    Wraps ``builtins.__import__`` while the application is being imported
+    and charges each import its own time (excluding the imports it
+    triggers), keyed by top-level package for libraries (``fastapi``,
+    ``supabase``) and by module for the application's own code. Imports of
+    modules that are already loaded take the original fast path.
+    """
+
+    def __init__(self):
+        self._original = None
+        self._children: List[float] = []
+        self._started = 0.0
+        self.total_seconds = 0.0
+        self.self_seconds: Dict[str, float] = defaultdict(float)
+
+    def start(self) -> None:
+        self._original = builtins.__import__
+        self._started = time.perf_counter()
+        builtins.__import__ = self._import
+
+    def stop(self) -> None:
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+            self.total_seconds = time.perf_counter() - self._started
+
+    @staticmethod
+    def _owner(name: str, globals: Optional[Dict[str, Any]], level: int) -> str:
+        if level > 0 and globals:
+            package = globals.get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0] if level > 1 else package
+            name = f"{base}.{name}" if name else base
+        top = name.split(".", 1)[0]
+        return name if top in APP_PACKAGES else top
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        self._children.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            self.self_seconds[self._owner(name, globals, level)] += elapsed - children
+
+    def top(self, count: int = 10) -> Dict[str, float]:
+        """The ``count`` most expensive packages/modules, in seconds."""
+        ranked = sorted(self.self_seconds.items(), key=lambda item: item[1], reverse=True)
+        return {name: round(seconds, 4) for name, seconds in ranked[:count]}
+
+    def report(self, count: int = 10) -> Dict[str, Any]:
+        return {"import_seconds": round(self.total_seconds, 4), "top_imports": self.top(count)}
+
+    def summary(self, count: int = 10) -> str:
+        """One log line: total import time and the heaviest imports."""
+        parts = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.top(count).items())
+        return f"Application imported in {self.total_seconds * 1000:.0f} ms ({parts})"
+
+# Profiler of the API process, started by app.main before its other imports
+import_profiler = ImportProfiler()
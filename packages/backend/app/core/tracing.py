@@ -0,0 +1,62 @@
+import threading
+import time
+from typing import Any, Dict, Sequence
+
+class AdaptiveTracesSampler:
+    """
+    Sentry ``traces_sampler`` that caps the number of traced requests.
+
+    Requests are sampled at ``base_rate`` until the traced volume would
+    exceed ``target_per_second``; above that the rate drops in proportion
+    to the observed request rate, so tracing cost stays flat under load.
+    Decisions made upstream (distributed traces) are kept, and probe
+    endpoints are never traced.
+
+    The request rate is measured over fixed windows and the rate computed
+    at the end of one window is applied during the next.
+    """
+
+    def __init__(
+        self,
+        base_rate: float,
+        target_per_second: float,
+        window_seconds: float = 10.0,
+        ignored_paths: Sequence[str] = ("/", "/health", "/metrics")
+    ):
+        self.base_rate = base_rate
+        self.target_per_second = target_per_second
+        self.window_seconds = window_seconds
+        self.ignored_paths = set(ignored_paths)
+        self.current_rate = base_rate
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._lock = threading.Lock()
+
+    def _observe_request(self) -> float:
+        """Count a request and return the sample rate currently in effect."""
+        with self._lock:
+            now = time.monotonic()
+            self._window_count += 1
+            elapsed = now - self._window_start
+
+            if elapsed >= self.window_seconds:
+                requests_per_second = self._window_count / elapsed
+                if self.target_per_second > 0 and requests_per_second * self.base_rate > self.target_per_second:
+                    self.current_rate = self.target_per_second / requests_per_second
+                else:
+                    self.current_rate = self.base_rate
+                self._window_start = now
+                self._window_count = 0
+
+            return self.current_rate
+
+    def __call__(self, sampling_context: Dict[str, Any]) -> float:
+        parent_sampled = sampling_context.get("parent_sampled")
+        if parent_sampled is not None:
+            return 1.0 if parent_sampled else 0.0
+
+        asgi_scope = sampling_context.get("asgi_scope") or {}
+        if asgi_scope.get("path") in self.ignored_paths:
+            return 0.0
+
+        return self._observe_request()
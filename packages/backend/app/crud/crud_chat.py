@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List
+from datetime import datetime
+
+from app.schemas.chat import ChatMessage, ChatRole
+from app.crud.rows import decode_rows
+
+# Imported for type hints only; the SDK loads when the first client is created
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+async def get_chat_history(client: AsyncClient, mentor_id: str, user_id: str, limit: int) -> List[ChatMessage]:
+    """
+    Get the most recent messages of a user's conversation with a mentor.
+
+    Args:
+        client: Async Supabase client instance
+        mentor_id: ID of the mentor
+        user_id: ID of the user
+        limit: Maximum number of messages to return
+
+    Returns:
+        List[ChatMessage]: Messages in chronological order (oldest first)
+
+    Raises:
+        Exception: If retrieval fails
+    """
+    try:
+        response = await client.table("chat_messages").select("role, content, created_at").eq("mentor_id", mentor_id).eq("user_id", user_id).order("created_at", desc=True).limit(limit).execute()
+
+        # Rows come newest first; the LLM needs them oldest first
+        return decode_rows(ChatMessage, response.data[::-1])
+
+    except Exception as e:
+        raise Exception(f"Error retrieving chat history: {str(e)}")
+
+async def add_chat_exchange(
+    client: AsyncClient,
+    mentor_id: str,
+    user_id: str,
+    question: str,
+    answer: str,
+    asked_at: datetime
+) -> None:
+    """
+    Store a question and its answer in a single insert.
+
+    Args:
+        client: Async Supabase client instance
+        mentor_id: ID of the mentor
+        user_id: ID of the user
+        question: The user's message
+        answer: The mentor's generated answer
+        asked_at: When the question was received
+
+    Raises:
+        Exception: If the insert fails
+    """
+    try:
+        answered_at = datetime.utcnow()
+
+        await client.table("chat_messages").insert([
+            {
+                "mentor_id": mentor_id,
+                "user_id": user_id,
+                "role": ChatRole.USER.value,
+                "content": question,
+                "created_at": asked_at.isoformat()
+            },
+            {
+                "mentor_id": mentor_id,
+                "user_id": user_id,
+                "role": ChatRole.ASSISTANT.value,
+                "content": answer,
+                "created_at": answered_at.isoformat()
+            }
+        ]).execute()
+
+    except Exception as e:
+        raise Exception(f"Error saving chat messages: {str(e)}")
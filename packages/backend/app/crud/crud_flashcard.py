@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from app.schemas.flashcard import Flashcard
+from app.crud.rows import decode_rows
+
+# Imported for type hints only; the SDK loads when the first client is created
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+async def get_due_window(
+    client: AsyncClient,
+    user_id: str,
+    mentor_id: Optional[str],
+    limit: int
+) -> List[Tuple[datetime, str]]:
+    """
+    Get the earliest due times of a user's cards.
+    
+    Reads the (user_id, due_at) index (or its per-mentor twin) from the
+    start, so the cost depends on ``limit``, not on how many cards the
+    user has.
+    
+    Args:
+        client: Async Supabase client instance
+        user_id: ID of the user
+        mentor_id: Only cards of this mentor (None for all of the user's cards)
+        limit: Maximum number of cards
+        
+    Returns:
+        List[Tuple[datetime, str]]: (due_at, card ID) pairs, earliest first
+        
+    Raises:
+        Exception: If retrieval fails
+    """
+    try:
+        query = client.table("flashcards").select("id, due_at").eq("user_id", user_id)
+        if mentor_id is not None:
+            query = query.eq("mentor_id", mentor_id)
+        
+        response = await query.order("due_at").order("id").limit(limit).execute()
+        
+        return [(datetime.fromisoformat(row["due_at"].replace('Z', '+00:00')), row["id"]) for row in response.data]
+        
+    except Exception as e:
+        raise Exception(f"Error retrieving due flashcards: {str(e)}")
+
+async def get_flashcards_by_ids(client: AsyncClient, user_id: str, card_ids: List[str]) -> List[Flashcard]:
+    """
+    Get several of a user's cards by ID.
+    
+    Args:
+        client: Async Supabase client instance
+        user_id: ID of the user (for ownership verification)
+        card_ids: IDs of the cards
+        
+    Returns:
+        List[Flashcard]: The cards found and owned by the user, in no particular order
+        
+    Raises:
+        Exception: If retrieval fails
+    """
+    try:
+        response = await client.table("flashcards").select("*").in_("id", card_ids).eq("user_id", user_id).execute()
+        
+        return decode_rows(Flashcard, response.data)
+        
+    except Exception as e:
+        raise Exception(f"Error retrieving flashcards: {str(e)}")
+
+async def review_flashcards(client: AsyncClient, user_id: str, updates: List[Dict[str, Any]]) -> List[Flashcard]:
+    """
+    Store the new scheduling state of a batch of reviewed cards in one call.
+    
+    Args:
+        client: Async Supabase client instance
+        user_id: ID of the user (for ownership verification)
+        updates: ``id``, ``ease_factor``, ``interval_days``, ``repetitions``,
+            ``due_at`` and ``last_reviewed_at`` of each card
+            
+    Returns:
+        List[Flashcard]: The updated cards (cards not owned by the user are skipped)
+        
+    Raises:
+        Exception: If the update fails
+    """
+    try:
+        response = await client.rpc("review_flashcards", {
+            "p_user_id": user_id,
+            "p_reviews": updates
+        }).execute()
+        
+        return decode_rows(Flashcard, response.data)
+        
+    except Exception as e:
+        raise Exception(f"Error storing flashcard reviews: {str(e)}")
@@ -1,15 +1,46 @@
-from typing import List, Optional, Dict, Any
-from supabase import Client
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from datetime import datetime
 
 from app.schemas.mentor import MentorCreate, MentorUpdate, Mentor
+from app.schemas.pagination import DEFAULT_PAGE_SIZE, Page, cursor_position, encode_cursor, keyset_filter
+from app.crud.rows import decode_row, decode_rows
+from app.db.postgres import get_postgres_pool
+
+# Imported for type hints only; the drivers load when first used
+if TYPE_CHECKING:
+    import asyncpg
+    from supabase import AsyncClient
+
+# Mentor columns for direct Postgres reads (IDs as text, like PostgREST returns them).
+# Statements qualify m.id so ORDER BY sorts by the uuid column, not the text alias.
+MENTOR_COLUMNS = (
+    "m.id::text AS id, m.user_id::text AS user_id, m.name, m.description, m.expertise, "
+    "m.avatar_url, m.color, m.created_at, m.updated_at"
+)
 
-def create_mentor(client: Client, mentor_data: MentorCreate, user_id: str) -> Mentor:
+# Direct Postgres statements (prepared once per pooled connection)
+SELECT_MENTORS_PAGE = f"""
+    SELECT {MENTOR_COLUMNS} FROM public.mentors m
+    WHERE m.user_id = $1
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT $2
+"""
+SELECT_MENTORS_PAGE_AFTER = f"""
+    SELECT {MENTOR_COLUMNS} FROM public.mentors m
+    WHERE m.user_id = $1 AND (m.created_at, m.id) < ($3, $4)
+    ORDER BY m.created_at DESC, m.id DESC
+    LIMIT $2
+"""
+SELECT_MENTOR = f"SELECT {MENTOR_COLUMNS} FROM public.mentors m WHERE m.id = $1 AND m.user_id = $2"
+
+async def create_mentor(client: AsyncClient, mentor_data: MentorCreate, user_id: str) -> Mentor:
     """
     Create a new mentor for a specific user.
     
     Args:
-        client: Supabase client instance
+        client: Async Supabase client instance
         mentor_data: MentorCreate schema with mentor details
         user_id: ID of the user creating the mentor
         
@@ -33,63 +64,91 @@ def create_mentor(client: Client, mentor_data: MentorCreate, user_id: str) -> Me
         }
         
         # Insert mentor into database
-        response = client.table("mentors").insert(mentor_dict).execute()
+        response = await client.table("mentors").insert(mentor_dict).execute()
         
         if not response.data:
             raise Exception("Failed to create mentor")
         
-        # Return the created mentor with proper datetime parsing
-        mentor_data_result = response.data[0]
-        if mentor_data_result.get('created_at') and isinstance(mentor_data_result['created_at'], str):
-            mentor_data_result['created_at'] = datetime.fromisoformat(mentor_data_result['created_at'].replace('Z', '+00:00'))
-        if mentor_data_result.get('updated_at') and isinstance(mentor_data_result['updated_at'], str):
-            mentor_data_result['updated_at'] = datetime.fromisoformat(mentor_data_result['updated_at'].replace('Z', '+00:00'))
-        
-        return Mentor(**mentor_data_result)
+        return decode_row(Mentor, response.data[0])
         
     except Exception as e:
         raise Exception(f"Error creating mentor: {str(e)}")
 
-def get_mentors_by_user(client: Client, user_id: str) -> List[Mentor]:
+async def get_mentors_by_user(
+    client: AsyncClient,
+    user_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Page[Mentor]:
     """
-    Get all mentors belonging to a specific user.
+    Get a page of the mentors belonging to a specific user, newest first.
+    
+    Uses keyset pagination on (created_at, id), so every page costs the same
+    however deep the user scrolls.
     
     Args:
-        client: Supabase client instance
+        client: Async Supabase client instance
         user_id: ID of the user whose mentors to retrieve
+        limit: Maximum number of mentors in the page
+        cursor: Opaque cursor from the previous page's next_cursor
         
     Returns:
-        List[Mentor]: List of mentors belonging to the user
+        Page[Mentor]: The mentors and the cursor of the next page (if any)
         
     Raises:
-        Exception: If retrieval fails
+        Exception: If retrieval fails or the cursor is invalid
     """
     try:
-        # Query mentors for the specific user
-        response = client.table("mentors").select("*").eq("user_id", user_id).order("created_at", desc=True).execute()
-        
-        # Convert to Mentor objects with proper datetime parsing
-        mentors = []
-        for mentor_data in response.data:
-            # Parse datetime strings if they exist
-            if mentor_data.get('created_at') and isinstance(mentor_data['created_at'], str):
-                mentor_data['created_at'] = datetime.fromisoformat(mentor_data['created_at'].replace('Z', '+00:00'))
-            if mentor_data.get('updated_at') and isinstance(mentor_data['updated_at'], str):
-                mentor_data['updated_at'] = datetime.fromisoformat(mentor_data['updated_at'].replace('Z', '+00:00'))
-            
-            mentors.append(Mentor(**mentor_data))
-        
-        return mentors
+        # Read straight from Postgres when a direct connection is configured
+        pool = await get_postgres_pool()
+        if pool is not None:
+            return await _get_mentors_by_user_postgres(pool, user_id, limit, cursor)
+        
+        # Query mentors for the specific user, starting after the cursor
+        query = client.table("mentors").select("*").eq("user_id", user_id)
+        if cursor:
+            query = query.or_(keyset_filter(cursor))
+        
+        # Fetch one extra row to know whether there is a next page
+        response = await query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1).execute()
+        
+        rows = response.data[:limit]
+        next_cursor = None
+        if len(response.data) > limit:
+            next_cursor = encode_cursor(rows[-1]["created_at"], str(rows[-1]["id"]))
+        
+        # Decode the whole page in one validation pass
+        return Page[Mentor](items=decode_rows(Mentor, rows), next_cursor=next_cursor)
         
     except Exception as e:
         raise Exception(f"Error retrieving mentors: {str(e)}")
 
-def get_mentor_by_id(client: Client, mentor_id: str, user_id: str) -> Optional[Mentor]:
+async def _get_mentors_by_user_postgres(
+    pool: asyncpg.Pool,
+    user_id: str,
+    limit: int,
+    cursor: Optional[str]
+) -> Page[Mentor]:
+    """Direct Postgres version of ``get_mentors_by_user`` (same pages and cursors)."""
+    if cursor:
+        created_at, row_id = cursor_position(cursor)
+        records = await pool.fetch(SELECT_MENTORS_PAGE_AFTER, user_id, limit + 1, created_at, row_id)
+    else:
+        records = await pool.fetch(SELECT_MENTORS_PAGE, user_id, limit + 1)
+    
+    rows = [dict(record) for record in records[:limit]]
+    next_cursor = None
+    if len(records) > limit:
+        next_cursor = encode_cursor(rows[-1]["created_at"].isoformat(), rows[-1]["id"])
+    
+    return Page[Mentor](items=decode_rows(Mentor, rows), next_cursor=next_cursor)
+
+async def get_mentor_by_id(client: AsyncClient, mentor_id: str, user_id: str) -> Optional[Mentor]:
     """
     Get a specific mentor by ID, ensuring it belongs to the user.
     
     Args:
-        client: Supabase client instance
+        client: Async Supabase client instance
         mentor_id: ID of the mentor to retrieve
         user_id: ID of the user (for ownership verification)
         
@@ -100,30 +159,28 @@ def get_mentor_by_id(client: Client, mentor_id: str, user_id: str) -> Optional[M
         Exception: If retrieval fails
     """
     try:
+        pool = await get_postgres_pool()
+        if pool is not None:
+            record = await pool.fetchrow(SELECT_MENTOR, mentor_id, user_id)
+            return decode_row(Mentor, dict(record)) if record else None
+        
         # Query mentor with both ID and user_id for security
-        response = client.table("mentors").select("*").eq("id", mentor_id).eq("user_id", user_id).execute()
+        response = await client.table("mentors").select("*").eq("id", mentor_id).eq("user_id", user_id).execute()
         
         if not response.data:
             return None
         
-        # Parse datetime strings if they exist
-        mentor_data = response.data[0]
-        if mentor_data.get('created_at') and isinstance(mentor_data['created_at'], str):
-            mentor_data['created_at'] = datetime.fromisoformat(mentor_data['created_at'].replace('Z', '+00:00'))
-        if mentor_data.get('updated_at') and isinstance(mentor_data['updated_at'], str):
-            mentor_data['updated_at'] = datetime.fromisoformat(mentor_data['updated_at'].replace('Z', '+00:00'))
-        
-        return Mentor(**mentor_data)
+        return decode_row(Mentor, response.data[0])
         
     except Exception as e:
         raise Exception(f"Error retrieving mentor: {str(e)}")
 
-def update_mentor(client: Client, mentor_id: str, update_data: MentorUpdate, user_id: str) -> Optional[Mentor]:
+async def update_mentor(client: AsyncClient, mentor_id: str, update_data: MentorUpdate, user_id: str) -> Optional[Mentor]:
     """
     Update a mentor's information.
     
     Args:
-        client: Supabase client instance
+        client: Async Supabase client instance
         mentor_id: ID of the mentor to update
         update_data: MentorUpdate schema with fields to update
         user_id: ID of the user (for ownership verification)
@@ -157,35 +214,28 @@ def update_mentor(client: Client, mentor_id: str, update_data: MentorUpdate, use
         
         if not has_updates:
             # No fields to update, just return current mentor
-            return get_mentor_by_id(client, mentor_id, user_id)
+            return await get_mentor_by_id(client, mentor_id, user_id)
         
         # Always update the updated_at timestamp when there are actual changes
         update_dict["updated_at"] = datetime.utcnow().isoformat()
         
         # Update mentor with user_id filter for security
-        response = client.table("mentors").update(update_dict).eq("id", mentor_id).eq("user_id", user_id).execute()
+        response = await client.table("mentors").update(update_dict).eq("id", mentor_id).eq("user_id", user_id).execute()
         
         if not response.data:
             return None
         
-        # Parse datetime strings if they exist
-        mentor_data = response.data[0]
-        if mentor_data.get('created_at') and isinstance(mentor_data['created_at'], str):
-            mentor_data['created_at'] = datetime.fromisoformat(mentor_data['created_at'].replace('Z', '+00:00'))
-        if mentor_data.get('updated_at') and isinstance(mentor_data['updated_at'], str):
-            mentor_data['updated_at'] = datetime.fromisoformat(mentor_data['updated_at'].replace('Z', '+00:00'))
-        
-        return Mentor(**mentor_data)
+        return decode_row(Mentor, response.data[0])
         
     except Exception as e:
         raise Exception(f"Error updating mentor: {str(e)}")
 
-def delete_mentor(client: Client, mentor_id: str, user_id: str) -> bool:
+async def delete_mentor(client: AsyncClient, mentor_id: str, user_id: str) -> bool:
     """
     Delete a mentor.
     
     Args:
-        client: Supabase client instance
+        client: Async Supabase client instance
         mentor_id: ID of the mentor to delete
         user_id: ID of the user (for ownership verification)
         
@@ -197,7 +247,7 @@ def delete_mentor(client: Client, mentor_id: str, user_id: str) -> bool:
     """
     try:
         # Delete mentor with user_id filter for security
-        response = client.table("mentors").delete().eq("id", mentor_id).eq("user_id", user_id).execute()
+        response = await client.table("mentors").delete().eq("id", mentor_id).eq("user_id", user_id).execute()
         
         # Check if any rows were affected
         return len(response.data) > 0
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from app.schemas.quiz import QuizDifficulty, QuizPool, QuizQuestion
+from app.schemas.resource import ResourceStatus
+from app.crud.crud_mentor import get_mentor_by_id
+from app.crud.rows import decode_rows
+from app.services.quiz import resource_set_hash, resource_versions
+
+# Imported for type hints only; the SDK loads when the first client is created
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+# Question columns returned to the API (plus the version they were generated from)
+QUESTION_COLUMNS = "id, resource_id, resource_version, difficulty, question, options, answer_index, explanation"
+
+# Rows per PostgREST page (the default max-rows limit)
+PAGE_SIZE = 1000
+
+async def _get_pooled_questions(client: AsyncClient, mentor_id: str, difficulty: QuizDifficulty) -> List[Dict[str, Any]]:
+    """
+    Every pooled question of a mentor and difficulty, read page by page.
+    
+    Pages need a total order: while a refresh runs, two versions of a
+    resource share (resource_id, position), so ``id`` breaks the tie.
+    """
+    rows: List[Dict[str, Any]] = []
+    while True:
+        response = await client.table("quiz_questions").select(QUESTION_COLUMNS).eq("mentor_id", mentor_id).eq("difficulty", difficulty.value).order("resource_id").order("position").order("id").range(len(rows), len(rows) + PAGE_SIZE - 1).execute()
+        
+        rows.extend(response.data)
+        if len(response.data) < PAGE_SIZE:
+            return rows
+
+async def get_quiz_pool(
+    client: AsyncClient,
+    mentor_id: str,
+    user_id: str,
+    difficulty: QuizDifficulty
+) -> Optional[QuizPool]:
+    """
+    Get a mentor's pooled quiz questions of one difficulty.
+    
+    The mentor, its analyzed resources, the pool's recorded resource hash
+    and the questions are read concurrently. Only questions generated from
+    the current version of an analyzed resource are returned; the pool is
+    stale if its recorded hash differs from the current resource set.
+    
+    Args:
+        client: Async Supabase client instance
+        mentor_id: ID of the mentor
+        user_id: ID of the user (for ownership verification)
+        difficulty: Difficulty of the questions
+        
+    Returns:
+        Optional[QuizPool]: The pool, or None if the mentor is not found or not owned by user
+        
+    Raises:
+        Exception: If retrieval fails
+    """
+    try:
+        mentor, resources, pool, questions = await asyncio.gather(
+            get_mentor_by_id(client, mentor_id, user_id),
+            client.table("resources").select("id, created_at, updated_at").eq("mentor_id", mentor_id).eq("status", ResourceStatus.ANALYZED.value).execute(),
+            client.table("quiz_pools").select("resource_hash").eq("mentor_id", mentor_id).execute(),
+            _get_pooled_questions(client, mentor_id, difficulty),
+        )
+        
+        if mentor is None:
+            return None
+        
+        versions = resource_versions(resources.data)
+        
+        # Questions of re-processed resources stay until the refresh drops them
+        current = [row for row in questions if versions.get(row["resource_id"]) == row["resource_version"]]
+        
+        return QuizPool(
+            resource_hash=resource_set_hash(versions),
+            pool_hash=pool.data[0]["resource_hash"] if pool.data else None,
+            resource_ids=sorted(versions),
+            questions=decode_rows(QuizQuestion, current)
+        )
+        
+    except Exception as e:
+        raise Exception(f"Error retrieving quiz pool: {str(e)}")
@@ -1,15 +1,56 @@
-from typing import List, Optional
-from supabase import Client
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional
 from datetime import datetime
 
 from app.schemas.resource import ResourceCreate, ResourceUpdate, Resource
+from app.schemas.pagination import DEFAULT_PAGE_SIZE, Page, cursor_position, encode_cursor, keyset_filter
+from app.crud.rows import decode_row, decode_rows
+from app.db.postgres import get_postgres_pool
+
+# Imported for type hints only; the drivers load when first used
+if TYPE_CHECKING:
+    import asyncpg
+    from supabase import AsyncClient
+
+# Resource columns for direct Postgres reads (IDs and enums as text, like PostgREST returns them)
+RESOURCE_COLUMNS = (
+    "r.id::text AS id, r.name, r.type::text AS type, r.mentor_id::text AS mentor_id, "
+    "r.url, r.status::text AS status, r.created_at, r.updated_at"
+)
 
-def create_resource(client: Client, resource_data: ResourceCreate, user_id: str) -> Resource:
+# Direct Postgres statements (prepared once per pooled connection). The owned
+# mentor is the driving row, so an unknown mentor returns no rows at all and
+# a mentor without resources returns one row with a NULL resource.
+SELECT_RESOURCES_PAGE = f"""
+    SELECT {RESOURCE_COLUMNS} FROM public.mentors m
+    LEFT JOIN LATERAL (
+        SELECT * FROM public.resources
+        WHERE mentor_id = m.id
+        ORDER BY created_at DESC, id DESC
+        LIMIT $3
+    ) r ON true
+    WHERE m.id = $1 AND m.user_id = $2
+    ORDER BY r.created_at DESC, r.id DESC
+"""
+SELECT_RESOURCES_PAGE_AFTER = f"""
+    SELECT {RESOURCE_COLUMNS} FROM public.mentors m
+    LEFT JOIN LATERAL (
+        SELECT * FROM public.resources
+        WHERE mentor_id = m.id AND (created_at, id) < ($4, $5)
+        ORDER BY created_at DESC, id DESC
+        LIMIT $3
+    ) r ON true
+    WHERE m.id = $1 AND m.user_id = $2
+    ORDER BY r.created_at DESC, r.id DESC
+"""
+
+async def create_resource(client: AsyncClient, resource_data: ResourceCreate, user_id: str) -> Resource:
     """
     Create a new resource for a specific mentor.
     
     Args:
-        client: Supabase client instance
+        client: Async Supabase client instance
         resource_data: ResourceCreate schema with resource details
         user_id: ID of the user (for mentor ownership verification)
         
@@ -20,114 +61,201 @@ def create_resource(client: Client, resource_data: ResourceCreate, user_id: str)
         Exception: If resource creation fails or mentor doesn't belong to user
     """
     try:
-        # First verify that the mentor belongs to the user
-        mentor_check = client.table("mentors").select("id").eq("id", resource_data.mentor_id).eq("user_id", user_id).execute()
+        # Ownership check and insert happen in one statement (see the
+        # create_resource_for_user migration)
+        response = await client.rpc("create_resource_for_user", {
+            "p_user_id": user_id,
+            "p_mentor_id": resource_data.mentor_id,
+            "p_name": resource_data.name,
+            "p_type": resource_data.type.value,
+            "p_url": resource_data.url,
+            "p_status": resource_data.status.value,
+            "p_storage_path": resource_data.storage_path
+        }).execute()
         
-        if not mentor_check.data:
+        if not response.data:
             raise Exception("Mentor not found or doesn't belong to user")
         
-        # Prepare resource data for insertion
-        resource_dict = {
-            "name": resource_data.name,
-            "type": resource_data.type.value,
-            "mentor_id": resource_data.mentor_id,
-            "url": resource_data.url,
-            "status": resource_data.status.value,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
-        }
+        return decode_row(Resource, response.data[0])
         
-        # Insert resource into database
-        response = client.table("resources").insert(resource_dict).execute()
+    except Exception as e:
+        raise Exception(f"Error creating resource: {str(e)}")
+
+async def create_resources(client: AsyncClient, resources_data: List[ResourceCreate]) -> List[Resource]:
+    """
+    Create several resources in a single bulk insert.
+    
+    Unlike ``create_resource`` this does not check mentor ownership; the
+    caller must have verified that every mentor belongs to the user.
+    
+    Args:
+        client: Async Supabase client instance
+        resources_data: ResourceCreate schemas of the resources to create
         
-        if not response.data:
-            raise Exception("Failed to create resource")
+    Returns:
+        List[Resource]: The created resources, in the same order
         
-        # Return the created resource with proper datetime parsing
-        resource_data_result = response.data[0]
-        if resource_data_result.get('created_at') and isinstance(resource_data_result['created_at'], str):
-            resource_data_result['created_at'] = datetime.fromisoformat(resource_data_result['created_at'].replace('Z', '+00:00'))
-        if resource_data_result.get('updated_at') and isinstance(resource_data_result['updated_at'], str):
-            resource_data_result['updated_at'] = datetime.fromisoformat(resource_data_result['updated_at'].replace('Z', '+00:00'))
+    Raises:
+        Exception: If the insert fails
+    """
+    try:
+        now = datetime.utcnow().isoformat()
+        response = await client.table("resources").insert([
+            {
+                "name": resource_data.name,
+                "type": resource_data.type.value,
+                "mentor_id": resource_data.mentor_id,
+                "url": resource_data.url,
+                "status": resource_data.status.value,
+                "storage_path": resource_data.storage_path,
+                "created_at": now,
+                "updated_at": now
+            }
+            for resource_data in resources_data
+        ]).execute()
         
-        return Resource(**resource_data_result)
+        return decode_rows(Resource, response.data)
         
     except Exception as e:
-        raise Exception(f"Error creating resource: {str(e)}")
+        raise Exception(f"Error creating resources: {str(e)}")
 
-def get_resources_by_mentor(client: Client, mentor_id: str, user_id: str) -> List[Resource]:
+async def get_resources_by_mentor(
+    client: AsyncClient,
+    mentor_id: str,
+    user_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Page[Resource]:
     """
-    Get all resources belonging to a specific mentor.
+    Get a page of the resources belonging to a specific mentor, newest first.
+    
+    Uses keyset pagination on (created_at, id), so every page costs the same
+    however deep the user scrolls.
     
     Args:
-        client: Supabase client instance
+        client: Async Supabase client instance
         mentor_id: ID of the mentor whose resources to retrieve
         user_id: ID of the user (for mentor ownership verification)
+        limit: Maximum number of resources in the page
+        cursor: Opaque cursor from the previous page's next_cursor
         
     Returns:
-        List[Resource]: List of resources belonging to the mentor
+        Page[Resource]: The resources and the cursor of the next page (if any)
         
     Raises:
-        Exception: If retrieval fails or mentor doesn't belong to user
+        Exception: If retrieval fails, the cursor is invalid or mentor doesn't belong to user
     """
     try:
-        # First verify that the mentor belongs to the user
-        mentor_check = client.table("mentors").select("id").eq("id", mentor_id).eq("user_id", user_id).execute()
+        # Read straight from Postgres when a direct connection is configured
+        pool = await get_postgres_pool()
+        if pool is not None:
+            return await _get_resources_by_mentor_postgres(pool, mentor_id, user_id, limit, cursor)
         
-        if not mentor_check.data:
-            raise Exception("Mentor not found or doesn't belong to user")
+        # Fetch the mentor (filtered by owner) with a page of its resources
+        # embedded, so the ownership check and the listing are one round trip
+        query = client.table("mentors").select("id, resources(*)").eq("id", mentor_id).eq("user_id", user_id)
+        if cursor:
+            query = query.or_(keyset_filter(cursor), reference_table="resources")
         
-        # Query resources for the specific mentor
-        response = client.table("resources").select("*").eq("mentor_id", mentor_id).order("created_at", desc=True).execute()
+        # Fetch one extra row to know whether there is a next page
+        response = await query.order("created_at", desc=True, foreign_table="resources").order("id", desc=True, foreign_table="resources").limit(limit + 1, foreign_table="resources").execute()
         
-        # Convert to Resource objects with proper datetime parsing
-        resources = []
-        for resource_data in response.data:
-            # Parse datetime strings if they exist
-            if resource_data.get('created_at') and isinstance(resource_data['created_at'], str):
-                resource_data['created_at'] = datetime.fromisoformat(resource_data['created_at'].replace('Z', '+00:00'))
-            if resource_data.get('updated_at') and isinstance(resource_data['updated_at'], str):
-                resource_data['updated_at'] = datetime.fromisoformat(resource_data['updated_at'].replace('Z', '+00:00'))
-            
-            resources.append(Resource(**resource_data))
+        if not response.data:
+            raise Exception("Mentor not found or doesn't belong to user")
+        
+        embedded = response.data[0]["resources"]
+        rows = embedded[:limit]
+        next_cursor = None
+        if len(embedded) > limit:
+            next_cursor = encode_cursor(rows[-1]["created_at"], str(rows[-1]["id"]))
         
-        return resources
+        # Decode the whole page in one validation pass
+        return Page[Resource](items=decode_rows(Resource, rows), next_cursor=next_cursor)
         
     except Exception as e:
         raise Exception(f"Error retrieving resources: {str(e)}")
 
-def delete_resource(client: Client, resource_id: str, user_id: str) -> bool:
+async def _get_resources_by_mentor_postgres(
+    pool: asyncpg.Pool,
+    mentor_id: str,
+    user_id: str,
+    limit: int,
+    cursor: Optional[str]
+) -> Page[Resource]:
+    """Direct Postgres version of ``get_resources_by_mentor`` (same pages and cursors)."""
+    if cursor:
+        created_at, row_id = cursor_position(cursor)
+        records = await pool.fetch(SELECT_RESOURCES_PAGE_AFTER, mentor_id, user_id, limit + 1, created_at, row_id)
+    else:
+        records = await pool.fetch(SELECT_RESOURCES_PAGE, mentor_id, user_id, limit + 1)
+    
+    if not records:
+        raise Exception("Mentor not found or doesn't belong to user")
+    
+    embedded = [dict(record) for record in records if record["id"] is not None]
+    rows = embedded[:limit]
+    next_cursor = None
+    if len(embedded) > limit:
+        next_cursor = encode_cursor(rows[-1]["created_at"].isoformat(), rows[-1]["id"])
+    
+    return Page[Resource](items=decode_rows(Resource, rows), next_cursor=next_cursor)
+
+async def delete_resource(client: AsyncClient, resource_id: str, user_id: str) -> Optional[Resource]:
     """
     Delete a resource (with mentor ownership verification).
     
     Args:
-        client: Supabase client instance
+        client: Async Supabase client instance
         resource_id: ID of the resource to delete
         user_id: ID of the user (for mentor ownership verification)
         
     Returns:
-        bool: True if deletion was successful, False if resource not found
+        Optional[Resource]: The deleted resource, None if resource not found
+            or not owned by the user
         
     Raises:
         Exception: If deletion fails
     """
     try:
-        # Get resource with mentor verification through JOIN
-        response = client.table("resources").select("*, mentors!inner(user_id)").eq("id", resource_id).execute()
+        # Ownership check and delete happen in one statement (see the
+        # delete_resource_for_user migration)
+        response = await client.rpc("delete_resource_for_user", {
+            "p_user_id": user_id,
+            "p_resource_id": resource_id
+        }).execute()
         
+        # Resources that don't exist or belong to another user are both "not found"
         if not response.data:
-            return False
+            return None
+        
+        return decode_row(Resource, response.data[0])
+        
+    except Exception as e:
+        raise Exception(f"Error deleting resource: {str(e)}")
+
+async def delete_resources(client: AsyncClient, resource_ids: List[str], user_id: str) -> List[Resource]:
+    """
+    Delete several resources (with mentor ownership verification) in one statement.
+    
+    Args:
+        client: Async Supabase client instance
+        resource_ids: IDs of the resources to delete
+        user_id: ID of the user (for mentor ownership verification)
         
-        # Check if the mentor belongs to the user
-        resource_data = response.data[0]
-        if resource_data["mentors"]["user_id"] != user_id:
-            raise Exception("Resource doesn't belong to user")
+    Returns:
+        List[Resource]: The deleted resources; IDs that were not found or
+            not owned by the user are absent
         
-        # Delete the resource
-        delete_response = client.table("resources").delete().eq("id", resource_id).execute()
+    Raises:
+        Exception: If deletion fails
+    """
+    try:
+        response = await client.rpc("delete_resources_for_user", {
+            "p_user_id": user_id,
+            "p_resource_ids": resource_ids
+        }).execute()
         
-        # Check if any rows were affected
-        return len(delete_response.data) > 0
+        return decode_rows(Resource, response.data)
         
     except Exception as e:
-        raise Exception(f"Error deleting resource: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"Error deleting resources: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict
+
+from app.schemas.user import UserProfile
+from app.crud.rows import decode_row
+
+# Imported for type hints only; the SDK loads when the first client is created
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+async def get_or_create_user_profile(client: AsyncClient, user_id: str) -> UserProfile:
+    """
+    Get a user's profile, creating the default profile on first access.
+    
+    One round trip: the get_or_create_user_profile function inserts the
+    default row unless it exists and returns the stored row either way.
+    
+    Args:
+        client: Async Supabase client instance
+        user_id: ID of the user
+        
+    Returns:
+        UserProfile: The user's profile
+        
+    Raises:
+        Exception: If retrieval fails
+    """
+    try:
+        response = await client.rpc("get_or_create_user_profile", {"p_user_id": user_id}).execute()
+        
+        if not response.data:
+            # A concurrent first access created the row after this call's
+            # snapshot; it is visible to a new call
+            response = await client.rpc("get_or_create_user_profile", {"p_user_id": user_id}).execute()
+        
+        if not response.data:
+            raise Exception("Profile not found")
+        
+        return decode_row(UserProfile, response.data[0])
+        
+    except Exception as e:
+        raise Exception(f"Error retrieving user profile: {str(e)}")
+
+async def upsert_user_profile(client: AsyncClient, user_id: str, values: Dict[str, Any]) -> UserProfile:
+    """
+    Update a user's profile fields, creating the profile if it does not exist.
+    
+    A single atomic ``INSERT ... ON CONFLICT (id) DO UPDATE`` of the given
+    fields: existing rows keep their other columns, new rows get the
+    column defaults.
+    
+    Args:
+        client: Async Supabase client instance
+        user_id: ID of the user
+        values: Profile columns to set
+        
+    Returns:
+        UserProfile: The stored profile
+        
+    Raises:
+        Exception: If the upsert fails
+    """
+    try:
+        response = await client.table("user_profiles").upsert({**values, "id": user_id}, on_conflict="id").execute()
+        
+        if not response.data:
+            raise Exception("Failed to update user profile")
+        
+        return decode_row(UserProfile, response.data[0])
+        
+    except Exception as e:
+        raise Exception(f"Error updating user profile: {str(e)}")
@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Type, TypeVar
+from pydantic import BaseModel, TypeAdapter
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Build (once per model) the validator for a list of rows."""
+    return TypeAdapter(List[model])
+
+def decode_rows(model: Type[ModelT], rows: List[Dict[str, Any]]) -> List[ModelT]:
+    """
+    Turn a PostgREST result into response models in a single validation pass.
+
+    The whole list is validated by one cached ``TypeAdapter``, so the loop
+    over rows and the parsing of timestamps (PostgREST returns ISO 8601
+    strings, with or without ``Z``) run inside pydantic-core instead of
+    Python. Columns the model doesn't declare are ignored.
+
+    Args:
+        model: Pydantic model of a row (e.g. Mentor, Resource)
+        rows: Rows as returned in ``response.data``
+
+    Returns:
+        List[ModelT]: One model per row, in the same order
+
+    Raises:
+        ValidationError: If a row doesn't match the model
+    """
+    return _list_adapter(model).validate_python(rows)
+
+def decode_row(model: Type[ModelT], row: Dict[str, Any]) -> ModelT:
+    """Decode a single row; see ``decode_rows``."""
+    return model.model_validate(row)
@@ -1,30 +1,107 @@
-from typing import Optional
-from supabase import create_client, Client
+from typing import TYPE_CHECKING, Optional, Tuple
+import httpx
 from app.core.config import settings
+from app.core.metrics import InstrumentedAsyncTransport, InstrumentedTransport
 
-# Global client instance
-_supabase_client: Optional[Client] = None
+# The supabase SDK is imported when the first client is created, not at
+# startup (it is one of the slowest imports of the API)
+if TYPE_CHECKING:
+    from supabase import AsyncClient, Client
 
-def get_supabase_client() -> Client:
+# Global client instances (one of each per process)
+_supabase_client: Optional["Client"] = None
+_async_supabase_client: Optional["AsyncClient"] = None
+
+def _get_supabase_config() -> Tuple[str, str]:
+    """
+    Read the Supabase URL and key from settings.
+
+    Raises:
+        ValueError: If the Supabase configuration is missing
+    """
+    url = settings.supabase_url
+    key = settings.supabase_key
+
+    if not url or not key:
+        raise ValueError(
+            "Supabase configuration missing. Please set SUPABASE_URL and SUPABASE_KEY "
+            "environment variables in your .env file."
+        )
+
+    return url, key
+
+def _pool_limits() -> httpx.Limits:
+    """Connection pool limits shared by the sync and async Supabase clients."""
+    return httpx.Limits(
+        max_connections=settings.supabase_pool_max_connections,
+        max_keepalive_connections=settings.supabase_pool_max_keepalive,
+        keepalive_expiry=settings.supabase_pool_keepalive_expiry,
+    )
+
+def get_supabase_client() -> "Client":
     """
     Get or create a Supabase client instance.
     This lazy initialization prevents startup errors when env vars are missing.
+
+    The client is backed by a single keep-alive, HTTP/2-capable connection
+    pool that is reused by PostgREST, Storage and Auth calls. Every call is
+    timed into the Supabase latency metrics.
     """
     global _supabase_client
-    
+
     if _supabase_client is None:
-        url = settings.supabase_url
-        key = settings.supabase_key
-        
-        if not url or not key:
-            raise ValueError(
-                "Supabase configuration missing. Please set SUPABASE_URL and SUPABASE_KEY "
-                "environment variables in your .env file."
-            )
-        
-        _supabase_client = create_client(url, key)
-    
+        from supabase import ClientOptions, create_client
+
+        url, key = _get_supabase_config()
+
+        transport = httpx.HTTPTransport(http2=settings.supabase_http2, limits=_pool_limits())
+        http_client = httpx.Client(
+            transport=InstrumentedTransport(transport),
+            timeout=settings.supabase_request_timeout,
+            follow_redirects=True,
+        )
+        _supabase_client = create_client(url, key, ClientOptions(httpx_client=http_client))
+
     return _supabase_client
 
-# Create a client instance that will be created when first accessed
-supabase = get_supabase_client
\ No newline at end of file
+def get_async_supabase_client() -> "AsyncClient":
+    """
+    Get or create the async Supabase client instance.
+
+    Request handlers should use this client so that PostgREST and Storage
+    round trips do not block the event loop. The underlying httpx pool is
+    created once per process and shared by every request on the worker, and
+    every call is timed into the Supabase latency metrics.
+    """
+    global _async_supabase_client
+
+    if _async_supabase_client is None:
+        from supabase import AsyncClient, AsyncClientOptions
+
+        url, key = _get_supabase_config()
+
+        transport = httpx.AsyncHTTPTransport(http2=settings.supabase_http2, limits=_pool_limits())
+        http_client = httpx.AsyncClient(
+            transport=InstrumentedAsyncTransport(transport),
+            timeout=settings.supabase_request_timeout,
+            follow_redirects=True,
+        )
+        _async_supabase_client = AsyncClient(url, key, AsyncClientOptions(httpx_client=http_client))
+
+    return _async_supabase_client
+
+async def close_supabase_clients() -> None:
+    """Close the shared connection pools. Called on application shutdown."""
+    global _supabase_client, _async_supabase_client
+
+    if _async_supabase_client is not None:
+        await _async_supabase_client.options.httpx_client.aclose()
+        _async_supabase_client = None
+
+    if _supabase_client is not None:
+        _supabase_client.options.httpx_client.close()
+        _supabase_client = None
+
+# Create client instances that will be created when first accessed
+supabase = get_supabase_client
+async_supabase = get_async_supabase_client
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from app.core.config import settings
+
+# asyncpg is only imported once a pool is actually created
+if TYPE_CHECKING:
+    import asyncpg
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+# Global pool instance (one per process), created on first use
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock: Optional[asyncio.Lock] = None
+_retry_after: float = 0.0
+
+# After a failed connection attempt, serve reads through Supabase for this long
+CONNECT_RETRY_SECONDS = 30.0
+
+def _asyncpg_dsn(database_url: str) -> str:
+    """
+    Convert a SQLAlchemy-style URL (``postgresql+psycopg2://...``) to a
+    plain libpq URL that asyncpg accepts.
+    """
+    scheme, separator, rest = database_url.partition("://")
+    return f"{scheme.split('+', 1)[0]}{separator}{rest}"
+
+def postgres_enabled() -> bool:
+    """Whether a direct Postgres connection is configured (``DATABASE_URL``)."""
+    return bool(settings.database_url)
+
+async def get_postgres_pool() -> Optional[asyncpg.Pool]:
+    """
+    Get or create the direct Postgres connection pool.
+
+    Hot read paths use this pool instead of PostgREST when ``DATABASE_URL``
+    is set. asyncpg prepares every query on first use and keeps it in a
+    per-connection statement cache, so repeated reads skip parsing and
+    planning. Behind a transaction-mode pooler (Supabase's port 6543) set
+    ``DATABASE_STATEMENT_CACHE_SIZE=0``, since prepared statements cannot
+    survive there.
+
+    Returns:
+        Optional[asyncpg.Pool]: The pool, or None when no database is
+        configured or it was unreachable recently (callers then fall back
+        to the Supabase client)
+    """
+    global _pool, _pool_lock, _retry_after
+
+    if _pool is not None or not postgres_enabled():
+        return _pool
+    if time.monotonic() < _retry_after:
+        return None
+
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+
+    async with _pool_lock:
+        if _pool is None and time.monotonic() >= _retry_after:
+            import asyncpg
+
+            try:
+                _pool = await asyncpg.create_pool(
+                    _asyncpg_dsn(settings.database_url),
+                    min_size=settings.database_pool_min_size,
+                    max_size=settings.database_pool_max_size,
+                    statement_cache_size=settings.database_statement_cache_size,
+                    command_timeout=settings.database_command_timeout,
+                    max_inactive_connection_lifetime=settings.database_pool_max_idle_seconds,
+                )
+            except Exception as e:
+                _retry_after = time.monotonic() + CONNECT_RETRY_SECONDS
+                logger.warning(f"Direct Postgres unavailable, reading through Supabase for now: {str(e)}")
+
+    return _pool
+
+def postgres_pool_stats() -> Optional[Dict[str, Any]]:
+    """Connection counts of the pool, or None if it has not been created."""
+    if _pool is None:
+        return None
+    return {
+        "size": _pool.get_size(),
+        "idle": _pool.get_idle_size(),
+        "max_size": _pool.get_max_size(),
+    }
+
+async def close_postgres_pool() -> None:
+    """Close the direct Postgres pool. Called on application shutdown."""
+    global _pool
+
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -1,22 +1,77 @@
-import sentry_sdk
+# Time every import below, so the boot log shows what cold start is spent on
+from app.core.startup import import_profiler
+import_profiler.start()
+
+from contextlib import asynccontextmanager
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.core.metrics import MetricsMiddleware, register_cache, render_metrics
+from app.core.ratelimit import LoadSheddingMiddleware, get_rate_limiter
+from app.core.security import token_cache
+from app.core.tracing import AdaptiveTracesSampler
+from app.db.client import close_supabase_clients
+from app.db.postgres import close_postgres_pool, postgres_pool_stats
+from app.services.cache import get_response_cache
+from workers.enqueue import check_broker_configured
+
+# Boot report goes to uvicorn's logger, which is configured by default
+logger = logging.getLogger("uvicorn.error")
 
 # Initialize Sentry
-# Make sure to do this before you initialize your FastAPI app
-sentry_sdk.init(
-    dsn=settings.sentry_dsn,
-    # Enable performance monitoring
-    traces_sample_rate=1.0,
-)
+# Make sure to do this before you initialize your FastAPI app.
+# Without a DSN there is nothing to report, so the SDK and the
+# integrations it auto-enables (SQLAlchemy, Celery, Redis...) are not loaded.
+if settings.sentry_dsn:
+    import sentry_sdk
+
+    sentry_sdk.init(
+        dsn=settings.sentry_dsn,
+        # Sample performance traces, capped at a fixed traced-requests/sec budget
+        traces_sampler=AdaptiveTracesSampler(
+            settings.sentry_traces_sample_rate,
+            settings.sentry_traces_target_per_second
+        ),
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan.
+
+    Startup refuses to serve without a broker for background jobs (unless
+    they run eagerly) and only pre-warms what /health needs (the response
+    cache and rate limiter backends); Supabase clients, the Postgres pool
+    and heavy service modules are created on first use. Shared connection pools are released on shutdown.
+    """
+    check_broker_configured()
+    if settings.worker_eager:
+        logger.warning("WORKER_EAGER is set: background jobs run inside the API process")
+    get_response_cache()
+    get_rate_limiter()
+    logger.info(import_profiler.summary())
+    yield
+    await close_supabase_clients()
+    await close_postgres_pool()
+
 
 # Create FastAPI instance
 app = FastAPI(
     title=settings.app_name,
     version=settings.version,
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan
+)
+
+# Shed load with 503 above the in-flight limit (innermost, so it runs
+# after MetricsMiddleware counted the request and rejections get CORS headers)
+app.add_middleware(
+    LoadSheddingMiddleware,
+    max_in_flight=settings.max_in_flight_requests,
+    retry_after_seconds=settings.shed_retry_after_seconds,
 )
 
 # Add CORS middleware
@@ -28,9 +83,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route latency and in-flight requests
+app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
+# Export cache effectiveness alongside the request metrics
+register_cache("auth_token", token_cache.stats)
+register_cache("response", lambda: get_response_cache().stats())
+
 
 @app.get("/")
 async def health_check():
@@ -49,5 +111,19 @@ async def detailed_health():
         "status": "healthy",
         "app_name": settings.app_name,
         "version": settings.version,
-        "debug": settings.debug
-    } 
\ No newline at end of file
+        "debug": settings.debug,
+        "auth_token_cache": token_cache.stats(),
+        "response_cache": get_response_cache().stats(),
+        "postgres_pool": postgres_pool_stats(),
+        "rate_limiter": get_rate_limiter().stats(),
+        "startup": import_profiler.report(5)
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Metrics of this process in the Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# Every route and module needed to serve is loaded; stop timing imports
+import_profiler.stop()
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+class ChatRole(str, Enum):
+    """Author of a chat message."""
+    USER = "user"
+    ASSISTANT = "assistant"
+
+class ChatRequest(BaseModel):
+    """Schema for chat requests."""
+    message: str = Field(..., min_length=1, max_length=4000)
+
+class ChatMessage(BaseModel):
+    """Schema for a stored chat message."""
+    role: ChatRole
+    content: str
+    created_at: Optional[datetime] = None
+
+class ChatSource(BaseModel):
+    """A resource chunk used as context for an answer."""
+    resource_id: str
+    position: int
+    score: float  # Relevance: rank fusion score with hybrid retrieval, else cosine similarity
+    text: str
+
+class ChatStats(BaseModel):
+    """Latency statistics for one streamed answer."""
+    time_to_first_token_ms: Optional[float] = None
+    total_time_ms: float
+    tokens: int
+    tokens_per_second: float
+    cached: bool = False  # Answer served from the semantic answer cache, without calling the LLM
@@ -0,0 +1,59 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+# Most cards generated by one request
+MAX_FLASHCARDS_PER_REQUEST = 20
+
+# Most reviews stored by one batch
+MAX_REVIEWS_PER_BATCH = 100
+
+class FlashcardGenerate(BaseModel):
+    """Schema for flashcard generation requests."""
+    mentor_id: str
+    resource_id: Optional[str] = None  # None spreads the cards over every analyzed resource
+    card_count: int = Field(10, ge=1, le=MAX_FLASHCARDS_PER_REQUEST)
+
+class FlashcardGeneration(BaseModel):
+    """Schema for accepted flashcard generation requests."""
+    mentor_id: str
+    resource_id: Optional[str] = None
+    card_count: int
+    status: str = "queued"
+
+class Flashcard(BaseModel):
+    """Schema for flashcard responses."""
+    id: str
+    mentor_id: str
+    resource_id: Optional[str] = None
+    front: str
+    back: str
+    ease_factor: float
+    interval_days: float
+    repetitions: int
+    due_at: datetime
+    last_reviewed_at: Optional[datetime] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class DueFlashcards(BaseModel):
+    """Schema for the cards due for review."""
+    cards: List[Flashcard]
+    next_due_at: Optional[datetime] = None  # When the next card not returned becomes due, if known
+
+class FlashcardReview(BaseModel):
+    """Schema for one review of a card."""
+    card_id: str
+    grade: int = Field(..., ge=0, le=5)  # SM-2 quality: 0-2 forgotten, 3 hard, 4 good, 5 easy
+    reviewed_at: Optional[datetime] = None  # When the card was answered (defaults to submission time)
+
+class FlashcardReviewBatch(BaseModel):
+    """Schema for a batch of reviews from a study session."""
+    reviews: List[FlashcardReview] = Field(..., min_length=1, max_length=MAX_REVIEWS_PER_BATCH)
+
+class FlashcardReviewResult(BaseModel):
+    """Schema for stored review batches."""
+    updated: List[Flashcard]
+    not_found: List[str]
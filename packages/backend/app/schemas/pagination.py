@@ -0,0 +1,86 @@
+import base64
+import json
+import re
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Row IDs are UUIDs; anything else in a cursor is rejected
+_ROW_ID = re.compile(r"^[A-Za-z0-9-]+$")
+
+# Page size limits for listing endpoints
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+class Page(BaseModel, Generic[T]):
+    """Schema for a page of a keyset-paginated listing."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    """
+    Build an opaque cursor pointing just after a row.
+
+    Args:
+        created_at: The row's created_at exactly as returned by the database
+        row_id: The row's ID (tie-breaker for equal timestamps)
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Returns:
+        Tuple[str, str]: ``(created_at, id)`` of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(created_at, str) or not isinstance(row_id, str) or not _ROW_ID.match(row_id):
+        raise ValueError("Invalid cursor")
+
+    # Cursor values end up inside a PostgREST filter; only allow real timestamps
+    try:
+        datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+    return created_at, row_id
+
+def keyset_filter(cursor: str) -> str:
+    """
+    PostgREST ``or`` filter selecting rows after a cursor in
+    ``created_at desc, id desc`` order.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return (
+        f'created_at.lt."{created_at}",'
+        f'and(created_at.eq."{created_at}",id.lt."{row_id}")'
+    )
+
+def cursor_position(cursor: str) -> Tuple[datetime, str]:
+    """
+    ``(created_at, id)`` of a cursor as SQL parameters, for queries that
+    compare ``(created_at, id) < (...)`` directly instead of through PostgREST.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return datetime.fromisoformat(created_at.replace('Z', '+00:00')), row_id
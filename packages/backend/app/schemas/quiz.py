@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from enum import Enum
+
+# Longest quiz the API builds (and questions pooled per resource and difficulty)
+MAX_QUIZ_QUESTIONS = 20
+
+class QuizDifficulty(str, Enum):
+    """Quiz difficulty enumeration matching database."""
+    EASY = "easy"
+    MEDIUM = "medium"
+    HARD = "hard"
+
+class QuizRequest(BaseModel):
+    """Schema for quiz generation requests."""
+    resource_id: Optional[str] = None  # None draws from every analyzed resource
+    num_questions: int = Field(5, ge=1, le=MAX_QUIZ_QUESTIONS)
+    difficulty: QuizDifficulty = QuizDifficulty.MEDIUM
+
+class QuizQuestion(BaseModel):
+    """Schema for a multiple-choice quiz question."""
+    id: str
+    resource_id: str
+    difficulty: QuizDifficulty
+    question: str
+    options: List[str]
+    answer_index: int
+    explanation: Optional[str] = None
+
+class QuizPool(BaseModel):
+    """A mentor's pooled questions of one difficulty, with the pool's freshness."""
+    resource_hash: str  # Hash of the mentor's current analyzed resources
+    pool_hash: Optional[str] = None  # Hash the pool was last refreshed for
+    resource_ids: List[str]  # Current analyzed resources
+    questions: List[QuizQuestion]
+
+    @property
+    def stale(self) -> bool:
+        return self.resource_hash != self.pool_hash
+
+class Quiz(BaseModel):
+    """Schema for quiz responses."""
+    mentor_id: str
+    difficulty: QuizDifficulty
+    questions: List[QuizQuestion]
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -27,6 +27,8 @@ class ResourceCreate(ResourceBase):
     """Schema for resource creation requests."""
     url: str
     status: ResourceStatus = ResourceStatus.PENDING
+    # Object path of an uploaded file; set by the API, never from request data
+    storage_path: Optional[str] = None
 
 class ResourceUpdate(BaseModel):
     """Schema for resource update requests."""
@@ -41,6 +43,23 @@ class Resource(ResourceBase):
     status: ResourceStatus
     created_at: datetime
     updated_at: Optional[datetime] = None
+    # Object path of an uploaded file (for cleanup); not part of responses
+    storage_path: Optional[str] = Field(default=None, exclude=True)
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class ResourceUploadResult(BaseModel):
+    """Schema for the outcome of one file in a batch upload."""
+    filename: str
+    resource: Optional[Resource] = None
+    error: Optional[str] = None
+
+class ResourceBulkDelete(BaseModel):
+    """Schema for bulk resource deletion requests."""
+    resource_ids: List[str] = Field(..., min_length=1, max_length=100)
+
+class ResourceBulkDeleteResult(BaseModel):
+    """Schema for bulk resource deletion responses."""
+    deleted: List[str]
+    not_found: List[str]
\ No newline at end of file
@@ -23,6 +23,18 @@ class User(UserBase):
     class Config:
         from_attributes = True
 
+class UserProfile(BaseModel):
+    """Schema for a user's profile row (preferences and usage counters)."""
+    id: str
+    notifications_enabled: bool = True
+    subscription_status: str = "free"
+    mentor_count: int = 0
+    resource_upload_mb: float = 0
+    
+    class Config:
+        # Keep any other profile columns in the response
+        extra = "allow"
+
 class UserInDB(UserBase):
     """Schema for user stored in database (with hashed password)."""
     id: str  
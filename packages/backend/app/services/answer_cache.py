@@ -0,0 +1,227 @@
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import (
+    chat_answer_cache_bytes,
+    chat_answer_cache_evictions_total,
+    chat_answer_cache_saved_tokens_total,
+    register_cache,
+)
+from app.schemas.chat import ChatSource
+
+# Bookkeeping per entry beyond its vector and texts (objects, dict slots)
+ENTRY_OVERHEAD_BYTES = 512
+
+@dataclass
+class CachedAnswer:
+    """A generated answer and everything needed to replay it."""
+    question: str
+    answer: str
+    sources: List[ChatSource]
+    completion_tokens: int
+    prompt_tokens: int  # Estimated from the prompt length
+    size: int = 0
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+class _MentorAnswers:
+    """
+    Cached answers of one mentor.
+
+    Question vectors are rows of one matrix, so a lookup is a single
+    matrix-vector product. Removed rows are filled with the last row.
+    """
+
+    def __init__(self, version: Hashable, dimensions: int):
+        self.version = version
+        self.vectors = np.empty((8, dimensions), dtype=np.float32)
+        self.entry_ids: List[int] = []
+
+    def best(self, query: np.ndarray) -> Tuple[Optional[int], float]:
+        """Entry ID of the most similar question and its cosine similarity."""
+        if not self.entry_ids:
+            return None, 0.0
+        scores = self.vectors[:len(self.entry_ids)] @ query
+        row = int(np.argmax(scores))
+        return self.entry_ids[row], float(scores[row])
+
+    def add(self, entry_id: int, vector: np.ndarray) -> None:
+        rows = len(self.entry_ids)
+        if rows == len(self.vectors):
+            self.vectors = np.concatenate([self.vectors, np.empty_like(self.vectors)])
+        self.vectors[rows] = vector
+        self.entry_ids.append(entry_id)
+
+    def remove(self, entry_id: int) -> None:
+        row = self.entry_ids.index(entry_id)
+        last = len(self.entry_ids) - 1
+        self.vectors[row] = self.vectors[last]
+        self.entry_ids[row] = self.entry_ids[last]
+        self.entry_ids.pop()
+
+class SemanticAnswerCache:
+    """
+    Per-mentor cache of chat answers, looked up by question similarity.
+
+    A question whose embedding is within ``threshold`` cosine similarity
+    of a cached question gets the cached answer, without calling the LLM.
+    Entries are only valid for the ``version`` of the mentor they were
+    generated from (its indexed material and profile): when a resource is
+    added, re-processed or removed, or the mentor is edited, the mentor's
+    answers are dropped on the next lookup.
+
+    Memory is bounded by ``max_bytes`` (vectors, questions, answers and
+    sources); the least recently used answers are evicted first, across
+    every mentor. Kept per process and safe to use from worker threads.
+    """
+
+    def __init__(self, threshold: float, max_bytes: int):
+        self.threshold = threshold
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._mentors: Dict[str, _MentorAnswers] = {}
+        # Entry ID -> (mentor ID, answer), least recently used first
+        self._entries: "OrderedDict[int, Tuple[str, CachedAnswer]]" = OrderedDict()
+        self._ids = itertools.count()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_completion_tokens = 0
+        self.saved_prompt_tokens = 0
+
+    @staticmethod
+    def _unit(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _mentor(self, mentor_id: str, version: Hashable) -> Optional[_MentorAnswers]:
+        """The mentor's answers, dropped first if the mentor changed since."""
+        answers = self._mentors.get(mentor_id)
+        if answers is not None and answers.version != version:
+            for entry_id in answers.entry_ids:
+                self._drop(entry_id, "stale")
+            del self._mentors[mentor_id]
+            answers = None
+        return answers
+
+    def _drop(self, entry_id: int, reason: str) -> None:
+        _, entry = self._entries.pop(entry_id)
+        self.bytes -= entry.size
+        chat_answer_cache_evictions_total.inc(reason=reason)
+
+    def lookup(self, mentor_id: str, version: Hashable, query: np.ndarray) -> Optional[CachedAnswer]:
+        """
+        Find the cached answer to a question similar enough to ``query``.
+
+        Args:
+            mentor_id: ID of the mentor being asked
+            version: Current version of the mentor's material and profile
+            query: Embedding of the question
+
+        Returns:
+            Optional[CachedAnswer]: The answer, or None on a miss
+        """
+        query = self._unit(query)
+        with self._lock:
+            answers = self._mentor(mentor_id, version)
+            entry_id, score = answers.best(query) if answers is not None else (None, 0.0)
+            if entry_id is None or score < self.threshold:
+                self.misses += 1
+                chat_answer_cache_bytes.set(self.bytes)
+                return None
+
+            self._entries.move_to_end(entry_id)
+            answer = self._entries[entry_id][1]
+            self.hits += 1
+            self.saved_completion_tokens += answer.completion_tokens
+            self.saved_prompt_tokens += answer.prompt_tokens
+
+        chat_answer_cache_saved_tokens_total.inc(answer.completion_tokens, kind="completion")
+        chat_answer_cache_saved_tokens_total.inc(answer.prompt_tokens, kind="prompt")
+        return answer
+
+    def store(self, mentor_id: str, version: Hashable, query: np.ndarray, answer: CachedAnswer) -> bool:
+        """
+        Cache a freshly generated answer.
+
+        Skipped if a similar question is already cached (e.g. two students
+        asked at the same time) or the answer alone exceeds the budget.
+
+        Returns:
+            bool: True if the answer was stored
+        """
+        query = self._unit(query)
+        answer.size = (
+            query.nbytes
+            + len(answer.question.encode())
+            + len(answer.answer.encode())
+            + sum(len(source.text.encode()) + 64 for source in answer.sources)
+            + ENTRY_OVERHEAD_BYTES
+        )
+        if answer.size > self.max_bytes:
+            return False
+
+        with self._lock:
+            answers = self._mentor(mentor_id, version)
+            if answers is None:
+                answers = self._mentors[mentor_id] = _MentorAnswers(version, len(query))
+            elif answers.best(query)[1] >= self.threshold:
+                return False
+
+            entry_id = next(self._ids)
+            answers.add(entry_id, query)
+            self._entries[entry_id] = (mentor_id, answer)
+            self.bytes += answer.size
+
+            while self.bytes > self.max_bytes:
+                oldest_id, (oldest_mentor, _) = next(iter(self._entries.items()))
+                oldest = self._mentors[oldest_mentor]
+                oldest.remove(oldest_id)
+                if not oldest.entry_ids:
+                    del self._mentors[oldest_mentor]
+                self._drop(oldest_id, "memory")
+
+            chat_answer_cache_bytes.set(self.bytes)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate, tokens saved and memory use for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_completion_tokens": self.saved_completion_tokens,
+                "saved_prompt_tokens": self.saved_prompt_tokens,
+                "entries": len(self._entries),
+                "mentors": len(self._mentors),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+# Per-process singleton
+_answer_cache: Optional[SemanticAnswerCache] = None
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """Get or create the semantic answer cache (None when disabled)."""
+    global _answer_cache
+
+    if _answer_cache is None and settings.chat_answer_cache_max_bytes > 0:
+        _answer_cache = SemanticAnswerCache(
+            settings.chat_answer_cache_threshold,
+            settings.chat_answer_cache_max_bytes
+        )
+
+    return _answer_cache
+
+# Loaded with the chat pipeline, so exported from the first chat request on
+register_cache("chat_answer", lambda: get_answer_cache().stats() if get_answer_cache() else {})
@@ -0,0 +1,386 @@
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+def user_mentors_scope(user_id: str) -> str:
+    """Invalidation scope of a user's mentor listing."""
+    return f"user:{user_id}:mentors"
+
+def user_profile_scope(user_id: str) -> str:
+    """Invalidation scope of a user's profile."""
+    return f"user:{user_id}:profile"
+
+def user_flashcards_scope(user_id: str) -> str:
+    """Invalidation scope of a user's flashcards (their due queues)."""
+    return f"user:{user_id}:flashcards"
+
+def mentor_scope(mentor_id: str) -> str:
+    """Invalidation scope of a mentor's detail."""
+    return f"mentor:{mentor_id}"
+
+def mentor_resources_scope(mentor_id: str) -> str:
+    """Invalidation scope of a mentor's resource listing."""
+    return f"mentor:{mentor_id}:resources"
+
+def mentor_quiz_scope(mentor_id: str) -> str:
+    """Invalidation scope of a mentor's quiz question pool."""
+    return f"mentor:{mentor_id}:quiz"
+
+class CacheBackend(ABC):
+    """
+    Storage for cached responses and scope generations.
+
+    Every scope (e.g. "the resources of mentor X") has a generation token.
+    Cache keys embed the generations of their scopes, so invalidating a
+    scope is a single write that makes all of its entries unreachable; they
+    are then dropped by TTL or eviction.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a cached value, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        """Store a value for ``ttl`` seconds."""
+
+    @abstractmethod
+    async def generations(self, scopes: Sequence[str]) -> List[str]:
+        """Current generation of each scope, creating missing ones."""
+
+    @abstractmethod
+    async def invalidate(self, scopes: Sequence[str]) -> None:
+        """Move each scope to a new generation."""
+
+    @abstractmethod
+    def invalidate_sync(self, scopes: Sequence[str]) -> None:
+        """Blocking ``invalidate``, for background workers."""
+
+def _new_generation() -> str:
+    # Random rather than a counter, so a generation that is evicted and
+    # recreated can never match keys written under an older one
+    return uuid.uuid4().hex
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with per-entry expiry.
+
+    Fastest option, but every process has its own copy: an invalidation
+    only reaches the process that made it. Only usable in a single process
+    that also runs the background jobs (see ``get_response_cache``).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._generations: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def generations(self, scopes: Sequence[str]) -> List[str]:
+        with self._lock:
+            result = []
+            for scope in scopes:
+                generation = self._generations.get(scope)
+                if generation is None:
+                    generation = self._generations[scope] = _new_generation()
+                self._generations.move_to_end(scope)
+                result.append(generation)
+
+            while len(self._generations) > self.max_entries:
+                self._generations.popitem(last=False)
+            return result
+
+    async def invalidate(self, scopes: Sequence[str]) -> None:
+        self.invalidate_sync(scopes)
+
+    def invalidate_sync(self, scopes: Sequence[str]) -> None:
+        with self._lock:
+            for scope in scopes:
+                self._generations.pop(scope, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache on a Redis-compatible server.
+
+    All API workers (and the background workers) see the same entries and
+    generations. Entries expire by TTL; size is bounded by the server's
+    ``maxmemory`` / ``maxmemory-policy`` (e.g. ``allkeys-lru``).
+    """
+
+    def __init__(self, url: str, generation_ttl: int, prefix: str = "mentoria:cache:"):
+        # Imported here so the in-process backend has no Redis dependency
+        import redis
+        import redis.asyncio
+
+        self.generation_ttl = generation_ttl
+        self.prefix = prefix
+        self._client = redis.asyncio.Redis.from_url(url)
+        self._sync_client = redis.Redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._client.set(self.prefix + key, value, ex=ttl)
+
+    async def generations(self, scopes: Sequence[str]) -> List[str]:
+        # Create missing generations and read them back in one round trip.
+        # Generations expire so scopes of deleted users and mentors do not
+        # pile up; an expired one is recreated, which only costs a miss.
+        pipe = self._client.pipeline(transaction=False)
+        for scope in scopes:
+            pipe.set(f"{self.prefix}gen:{scope}", _new_generation(), nx=True, ex=self.generation_ttl)
+        for scope in scopes:
+            pipe.get(f"{self.prefix}gen:{scope}")
+        results = await pipe.execute()
+        return [generation.decode() for generation in results[len(scopes):]]
+
+    async def invalidate(self, scopes: Sequence[str]) -> None:
+        if scopes:
+            await self._client.delete(*(f"{self.prefix}gen:{scope}" for scope in scopes))
+
+    def invalidate_sync(self, scopes: Sequence[str]) -> None:
+        if scopes:
+            self._sync_client.delete(*(f"{self.prefix}gen:{scope}" for scope in scopes))
+
+class TieredCacheBackend(CacheBackend):
+    """
+    Per-process LRU tier in front of a shared backend.
+
+    Entries are read from the local tier first and copied into it on a
+    shared hit, so warm reads of a response body never leave the process.
+    Generations always come from the shared backend: cache keys embed them,
+    so an invalidation made by any process (an API worker or a background
+    job) makes the local copies unreachable just as it does the shared ones.
+    Local copies are kept for at most ``local_ttl`` seconds.
+    """
+
+    def __init__(self, shared: CacheBackend, local: MemoryCacheBackend, local_ttl: int):
+        self.shared = shared
+        self.local = local
+        self.local_ttl = local_ttl
+        self.local_hits = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.local.get(key)
+        if value is not None:
+            self.local_hits += 1
+            return value
+
+        value = await self.shared.get(key)
+        if value is not None:
+            await self.local.set(key, value, self.local_ttl)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.shared.set(key, value, ttl)
+        await self.local.set(key, value, min(ttl, self.local_ttl))
+
+    async def generations(self, scopes: Sequence[str]) -> List[str]:
+        return await self.shared.generations(scopes)
+
+    async def invalidate(self, scopes: Sequence[str]) -> None:
+        await self.shared.invalidate(scopes)
+
+    def invalidate_sync(self, scopes: Sequence[str]) -> None:
+        self.shared.invalidate_sync(scopes)
+
+class ResponseCache:
+    """
+    Read-through cache for per-user API responses.
+
+    Responses are stored as JSON and keyed by the caller-supplied key plus
+    the generations of the scopes they depend on. Generations are read
+    before loading, so a response loaded concurrently with a write is
+    stored under the old generation and never served after the write's
+    invalidation. Cache failures are logged and fall back to loading.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: int, backend_name: str = "none"):
+        self.backend = backend
+        self.backend_name = backend_name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(
+        self,
+        scopes: Sequence[str],
+        key: str,
+        model: Type[ModelT],
+        load: Callable[[], Awaitable[Optional[ModelT]]],
+        ttl: Optional[int] = None
+    ) -> Optional[ModelT]:
+        """
+        Return the cached response for ``key``, or load and cache it.
+
+        Args:
+            scopes: Invalidation scopes the response depends on
+            key: Cache key (must identify the user and all request parameters)
+            model: Response model, used to decode cached JSON
+            load: Coroutine function producing the response on a miss;
+                None results are not cached
+            ttl: Seconds to keep the response (defaults to the cache's TTL)
+
+        Returns:
+            Optional[ModelT]: The response
+        """
+        if self.backend is None:
+            return await load()
+
+        full_key = None
+        try:
+            generations = await self.backend.generations(scopes)
+            full_key = f"resp:{key}:{':'.join(generations)}"
+            cached = await self.backend.get(full_key)
+            if cached is not None:
+                self.hits += 1
+                return model.model_validate_json(cached)
+        except Exception as e:
+            logger.warning(f"Response cache read failed for {key}: {str(e)}")
+
+        self.misses += 1
+        result = await load()
+
+        if result is not None and full_key is not None:
+            try:
+                await self.backend.set(full_key, result.model_dump_json().encode(), ttl or self.ttl)
+            except Exception as e:
+                logger.warning(f"Response cache write failed for {key}: {str(e)}")
+
+        return result
+
+    async def generation(self, scope: str) -> Optional[str]:
+        """
+        Current generation of a scope, for state kept outside the cache.
+
+        Callers holding their own derived state (e.g. in-memory queues)
+        compare it with the generation they loaded under to tell whether
+        the scope was invalidated since. None if there is no backend or it
+        cannot be reached.
+        """
+        if self.backend is None:
+            return None
+        try:
+            return (await self.backend.generations([scope]))[0]
+        except Exception as e:
+            logger.warning(f"Response cache generation read failed for {scope}: {str(e)}")
+            return None
+
+    async def invalidate(self, *scopes: str) -> None:
+        """Drop every cached response depending on any of the scopes."""
+        if self.backend is None:
+            return
+        try:
+            await self.backend.invalidate(scopes)
+        except Exception as e:
+            logger.warning(f"Response cache invalidation failed for {scopes}: {str(e)}")
+
+    def invalidate_sync(self, *scopes: str) -> None:
+        """Blocking ``invalidate``, for background workers."""
+        if self.backend is None:
+            return
+        try:
+            self.backend.invalidate_sync(scopes)
+        except Exception as e:
+            logger.warning(f"Response cache invalidation failed for {scopes}: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        stats = {
+            "backend": self.backend_name,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+        if isinstance(self.backend, TieredCacheBackend):
+            stats["local_hits"] = self.backend.local_hits
+            stats["local_entries"] = len(self.backend.local)
+        return stats
+
+# Per-process singleton
+_response_cache: Optional[ResponseCache] = None
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get or create the configured response cache.
+
+    Defaults to Redis when ``REDIS_URL`` is set, with a per-process tier
+    in front of it (``response_cache_local_max_entries``, 0 disables it)
+    whose entries are checked against the shared generations. The
+    in-process backend alone never sees invalidations made by other
+    processes (API workers, background workers), so it would serve stale
+    responses until they expire; it is only used while background jobs
+    run eagerly, which the preforked production server refuses. Otherwise
+    caching is disabled.
+
+    Raises:
+        ValueError: If the backend is unknown or Redis is selected without REDIS_URL
+    """
+    global _response_cache
+
+    if _response_cache is None:
+        backend_name = settings.response_cache_backend or ("redis" if settings.redis_url else "memory")
+
+        if backend_name == "memory" and not settings.worker_eager:
+            logger.warning(
+                "The memory response cache cannot see invalidations from other processes; "
+                "response caching is disabled. Set RESPONSE_CACHE_BACKEND=redis to enable it."
+            )
+            backend_name = "none"
+
+        if backend_name == "none":
+            backend = None
+        elif backend_name == "memory":
+            backend = MemoryCacheBackend(settings.response_cache_max_entries)
+        elif backend_name == "redis":
+            if not settings.redis_url:
+                raise ValueError("Redis response cache requires REDIS_URL to be set.")
+            backend = RedisCacheBackend(settings.redis_url, settings.response_cache_generation_ttl_seconds)
+            if settings.response_cache_local_max_entries > 0:
+                backend = TieredCacheBackend(
+                    backend,
+                    MemoryCacheBackend(settings.response_cache_local_max_entries),
+                    settings.response_cache_local_ttl_seconds
+                )
+        else:
+            raise ValueError(f"Unknown response cache backend: {backend_name}")
+
+        _response_cache = ResponseCache(backend, settings.response_cache_ttl_seconds, backend_name)
+
+    return _response_cache
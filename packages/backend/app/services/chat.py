@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import chat_time_to_first_token_seconds, chat_tokens_per_second
+from app.crud.crud_chat import add_chat_exchange, get_chat_history
+from app.crud.crud_mentor import get_mentor_by_id
+from app.schemas.chat import ChatMessage, ChatSource, ChatStats
+from app.schemas.mentor import Mentor
+from app.services.answer_cache import CachedAnswer, estimate_tokens, get_answer_cache
+from app.services.embeddings import embed_chunks, get_embedding_cache, get_embedding_provider
+from app.services.llm import LLMClient
+from app.services.retrieval import hybrid_search
+from app.services.vector_index import get_vector_index
+
+# Imported for type hints only; the SDK loads when the first client is created
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = (
+    "Eres {name}, un mentor experto en {expertise}. {description}\n"
+    "Responde siempre en español, de forma clara y didáctica. Basa tus respuestas en el "
+    "material de estudio del alumno que aparece a continuación y cita la fuente cuando lo uses. "
+    "Si el material no contiene la respuesta, dilo.\n\n"
+    "Material de estudio:\n{context}"
+)
+
+@dataclass
+class ChatContext:
+    """Everything needed to answer a question, loaded before streaming starts."""
+    mentor: Mentor
+    history: List[ChatMessage]
+    sources: List[ChatSource]
+    # Question embedding and mentor version, for the semantic answer cache
+    # (only set for the opening question of a conversation)
+    query: Optional[np.ndarray] = None
+    version: Optional[Hashable] = None
+    cached: Optional[CachedAnswer] = None
+
+class StreamStats:
+    """Tracks time-to-first-token and throughput of one streamed answer."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.first_token_at: Optional[float] = None
+        self.tokens = 0
+
+    def record_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.tokens += 1
+
+    def finish(self) -> ChatStats:
+        finished = time.perf_counter()
+        generation_time = finished - (self.first_token_at or finished)
+        return ChatStats(
+            time_to_first_token_ms=(
+                (self.first_token_at - self.started) * 1000 if self.first_token_at is not None else None
+            ),
+            total_time_ms=(finished - self.started) * 1000,
+            tokens=self.tokens,
+            tokens_per_second=self.tokens / generation_time if generation_time > 0 else float(self.tokens),
+        )
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def retrieve_sources(
+    mentor_id: str,
+    question: str,
+    k: int
+) -> Tuple[Optional[np.ndarray], Tuple[int, int], List[ChatSource]]:
+    """
+    Find the resource chunks most relevant to a question.
+
+    Uses hybrid (vector + BM25 keyword) search unless ``retrieval_hybrid``
+    is off. Embedding and index search are blocking, so they run in a thread.
+
+    Returns:
+        Tuple: The question embedding (None if the mentor has no material),
+        the index ``content_version`` searched, and the sources
+    """
+    def search() -> Tuple[Optional[np.ndarray], Tuple[int, int], List[ChatSource]]:
+        index = get_vector_index(mentor_id)
+        content_version = index.content_version
+        if content_version[1] == 0:
+            return None, content_version, []
+
+        query = embed_chunks([question], get_embedding_provider(), get_embedding_cache()).vectors[0]
+        hits = hybrid_search(index, query, question, k) if settings.retrieval_hybrid else index.search(query, k)
+        return query, content_version, [
+            ChatSource(resource_id=hit.resource_id, position=hit.position, score=hit.score, text=hit.text)
+            for hit in hits
+        ]
+
+    return await asyncio.to_thread(search)
+
+async def load_chat_context(
+    client: AsyncClient,
+    mentor_id: str,
+    user_id: str,
+    question: str
+) -> Optional[ChatContext]:
+    """
+    Load the mentor, the conversation history and the sources concurrently.
+
+    The history load starts with the mentor's and runs alongside
+    retrieval, but sources are only retrieved once the mentor is known to
+    belong to the user, so a foreign mentor ID never gets its question
+    embedded (and cached) or an index created.
+
+    Then looks the question up in the semantic answer cache. A cached
+    answer is only reused while the mentor's indexed material and profile
+    are unchanged; it replaces the retrieved sources with the ones it
+    cites. Only the opening question of a conversation is looked up (and
+    later stored): a follow-up such as "dame un ejemplo" depends on the
+    exchanges before it, which the cache does not match on.
+
+    Args:
+        client: Async Supabase client instance
+        mentor_id: ID of the mentor being asked
+        user_id: ID of the user (for ownership verification)
+        question: The user's question
+
+    Returns:
+        Optional[ChatContext]: The context, or None if the mentor is not found
+        or not owned by the user
+    """
+    history_task = asyncio.ensure_future(
+        get_chat_history(client, mentor_id, user_id, settings.chat_history_limit)
+    )
+    try:
+        mentor = await get_mentor_by_id(client, mentor_id, user_id)
+    except BaseException:
+        history_task.cancel()
+        raise
+
+    if mentor is None:
+        history_task.cancel()
+        return None
+
+    # The history load (started with the mentor's) overlaps retrieval
+    history, (query, content_version, sources) = await asyncio.gather(
+        history_task,
+        retrieve_sources(mentor_id, question, settings.chat_retrieval_k),
+    )
+
+    context = ChatContext(mentor=mentor, history=history, sources=sources)
+
+    answer_cache = get_answer_cache()
+    if answer_cache is not None and query is not None and not history:
+        context.query = query
+        context.version = (content_version, mentor.updated_at)
+        context.cached = await asyncio.to_thread(answer_cache.lookup, mentor.id, context.version, query)
+        if context.cached is not None:
+            context.sources = context.cached.sources
+
+    return context
+
+def build_messages(context: ChatContext, question: str) -> List[Dict[str, str]]:
+    """Build the LLM conversation: system prompt with sources, history, then the question."""
+    sources_text = "\n\n".join(
+        f"[{i + 1}] {source.text}" for i, source in enumerate(context.sources)
+    ) or "(sin material)"
+
+    system_prompt = SYSTEM_PROMPT.format(
+        name=context.mentor.name,
+        expertise=context.mentor.expertise,
+        description=context.mentor.description or "",
+        context=sources_text,
+    )
+
+    return [
+        {"role": "system", "content": system_prompt},
+        *({"role": message.role.value, "content": message.content} for message in context.history),
+        {"role": "user", "content": question},
+    ]
+
+async def stream_chat_events(
+    client: AsyncClient,
+    llm: LLMClient,
+    context: ChatContext,
+    question: str,
+    user_id: str,
+    asked_at: datetime,
+    started: float
+) -> AsyncIterator[str]:
+    """
+    Stream an answer as Server-Sent Events.
+
+    Emits a ``sources`` event, one ``token`` event per model token and a
+    final ``done`` event carrying the request's latency statistics (or an
+    ``error`` event). A cached answer is sent as a single ``token`` event
+    and flagged ``cached`` in ``done``. The exchange is saved (and a new
+    answer cached) after ``done`` is sent, so it never delays the answer.
+
+    Args:
+        client: Async Supabase client instance
+        llm: Chat model to stream from
+        context: Context loaded by ``load_chat_context``
+        question: The user's question
+        user_id: ID of the user
+        asked_at: When the question was received
+        started: ``time.perf_counter()`` at request start, for time-to-first-token
+    """
+    yield format_sse("sources", {"sources": [source.model_dump() for source in context.sources]})
+
+    stats = StreamStats(started)
+    answer_parts: List[str] = []
+
+    if context.cached is not None:
+        stats.record_token()
+        answer_parts.append(context.cached.answer)
+        yield format_sse("token", {"content": context.cached.answer})
+    else:
+        messages = build_messages(context, question)
+        try:
+            async for token in llm.stream(messages):
+                stats.record_token()
+                answer_parts.append(token)
+                yield format_sse("token", {"content": token})
+        except Exception as e:
+            logger.error(f"Chat generation failed for mentor {context.mentor.id}: {str(e)}")
+            yield format_sse("error", {"detail": f"Failed to generate answer: {str(e)}"})
+            return
+
+    chat_stats = stats.finish()
+    if context.cached is not None:
+        chat_stats.cached = True
+    elif chat_stats.time_to_first_token_ms is not None:
+        chat_time_to_first_token_seconds.observe(chat_stats.time_to_first_token_ms / 1000)
+        chat_tokens_per_second.observe(chat_stats.tokens_per_second)
+    logger.info(
+        f"Chat answer for mentor {context.mentor.id}: ttft={chat_stats.time_to_first_token_ms}ms "
+        f"tokens={chat_stats.tokens} tokens/sec={chat_stats.tokens_per_second:.1f} cached={chat_stats.cached}"
+    )
+    yield format_sse("done", chat_stats.model_dump())
+
+    answer = "".join(answer_parts)
+    answer_cache = get_answer_cache()
+    if context.cached is None and context.query is not None and answer_cache is not None and answer.strip():
+        cached = CachedAnswer(
+            question=question,
+            answer=answer,
+            sources=context.sources,
+            completion_tokens=stats.tokens,
+            prompt_tokens=sum(estimate_tokens(message["content"]) for message in messages),
+        )
+        await asyncio.to_thread(answer_cache.store, context.mentor.id, context.version, context.query, cached)
+
+    try:
+        await add_chat_exchange(client, context.mentor.id, user_id, question, answer, asked_at)
+    except Exception as e:
+        logger.warning(f"Could not save chat exchange for mentor {context.mentor.id}: {str(e)}")
@@ -0,0 +1,46 @@
+from typing import List, Optional
+
+from app.core.config import settings
+
+def chunk_text(text: str, chunk_size: Optional[int] = None, overlap: Optional[int] = None) -> List[str]:
+    """
+    Split text into overlapping chunks for embedding and retrieval.
+
+    Chunks end on whitespace where possible so words are not cut in half.
+
+    Args:
+        text: Text to split
+        chunk_size: Target chunk length in characters (defaults to settings)
+        overlap: Characters shared by consecutive chunks (defaults to settings)
+
+    Returns:
+        List[str]: Non-empty chunks in document order
+    """
+    chunk_size = chunk_size or settings.chunk_size
+    overlap = settings.chunk_overlap if overlap is None else overlap
+
+    if overlap >= chunk_size:
+        raise ValueError("Chunk overlap must be smaller than chunk size")
+
+    text = text.strip()
+    chunks = []
+    start = 0
+
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+
+        # Back off to the last whitespace so the chunk ends on a word boundary
+        if end < len(text):
+            boundary = text.rfind(" ", start + overlap + 1, end)
+            if boundary != -1:
+                end = boundary
+
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+
+        if end >= len(text):
+            break
+        start = end - overlap
+
+    return chunks
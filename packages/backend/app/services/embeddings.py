@@ -0,0 +1,250 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+import httpx
+import numpy as np
+
+from app.core.config import settings
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+OPENAI_EMBEDDINGS_URL = "https://api.openai.com/v1/embeddings"
+
+class EmbeddingProvider(ABC):
+    """Interface for services that turn text into embedding vectors."""
+
+    model: str
+    dimensions: int
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts in a single provider request.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: float32 matrix of shape (len(texts), dimensions)
+        """
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """Embedding provider backed by the OpenAI embeddings API."""
+
+    def __init__(self, api_key: str, model: str, dimensions: int):
+        self.model = model
+        self.dimensions = dimensions
+        self._client = httpx.Client(
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=60.0,
+        )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        response = self._client.post(
+            OPENAI_EMBEDDINGS_URL,
+            json={"model": self.model, "input": texts, "dimensions": self.dimensions},
+        )
+        response.raise_for_status()
+
+        # The API may return items out of order; sort them by input index
+        items = sorted(response.json()["data"], key=lambda item: item["index"])
+        return np.asarray([item["embedding"] for item in items], dtype=np.float32)
+
+class FakeEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic local embedding provider for tests and offline development.
+
+    Each text maps to a fixed unit vector seeded by its SHA-256, so equal
+    texts always get equal embeddings. ``calls`` counts provider requests.
+    """
+
+    def __init__(self, dimensions: int = 1536, model: str = "fake-embedding"):
+        self.model = model
+        self.dimensions = dimensions
+        self.calls = 0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        self.calls += 1
+        vectors = np.empty((len(texts), self.dimensions), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dimensions)
+            vectors[i] = vector / np.linalg.norm(vector)
+        return vectors
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache keyed by content hash.
+
+    Backed by SQLite so it survives restarts and is shared by every worker
+    process on the host. Keys include the model and dimensions, so changing
+    either never returns stale vectors.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Look up cached vectors; missing keys are absent from the result."""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store vectors, replacing any existing entry with the same key."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()],
+            )
+            self._conn.commit()
+
+@dataclass
+class EmbeddingResult:
+    """Output of the embedding stage for one batch of chunks."""
+    vectors: np.ndarray
+    cache_hits: int
+    embedded: int
+    provider_calls: int
+    elapsed_seconds: float
+
+    @property
+    def chunks_per_second(self) -> float:
+        """Stage throughput, counting cached and freshly embedded chunks."""
+        total = len(self.vectors)
+        return total / self.elapsed_seconds if self.elapsed_seconds > 0 else float(total)
+
+def content_hash(text: str, provider: EmbeddingProvider) -> str:
+    """Cache key for a chunk: hash of the model, dimensions and chunk text."""
+    return hashlib.sha256(f"{provider.model}:{provider.dimensions}\0{text}".encode()).hexdigest()
+
+def _batches(items: List[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def embed_chunks(
+    chunks: List[str],
+    provider: EmbeddingProvider,
+    cache: EmbeddingCache,
+    batch_size: Optional[int] = None,
+) -> EmbeddingResult:
+    """
+    Embed chunks, serving repeats from the cache.
+
+    Only chunks whose content hash is not cached are sent to the provider,
+    deduplicated and grouped into large batches. Re-uploading the same
+    material, even under another mentor, costs no provider calls.
+
+    Args:
+        chunks: Chunk texts in document order
+        provider: Embedding provider to call on cache misses
+        cache: Persistent embedding cache
+        batch_size: Texts per provider request (defaults to settings)
+
+    Returns:
+        EmbeddingResult: One vector per chunk (in order) plus stage statistics
+    """
+    started = time.perf_counter()
+    batch_size = batch_size or settings.embedding_batch_size
+
+    keys = [content_hash(chunk, provider) for chunk in chunks]
+    vectors = cache.get_many(list(set(keys)))
+    cache_hits = sum(1 for key in keys if key in vectors)
+
+    # Unique chunks that still need embedding
+    missing: Dict[str, str] = {}
+    for key, chunk in zip(keys, chunks):
+        if key not in vectors:
+            missing.setdefault(key, chunk)
+
+    provider_calls = 0
+    missing_keys = list(missing)
+    for batch_keys in _batches(missing_keys, batch_size):
+        embedded = provider.embed([missing[key] for key in batch_keys])
+        provider_calls += 1
+        new_vectors = dict(zip(batch_keys, embedded))
+        cache.put_many(new_vectors)
+        vectors.update(new_vectors)
+
+    matrix = (
+        np.vstack([vectors[key] for key in keys]).astype(np.float32, copy=False)
+        if keys else np.empty((0, provider.dimensions), dtype=np.float32)
+    )
+
+    result = EmbeddingResult(
+        vectors=matrix,
+        cache_hits=cache_hits,
+        embedded=len(missing_keys),
+        provider_calls=provider_calls,
+        elapsed_seconds=time.perf_counter() - started,
+    )
+    logger.info(
+        f"Embedded {len(chunks)} chunks ({result.cache_hits} cached, {result.embedded} new, "
+        f"{result.provider_calls} provider calls) at {result.chunks_per_second:.1f} chunks/sec"
+    )
+    return result
+
+# Per-process singletons
+_provider: Optional[EmbeddingProvider] = None
+_cache: Optional[EmbeddingCache] = None
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """
+    Get or create the configured embedding provider.
+
+    Raises:
+        ValueError: If the provider is unknown or its configuration is missing
+    """
+    global _provider
+
+    if _provider is None:
+        if settings.embedding_provider == "fake":
+            _provider = FakeEmbeddingProvider(dimensions=settings.embedding_dimensions)
+        elif settings.embedding_provider == "openai":
+            if not settings.openai_api_key:
+                raise ValueError(
+                    "OpenAI configuration missing. Please set OPENAI_API_KEY, or set "
+                    "EMBEDDING_PROVIDER=fake for local development."
+                )
+            _provider = OpenAIEmbeddingProvider(
+                settings.openai_api_key, settings.embedding_model, settings.embedding_dimensions
+            )
+        else:
+            raise ValueError(f"Unknown embedding provider: {settings.embedding_provider}")
+
+    return _provider
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the persistent embedding cache."""
+    global _cache
+
+    if _cache is None:
+        _cache = EmbeddingCache(settings.embedding_cache_path)
+
+    return _cache
@@ -0,0 +1,41 @@
+import io
+from pypdf import PdfReader
+
+from app.schemas.resource import ResourceType
+
+def extract_pdf_text(content: bytes) -> str:
+    """
+    Extract the text layer of a PDF document.
+
+    Args:
+        content: Raw PDF bytes
+
+    Returns:
+        str: Text of every page, separated by blank lines
+    """
+    reader = PdfReader(io.BytesIO(content))
+    pages = [page.extract_text() or "" for page in reader.pages]
+    return "\n\n".join(page.strip() for page in pages if page.strip())
+
+def extract_text(resource_type: ResourceType, content: bytes) -> str:
+    """
+    Extract plain text from a resource's raw content.
+
+    This is CPU-bound and is meant to run inside a worker process, never
+    in the API process.
+
+    Args:
+        resource_type: Type of the resource
+        content: Raw bytes downloaded from storage or the resource URL
+
+    Returns:
+        str: Extracted text (empty for types without text extraction yet)
+    """
+    if resource_type == ResourceType.PDF:
+        return extract_pdf_text(content)
+
+    if resource_type == ResourceType.TEXT:
+        return content.decode("utf-8", errors="replace")
+
+    # Images (OCR) and YouTube transcripts are not supported yet
+    return ""
@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.crud.crud_flashcard import get_due_window, get_flashcards_by_ids, review_flashcards
+from app.schemas.flashcard import DueFlashcards, Flashcard, FlashcardReview, FlashcardReviewResult
+from app.services.cache import get_response_cache, user_flashcards_scope
+from app.services.llm import JSONCompletionClient, get_json_completion_client
+
+# Imported for type hints only; the SDK loads when the first client is created
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+# SM-2 scheduling constants
+MIN_EASE_FACTOR = 1.3
+PASSING_GRADE = 3
+# A forgotten card comes back within the same study session
+RELEARN_INTERVAL_DAYS = 10 / (24 * 60)
+
+FLASHCARD_PROMPT = (
+    "Eres un profesor que prepara tarjetas de estudio (flashcards) a partir del material del alumno.\n"
+    "Escribe {count} tarjetas distintas en español. Cada una tiene en el anverso una pregunta o "
+    "concepto breve y en el reverso la respuesta, concisa y basada en el material.\n"
+    'Responde solo con JSON: {{"cards": [{{"front": "...", "back": "..."}}]}}\n\n'
+    "Material de estudio:\n{text}"
+)
+
+# Spaced repetition
+
+def schedule_review(card: Flashcard, grade: int, reviewed_at: datetime) -> Dict[str, Any]:
+    """
+    New scheduling state of a card after a review (SM-2).
+
+    Passing grades (3-5) grow the interval: 1 day, 6 days, then the
+    previous interval times the ease factor. A failing grade restarts the
+    card, due again in a few minutes. Every review adjusts the ease factor
+    by how easy the answer was, never below 1.3.
+
+    Args:
+        card: The card before the review
+        grade: SM-2 quality of the answer, 0 (blackout) to 5 (perfect)
+        reviewed_at: When the card was answered
+
+    Returns:
+        Dict[str, Any]: ``ease_factor``, ``interval_days``, ``repetitions``,
+        ``due_at`` and ``last_reviewed_at``
+    """
+    if grade < PASSING_GRADE:
+        repetitions = 0
+        interval_days = RELEARN_INTERVAL_DAYS
+    else:
+        repetitions = card.repetitions + 1
+        if repetitions == 1:
+            interval_days = 1.0
+        elif repetitions == 2:
+            interval_days = 6.0
+        else:
+            interval_days = max(card.interval_days, 1.0) * card.ease_factor
+
+    miss = 5 - grade
+    ease_factor = max(MIN_EASE_FACTOR, card.ease_factor + 0.1 - miss * (0.08 + miss * 0.02))
+
+    return {
+        "ease_factor": round(ease_factor, 4),
+        "interval_days": interval_days,
+        "repetitions": repetitions,
+        "due_at": reviewed_at + timedelta(days=interval_days),
+        "last_reviewed_at": reviewed_at,
+    }
+
+# Due queue
+
+class DueQueue:
+    """
+    Min-heap of the next cards due for a user (optionally for one mentor).
+
+    Loaded with the ``window`` earliest due times from the due-time index.
+    Unless the window held every card, cards not loaded are all due at or
+    after ``horizon``, so until then the heap alone answers "what is due
+    now" exactly. Rescheduled cards are pushed again and their old entries
+    skipped lazily.
+
+    Used from the event loop only, so it needs no locking.
+    """
+
+    def __init__(self, rows: List[Tuple[datetime, str]], window: int, generation: Optional[str]):
+        self._due_at: Dict[str, datetime] = {card_id: due_at for due_at, card_id in rows}
+        self._heap: List[Tuple[datetime, str]] = list(rows)
+        heapq.heapify(self._heap)
+        self.horizon: Optional[datetime] = rows[-1][0] if len(rows) >= window else None
+        self.generation = generation
+        self.loaded_at = time.monotonic()
+
+    def usable(self, now: datetime, generation: Optional[str]) -> bool:
+        """Whether the heap still covers every card due at ``now``."""
+        # Without a generation (no shared cache backend) changes made by
+        # other processes cannot be detected, so the queue is never reused
+        return (
+            generation is not None
+            and generation == self.generation
+            and time.monotonic() - self.loaded_at < settings.flashcard_queue_ttl_seconds
+            and (self.horizon is None or now < self.horizon)
+        )
+
+    def _pop_valid(self) -> Optional[Tuple[datetime, str]]:
+        while self._heap:
+            due_at, card_id = heapq.heappop(self._heap)
+            if self._due_at.get(card_id) == due_at:
+                return due_at, card_id
+        return None
+
+    def due(self, now: datetime, limit: int) -> List[str]:
+        """IDs of up to ``limit`` cards due at ``now``, earliest first."""
+        taken: List[Tuple[datetime, str]] = []
+        while len(taken) < limit:
+            entry = self._pop_valid()
+            if entry is None:
+                break
+            taken.append(entry)
+            if entry[0] > now:
+                break
+
+        for entry in taken:
+            heapq.heappush(self._heap, entry)
+        return [card_id for due_at, card_id in taken if due_at <= now]
+
+    def next_due_at(self) -> Optional[datetime]:
+        """Earliest due time in the heap (the horizon if the heap is empty)."""
+        entry = self._pop_valid()
+        if entry is None:
+            return self.horizon
+        heapq.heappush(self._heap, entry)
+        return entry[0]
+
+    def reschedule(self, card_id: str, due_at: datetime) -> None:
+        """Move a card to a new due time (dropping it if that is past the horizon)."""
+        if self.horizon is not None and due_at >= self.horizon:
+            self._due_at.pop(card_id, None)
+            return
+        self._due_at[card_id] = due_at
+        heapq.heappush(self._heap, (due_at, card_id))
+
+    def discard(self, card_id: str) -> None:
+        """Forget a card (e.g. it was deleted)."""
+        self._due_at.pop(card_id, None)
+
+class DueQueues:
+    """Per-process LRU of due queues, keyed by (user ID, mentor ID or None)."""
+
+    def __init__(self, max_queues: int):
+        self.max_queues = max_queues
+        self._queues: "OrderedDict[Tuple[str, Optional[str]], DueQueue]" = OrderedDict()
+
+    def get(self, key: Tuple[str, Optional[str]], now: datetime, generation: Optional[str]) -> Optional[DueQueue]:
+        queue = self._queues.get(key)
+        if queue is None or not queue.usable(now, generation):
+            return None
+        self._queues.move_to_end(key)
+        return queue
+
+    def put(self, key: Tuple[str, Optional[str]], queue: DueQueue) -> None:
+        self._queues[key] = queue
+        self._queues.move_to_end(key)
+        while len(self._queues) > self.max_queues:
+            self._queues.popitem(last=False)
+
+    def reschedule(self, user_id: str, cards: List[Flashcard], generation: Optional[str]) -> None:
+        """Apply this process's own reviews to the user's queues."""
+        for mentor_id in {None, *(card.mentor_id for card in cards)}:
+            queue = self._queues.get((user_id, mentor_id))
+            if queue is None:
+                continue
+            for card in cards:
+                if mentor_id is None or card.mentor_id == mentor_id:
+                    queue.reschedule(card.id, card.due_at)
+            queue.generation = generation
+
+    def __len__(self) -> int:
+        return len(self._queues)
+
+# Per-process queues
+due_queues = DueQueues(settings.flashcard_queue_max_queues)
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+async def get_due_cards(
+    client: AsyncClient,
+    user_id: str,
+    mentor_id: Optional[str],
+    limit: int
+) -> DueFlashcards:
+    """
+    Get the cards a user should review now.
+
+    Served from the user's in-memory due queue, which is (re)loaded from
+    the due-time index when missing, expired, past its horizon or when
+    the user's cards changed in another process (new cards, reviews). Only
+    the due cards themselves are then read, by ID.
+
+    Args:
+        client: Async Supabase client instance
+        user_id: ID of the user
+        mentor_id: Only cards of this mentor (None for all of the user's cards)
+        limit: Maximum number of cards
+
+    Returns:
+        DueFlashcards: Due cards, earliest first, and when the next card is due
+    """
+    now = datetime.now(timezone.utc)
+    generation = await get_response_cache().generation(user_flashcards_scope(user_id))
+
+    key = (user_id, mentor_id)
+    queue = due_queues.get(key, now, generation)
+    if queue is None:
+        window = settings.flashcard_queue_window
+        queue = DueQueue(await get_due_window(client, user_id, mentor_id, window), window, generation)
+        due_queues.put(key, queue)
+
+    card_ids = queue.due(now, limit)
+    found = {card.id: card for card in await get_flashcards_by_ids(client, user_id, card_ids)} if card_ids else {}
+
+    cards: List[Flashcard] = []
+    for card_id in card_ids:
+        card = found.get(card_id)
+        if card is None:
+            queue.discard(card_id)
+        elif _utc(card.due_at) > now:
+            # Reviewed through another process since the queue was loaded
+            queue.reschedule(card_id, _utc(card.due_at))
+        else:
+            cards.append(card)
+
+    return DueFlashcards(cards=cards, next_due_at=queue.next_due_at() if len(cards) < limit else None)
+
+async def submit_reviews(client: AsyncClient, user_id: str, reviews: List[FlashcardReview]) -> FlashcardReviewResult:
+    """
+    Schedule a study session's reviews and store them with a single write.
+
+    Reviews are applied in the order they were answered, so a card
+    reviewed twice in the session is scheduled from its latest state.
+
+    Args:
+        client: Async Supabase client instance
+        user_id: ID of the user
+        reviews: The session's reviews
+
+    Returns:
+        FlashcardReviewResult: Updated cards and the IDs that were not found
+    """
+    now = datetime.now(timezone.utc)
+    card_ids = list(dict.fromkeys(review.card_id for review in reviews))
+    cards = {card.id: card for card in await get_flashcards_by_ids(client, user_id, card_ids)}
+
+    updates: Dict[str, Dict[str, Any]] = {}
+    for review in sorted(reviews, key=lambda review: _utc(review.reviewed_at or now)):
+        card = cards.get(review.card_id)
+        if card is None:
+            continue
+
+        state = schedule_review(card, review.grade, min(_utc(review.reviewed_at or now), now))
+        cards[card.id] = card.model_copy(update=state)
+        updates[card.id] = {
+            "id": card.id,
+            **{key: value.isoformat() if isinstance(value, datetime) else value for key, value in state.items()},
+        }
+
+    updated = await review_flashcards(client, user_id, list(updates.values())) if updates else []
+
+    if updated:
+        # Other processes reload the user's queues; this one updates its own
+        cache = get_response_cache()
+        await cache.invalidate(user_flashcards_scope(user_id))
+        due_queues.reschedule(
+            user_id,
+            [card.model_copy(update={"due_at": _utc(card.due_at)}) for card in updated],
+            await cache.generation(user_flashcards_scope(user_id))
+        )
+
+    return FlashcardReviewResult(
+        updated=updated,
+        not_found=[card_id for card_id in card_ids if card_id not in cards]
+    )
+
+# Generation
+
+@dataclass
+class GeneratedCard:
+    """A card produced by a generator, before it is stored."""
+    front: str
+    back: str
+
+def parse_cards(content: str, count: int) -> List[GeneratedCard]:
+    """
+    Read the cards out of a model's JSON reply, dropping malformed ones.
+
+    Raises:
+        ValueError: If the reply is not the expected JSON object
+    """
+    try:
+        items = json.loads(content)["cards"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid flashcard generation reply: {str(e)}")
+
+    cards: List[GeneratedCard] = []
+    for item in items if isinstance(items, list) else []:
+        try:
+            front, back = str(item["front"]).strip(), str(item["back"]).strip()
+        except (KeyError, TypeError):
+            continue
+        if front and back:
+            cards.append(GeneratedCard(front=front, back=back))
+
+    return cards[:count]
+
+def split_card_count(count: int, resources: int) -> List[int]:
+    """Spread ``count`` cards as evenly as possible over ``resources`` resources."""
+    return [count // resources + (1 if i < count % resources else 0) for i in range(resources)]
+
+class CardGenerator(ABC):
+    """Interface for services that write flashcards about a text."""
+
+    @abstractmethod
+    def generate(self, text: str, count: int) -> List[GeneratedCard]:
+        """
+        Write a batch of flashcards about a text in a single request.
+
+        Args:
+            text: Study material the cards are about
+            count: Number of cards wanted (fewer may be returned)
+
+        Returns:
+            List[GeneratedCard]: The well-formed cards
+        """
+
+class LLMCardGenerator(CardGenerator):
+    """Card generator backed by the configured LLM provider (runs in the background workers)."""
+
+    def __init__(self, client: JSONCompletionClient):
+        self._client = client
+
+    def generate(self, text: str, count: int) -> List[GeneratedCard]:
+        return parse_cards(self._client.complete(FLASHCARD_PROMPT.format(count=count, text=text)), count)
+
+class FakeCardGenerator(CardGenerator):
+    """
+    Deterministic local card generator for tests and offline development.
+
+    Turns sentences of the text into cards: the sentence with one of its
+    longer words blanked out on the front, the word on the back.
+    ``calls`` counts generation requests.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, text: str, count: int) -> List[GeneratedCard]:
+        self.calls += 1
+        rng = random.Random(text)
+        cards: List[GeneratedCard] = []
+        for sentence in (s.strip() for s in re.split(r"(?<=[.!?])\s+", text)):
+            words = re.findall(r"\w{5,}", sentence)
+            if not words:
+                continue
+            answer = rng.choice(words)
+            cards.append(GeneratedCard(
+                front="Completa: " + re.sub(rf"\b{answer}\b", "_____", sentence, count=1),
+                back=answer,
+            ))
+            if len(cards) == count:
+                break
+        return cards
+
+# Per-process singleton
+_card_generator: Optional[CardGenerator] = None
+
+def get_card_generator() -> CardGenerator:
+    """
+    Get or create the card generator of the configured LLM provider.
+
+    Raises:
+        ValueError: If the provider is unknown or its API key is missing
+    """
+    global _card_generator
+
+    if _card_generator is None:
+        if settings.llm_provider == "fake":
+            _card_generator = FakeCardGenerator()
+        else:
+            _card_generator = LLMCardGenerator(get_json_completion_client(settings.flashcard_model))
+
+    return _card_generator
@@ -0,0 +1,205 @@
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set
+
+from app.core.config import settings
+
+# Runs of letters and digits, the tokens of FTS5's unicode61 tokenizer
+_TOKEN = re.compile(r"[^\W_]+")
+
+@dataclass
+class LexicalHit:
+    """A chunk returned by a keyword search."""
+    score: float
+    resource_id: str
+    position: int
+    text: str
+
+@lru_cache(maxsize=65536)
+def _fold(token: str) -> str:
+    """Remove the diacritics of a token."""
+    if token.isascii():
+        return token
+    return "".join(ch for ch in unicodedata.normalize("NFD", token) if not unicodedata.combining(ch))
+
+def query_terms(text: str) -> List[str]:
+    """
+    Distinct terms of a text, normalized like the index tokenizer.
+
+    Lowercased with diacritics removed, so "Revolución" matches "revolucion".
+    """
+    tokens = _TOKEN.findall(unicodedata.normalize("NFC", text).lower())
+    return list(dict.fromkeys(_fold(token) for token in dict.fromkeys(tokens)))
+
+class LexicalIndex:
+    """
+    BM25 keyword index of a mentor's chunks, backed by SQLite FTS5.
+
+    Catches what embeddings blur: formula names, dates, codes and other
+    exact terms. Each resource's chunks occupy a contiguous rowid range
+    recorded in the ``resources`` table, so adding, replacing or removing
+    one resource only touches that resource's rows. The ``terms`` table
+    keeps how many chunks contain each term, so queries can pick their
+    terms without walking the postings of common words.
+
+    The file lives next to the mentor's vector index and is written by
+    the ingestion workers (under the vector index writer lock); every
+    process on the host reads it. Connections are shared between threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(
+                text, resource_id UNINDEXED, position UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            CREATE TABLE IF NOT EXISTS resources (
+                resource_id TEXT PRIMARY KEY,
+                first_row INTEGER NOT NULL,
+                last_row INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT PRIMARY KEY,
+                docs INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    @property
+    def rows(self) -> int:
+        """Number of indexed chunks."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(last_row - first_row + 1), 0) FROM resources"
+            ).fetchone()[0]
+
+    def resource_ids(self) -> Set[str]:
+        """IDs of every resource with chunks in the index."""
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT resource_id FROM resources")}
+
+    @staticmethod
+    def _term_counts(texts: Iterable[str]) -> Counter:
+        """Number of texts containing each term."""
+        counts: Counter = Counter()
+        for text in texts:
+            tokens = set(_TOKEN.findall(unicodedata.normalize("NFC", text).lower()))
+            counts.update({_fold(token) for token in tokens})
+        return counts
+
+    def _delete(self, resource_ids: Iterable[str]) -> int:
+        removed = 0
+        for resource_id in resource_ids:
+            found = self._conn.execute(
+                "SELECT first_row, last_row FROM resources WHERE resource_id = ?", (resource_id,)
+            ).fetchone()
+            if found is None:
+                continue
+
+            counts = self._term_counts(
+                row[0] for row in self._conn.execute("SELECT text FROM chunks WHERE rowid BETWEEN ? AND ?", found)
+            )
+            self._conn.executemany("UPDATE terms SET docs = docs - ? WHERE term = ?", [
+                (docs, term) for term, docs in counts.items()
+            ])
+            self._conn.executemany("DELETE FROM terms WHERE term = ? AND docs <= 0", [(term,) for term in counts])
+            self._conn.execute("DELETE FROM chunks WHERE rowid BETWEEN ? AND ?", found)
+            self._conn.execute("DELETE FROM resources WHERE resource_id = ?", (resource_id,))
+            removed += found[1] - found[0] + 1
+        return removed
+
+    def add(self, resource_id: str, texts: List[str]) -> None:
+        """Add (or replace) the chunks of a resource in one transaction."""
+        with self._lock, self._conn:
+            self._delete([resource_id])
+            if not texts:
+                return
+
+            first_row = self._conn.execute("SELECT COALESCE(MAX(last_row), 0) + 1 FROM resources").fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO chunks (rowid, text, resource_id, position) VALUES (?, ?, ?, ?)",
+                [(first_row + i, text, resource_id, i) for i, text in enumerate(texts)]
+            )
+            self._conn.execute(
+                "INSERT INTO resources (resource_id, first_row, last_row) VALUES (?, ?, ?)",
+                (resource_id, first_row, first_row + len(texts) - 1)
+            )
+            self._conn.executemany(
+                "INSERT INTO terms (term, docs) VALUES (?, ?) "
+                "ON CONFLICT (term) DO UPDATE SET docs = docs + excluded.docs",
+                self._term_counts(texts).items()
+            )
+
+    def remove_resources(self, resource_ids: Iterable[str]) -> int:
+        """
+        Remove every chunk of several resources in one transaction.
+
+        Returns:
+            int: Number of rows removed
+        """
+        with self._lock, self._conn:
+            return self._delete(resource_ids)
+
+    def search(self, question: str, k: int = 5) -> List[LexicalHit]:
+        """
+        Find the chunks that best match the terms of a question (BM25).
+
+        Terms are taken rarest first while the chunks they match stay
+        within ``lexical_max_postings``, so the cost is bounded however
+        large the index. Only very common terms are left out on large
+        indexes, and those carry almost no BM25 weight anyway.
+
+        Args:
+            question: Free-text query
+            k: Number of results
+
+        Returns:
+            List[LexicalHit]: Up to k hits, best match first
+        """
+        terms = query_terms(question)
+        if not terms or k <= 0:
+            return []
+
+        with self._lock:
+            placeholders = ",".join("?" * len(terms))
+            doc_counts: Dict[str, int] = dict(self._conn.execute(
+                f"SELECT term, docs FROM terms WHERE term IN ({placeholders})", terms
+            ).fetchall())
+
+            selected: List[str] = []
+            postings = 0
+            for term in sorted(doc_counts, key=doc_counts.get):
+                postings += doc_counts[term]
+                if postings > settings.lexical_max_postings:
+                    break
+                selected.append(term)
+
+            if not selected:
+                return []
+
+            rows = self._conn.execute(
+                "SELECT bm25(chunks), resource_id, position, text FROM chunks "
+                "WHERE chunks MATCH ? ORDER BY rank LIMIT ?",
+                (" OR ".join(f'"{term}"' for term in selected), k)
+            ).fetchall()
+
+        # bm25() is lower-is-better; report higher-is-better scores
+        return [
+            LexicalHit(score=-score, resource_id=resource_id, position=position, text=text)
+            for score, resource_id, position, text in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,177 @@
+import asyncio
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import httpx
+
+from app.core.config import settings
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+class LLMClient(ABC):
+    """Interface for chat models that stream their answer token by token."""
+
+    model: str
+
+    @abstractmethod
+    def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """
+        Stream the model's reply to a conversation.
+
+        Args:
+            messages: OpenAI-style messages (``role`` and ``content``)
+
+        Yields:
+            str: Pieces of the reply as soon as the model produces them
+        """
+
+class OpenAICompatibleClient(LLMClient):
+    """Streaming client for OpenAI-compatible chat completion APIs (OpenAI, Groq)."""
+
+    def __init__(self, base_url: str, api_key: str, model: str):
+        self.model = model
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            http2=True,
+        )
+
+    async def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        async with self._client.stream(
+            "POST",
+            "/chat/completions",
+            json={"model": self.model, "messages": messages, "stream": True},
+        ) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+
+                choices = json.loads(data).get("choices") or []
+                content = choices[0].get("delta", {}).get("content") if choices else None
+                if content:
+                    yield content
+
+class FakeLLMClient(LLMClient):
+    """
+    Local streaming model for tests and offline development.
+
+    Replies with a fixed answer that echoes the question, streamed one word
+    at a time with an optional delay between tokens.
+    """
+
+    def __init__(self, token_delay: float = 0.0, model: str = "fake-llm"):
+        self.model = model
+        self.token_delay = token_delay
+        self.calls = 0
+
+    async def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        self.calls += 1
+        question = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        answer = f"Respuesta de prueba a: {question}"
+
+        for token in re.findall(r"\S+\s*", answer):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield token
+
+class JSONCompletionClient:
+    """
+    Blocking client for OpenAI-compatible chat completions returned as one JSON object.
+
+    Background workers generating study material (quiz questions,
+    flashcards) need the whole reply at once, not a token stream.
+    """
+
+    def __init__(self, base_url: str, api_key: str, model: str):
+        self.model = model
+        self._client = httpx.Client(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(120.0, connect=10.0),
+        )
+
+    def complete(self, prompt: str) -> str:
+        """
+        Send a single-message conversation and return the JSON reply text.
+
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        response = self._client.post(
+            "/chat/completions",
+            json={
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "response_format": {"type": "json_object"},
+            },
+        )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+def _provider_endpoint(provider: str) -> Tuple[str, str]:
+    """
+    Base URL and API key of an OpenAI-compatible provider.
+
+    Raises:
+        ValueError: If the provider is unknown or its API key is missing
+    """
+    if provider not in ("openai", "groq"):
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
+    api_key = settings.openai_api_key if provider == "openai" else settings.groq_api_key
+    if not api_key:
+        raise ValueError(
+            f"{provider} configuration missing. Please set {provider.upper()}_API_KEY, "
+            "or set LLM_PROVIDER=fake for local development."
+        )
+    return (OPENAI_BASE_URL if provider == "openai" else GROQ_BASE_URL), api_key
+
+# Per-process singletons
+_llm_client: Optional[LLMClient] = None
+_completion_clients: Dict[str, JSONCompletionClient] = {}
+
+def get_llm_client() -> LLMClient:
+    """
+    Get or create the configured LLM client.
+
+    Raises:
+        ValueError: If the provider is unknown or its API key is missing
+    """
+    global _llm_client
+
+    if _llm_client is None:
+        if settings.llm_provider == "fake":
+            _llm_client = FakeLLMClient()
+        else:
+            base_url, api_key = _provider_endpoint(settings.llm_provider)
+            _llm_client = OpenAICompatibleClient(base_url, api_key, settings.llm_model)
+
+    return _llm_client
+
+def get_json_completion_client(model: Optional[str] = None) -> JSONCompletionClient:
+    """
+    Get or create a blocking JSON completion client of the configured provider.
+
+    Args:
+        model: Model to use (defaults to ``llm_model``)
+
+    Raises:
+        ValueError: If the provider is unknown, fake, or its API key is missing
+    """
+    model = model or settings.llm_model
+    client = _completion_clients.get(model)
+
+    if client is None:
+        base_url, api_key = _provider_endpoint(settings.llm_provider)
+        client = _completion_clients[model] = JSONCompletionClient(base_url, api_key, model)
+
+    return client
@@ -0,0 +1,285 @@
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.schemas.quiz import QuizDifficulty, QuizPool, QuizQuestion, QuizRequest
+from app.services.llm import JSONCompletionClient, get_json_completion_client
+from workers.enqueue import enqueue_quiz_refresh
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+OPTIONS_PER_QUESTION = 4
+
+DIFFICULTY_GUIDES = {
+    QuizDifficulty.EASY: "preguntas básicas de comprensión (definiciones, hechos explícitos del texto)",
+    QuizDifficulty.MEDIUM: "preguntas de análisis y aplicación de los conceptos del texto",
+    QuizDifficulty.HARD: "preguntas de evaluación y síntesis que relacionen varias ideas del texto",
+}
+
+QUIZ_PROMPT = (
+    "Eres un profesor que prepara un examen tipo test a partir del material de estudio del alumno.\n"
+    "Escribe {count} preguntas distintas en español, de nivel {difficulty}: {guide}. "
+    "Cada pregunta tiene exactamente {options} opciones y una sola correcta, y debe poder "
+    "responderse con el material.\n"
+    'Responde solo con JSON: {{"questions": [{{"question": "...", "options": ["...", ...], '
+    '"answer_index": 0, "explanation": "..."}}]}}\n\n'
+    "Material de estudio:\n{text}"
+)
+
+@dataclass
+class GeneratedQuestion:
+    """A question produced by a generator, before it is stored in the pool."""
+    question: str
+    options: List[str]
+    answer_index: int
+    explanation: Optional[str] = None
+
+def resource_versions(rows: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Version of each resource row: its ``updated_at`` (``created_at`` if never updated).
+
+    Pooled questions are stamped with the version they were generated
+    from, so a re-processed resource gets new questions.
+    """
+    return {row["id"]: row.get("updated_at") or row["created_at"] for row in rows}
+
+def resource_set_hash(resource_versions: Dict[str, str]) -> str:
+    """
+    Hash of a mentor's analyzed resources, the key of its question pool.
+
+    Covers each resource ID and version (its ``updated_at``), so adding,
+    re-processing or removing a resource changes the hash.
+
+    Args:
+        resource_versions: Version of each analyzed resource, by resource ID
+    """
+    digest = hashlib.sha256()
+    for resource_id in sorted(resource_versions):
+        digest.update(f"{resource_id}:{resource_versions[resource_id]}\n".encode())
+    return digest.hexdigest()
+
+def source_text(chunks: List[str], max_chars: int) -> str:
+    """
+    Material for question generation from a resource's chunks.
+
+    Long resources are sampled at evenly spaced chunks rather than cut
+    off, so questions cover the whole document.
+    """
+    total = sum(len(chunk) for chunk in chunks)
+    if total <= max_chars:
+        return "\n\n".join(chunks)
+
+    keep = max(1, len(chunks) * max_chars // total)
+    step = len(chunks) / keep
+    return "\n\n".join(chunks[int(i * step)] for i in range(keep))[:max_chars]
+
+def parse_questions(content: str, count: int) -> List[GeneratedQuestion]:
+    """
+    Read the questions out of a model's JSON reply, dropping malformed ones.
+
+    Raises:
+        ValueError: If the reply is not the expected JSON object
+    """
+    try:
+        items = json.loads(content)["questions"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid quiz generation reply: {str(e)}")
+
+    questions: List[GeneratedQuestion] = []
+    for item in items if isinstance(items, list) else []:
+        try:
+            options = [str(option).strip() for option in item["options"]]
+            answer_index = int(item["answer_index"])
+            question = str(item["question"]).strip()
+        except (KeyError, TypeError, ValueError):
+            continue
+
+        if (
+            not question
+            or len(options) != OPTIONS_PER_QUESTION
+            or len(set(options)) != len(options)
+            or not 0 <= answer_index < len(options)
+        ):
+            continue
+
+        explanation = item.get("explanation")
+        questions.append(GeneratedQuestion(
+            question=question,
+            options=options,
+            answer_index=answer_index,
+            explanation=str(explanation).strip() if explanation else None,
+        ))
+
+    return questions[:count]
+
+class QuestionGenerator(ABC):
+    """Interface for services that write quiz questions about a text."""
+
+    @abstractmethod
+    def generate(self, text: str, difficulty: QuizDifficulty, count: int) -> List[GeneratedQuestion]:
+        """
+        Write multiple-choice questions about a text in a single request.
+
+        Args:
+            text: Study material the questions are about
+            difficulty: Difficulty of the questions
+            count: Number of questions wanted (fewer may be returned)
+
+        Returns:
+            List[GeneratedQuestion]: The well-formed questions
+        """
+
+class LLMQuestionGenerator(QuestionGenerator):
+    """Question generator backed by the configured LLM provider (runs in the background workers)."""
+
+    def __init__(self, client: JSONCompletionClient):
+        self._client = client
+
+    def generate(self, text: str, difficulty: QuizDifficulty, count: int) -> List[GeneratedQuestion]:
+        prompt = QUIZ_PROMPT.format(
+            count=count,
+            difficulty=difficulty.value,
+            guide=DIFFICULTY_GUIDES[difficulty],
+            options=OPTIONS_PER_QUESTION,
+            text=text,
+        )
+        return parse_questions(self._client.complete(prompt), count)
+
+class FakeQuestionGenerator(QuestionGenerator):
+    """
+    Deterministic local question generator for tests and offline development.
+
+    Writes fill-in-the-blank questions: a sentence of the text with one of
+    its longer words blanked out, and other words of the text as wrong
+    options. ``calls`` counts generation requests.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, text: str, difficulty: QuizDifficulty, count: int) -> List[GeneratedQuestion]:
+        self.calls += 1
+        rng = random.Random(f"{difficulty.value}:{text}")
+        words = sorted({word for word in re.findall(r"\w{5,}", text)})
+        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+
+        questions: List[GeneratedQuestion] = []
+        for sentence in sentences:
+            candidates = re.findall(r"\w{5,}", sentence)
+            distractors = [word for word in words if word not in candidates]
+            if not candidates or len(distractors) < OPTIONS_PER_QUESTION - 1:
+                continue
+
+            answer = rng.choice(candidates)
+            options = rng.sample(distractors, OPTIONS_PER_QUESTION - 1) + [answer]
+            rng.shuffle(options)
+            questions.append(GeneratedQuestion(
+                question="Completa la frase: " + re.sub(rf"\b{answer}\b", "_____", sentence, count=1),
+                options=options,
+                answer_index=options.index(answer),
+                explanation=sentence,
+            ))
+            if len(questions) == count:
+                break
+
+        return questions
+
+# Per-process singleton
+_question_generator: Optional[QuestionGenerator] = None
+
+def get_question_generator() -> QuestionGenerator:
+    """
+    Get or create the question generator of the configured LLM provider.
+
+    Raises:
+        ValueError: If the provider is unknown or its API key is missing
+    """
+    global _question_generator
+
+    if _question_generator is None:
+        if settings.llm_provider == "fake":
+            _question_generator = FakeQuestionGenerator()
+        else:
+            _question_generator = LLMQuestionGenerator(get_json_completion_client(settings.quiz_model))
+
+    return _question_generator
+
+def select_questions(pool: QuizPool, request: QuizRequest, rng: Optional[random.Random] = None) -> List[QuizQuestion]:
+    """
+    Draw a quiz from a mentor's pooled questions.
+
+    Quizzes over every resource take questions from each resource in turn,
+    so one long document does not crowd out the others. Options are
+    shuffled per quiz, so repeated questions do not keep their answer
+    position.
+
+    Args:
+        pool: The mentor's pooled questions of the requested difficulty
+        request: Quiz parameters
+        rng: Random source (for reproducible quizzes in tests)
+
+    Returns:
+        List[QuizQuestion]: Up to ``request.num_questions`` questions
+    """
+    rng = rng or random.Random()
+
+    by_resource: Dict[str, List[QuizQuestion]] = {}
+    for question in pool.questions:
+        if request.resource_id is None or question.resource_id == request.resource_id:
+            by_resource.setdefault(question.resource_id, []).append(question)
+
+    queues = list(by_resource.values())
+    for queue in queues:
+        rng.shuffle(queue)
+    rng.shuffle(queues)
+
+    selected: List[QuizQuestion] = []
+    while queues and len(selected) < request.num_questions:
+        for queue in list(queues):
+            selected.append(queue.pop())
+            if not queue:
+                queues.remove(queue)
+            if len(selected) == request.num_questions:
+                break
+
+    quiz = []
+    for question in selected:
+        order = list(range(len(question.options)))
+        rng.shuffle(order)
+        quiz.append(question.model_copy(update={
+            "options": [question.options[i] for i in order],
+            "answer_index": order.index(question.answer_index),
+        }))
+    return quiz
+
+# Mentors whose pool refresh this process recently enqueued
+_refresh_requested: Dict[str, float] = {}
+_refresh_lock = threading.Lock()
+
+def request_pool_refresh(mentor_id: str) -> None:
+    """
+    Enqueue a refresh of a stale pool, at most once per debounce interval.
+
+    Every quiz request on a stale pool would otherwise enqueue its own
+    refresh while the first one is still generating.
+    """
+    now = time.monotonic()
+    with _refresh_lock:
+        if now - _refresh_requested.get(mentor_id, float("-inf")) < settings.quiz_refresh_debounce_seconds:
+            return
+        if len(_refresh_requested) > 1024:
+            for key, requested in list(_refresh_requested.items()):
+                if now - requested >= settings.quiz_refresh_debounce_seconds:
+                    del _refresh_requested[key]
+        _refresh_requested[mentor_id] = now
+
+    enqueue_quiz_refresh(mentor_id)
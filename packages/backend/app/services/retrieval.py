@@ -0,0 +1,89 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+import numpy as np
+
+from app.core.config import settings
+from app.services.vector_index import VectorIndex
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+@dataclass
+class RetrievedChunk:
+    """A chunk selected by hybrid retrieval."""
+    score: float  # Reciprocal rank fusion score
+    resource_id: str
+    position: int
+    text: str
+    vector_rank: Optional[int] = None  # 1-based rank in each index, if found there
+    lexical_rank: Optional[int] = None
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hashable]], k: int = 60) -> List[Tuple[Hashable, float]]:
+    """
+    Merge several rankings of the same items (RRF).
+
+    Every item scores ``sum(1 / (k + rank))`` over the rankings it appears
+    in, so items ranked well by several retrievers come first without
+    having to compare their raw scores (cosine similarity vs. BM25).
+
+    Args:
+        rankings: Item keys of each ranking, best first
+        k: Damping constant; higher values flatten the rank differences
+
+    Returns:
+        List[Tuple[Hashable, float]]: Every item with its fused score, best first
+    """
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+def hybrid_search(index: VectorIndex, query: np.ndarray, question: str, k: int = 5) -> List[RetrievedChunk]:
+    """
+    Find the chunks most relevant to a question with vector and keyword search.
+
+    The top ``retrieval_candidates`` chunks of the vector index (by
+    embedding similarity) and of the keyword index (by BM25) are fused
+    with reciprocal rank fusion. If keyword search fails, vector results
+    are returned alone.
+
+    Args:
+        index: The mentor's vector index
+        query: Embedding of the question
+        question: The question text, for keyword search
+        k: Number of results
+
+    Returns:
+        List[RetrievedChunk]: Up to k chunks, best first
+    """
+    candidates = max(k, settings.retrieval_candidates)
+
+    chunks: Dict[Tuple[str, int], RetrievedChunk] = {}
+    for rank, hit in enumerate(index.search(query, candidates), start=1):
+        chunks[(hit.resource_id, hit.position)] = RetrievedChunk(
+            score=0.0, resource_id=hit.resource_id, position=hit.position, text=hit.text, vector_rank=rank
+        )
+    vector_ranking = list(chunks)
+
+    lexical_ranking: List[Tuple[str, int]] = []
+    try:
+        for rank, hit in enumerate(index.lexical.search(question, candidates), start=1):
+            key = (hit.resource_id, hit.position)
+            chunk = chunks.get(key)
+            if chunk is None:
+                chunk = chunks[key] = RetrievedChunk(
+                    score=0.0, resource_id=hit.resource_id, position=hit.position, text=hit.text
+                )
+            chunk.lexical_rank = rank
+            lexical_ranking.append(key)
+    except Exception as e:
+        logger.warning(f"Keyword search failed for index {index.path}: {str(e)}")
+
+    results: List[RetrievedChunk] = []
+    for key, score in reciprocal_rank_fusion([vector_ranking, lexical_ranking], settings.retrieval_rrf_k)[:k]:
+        chunk = chunks[key]
+        chunk.score = score
+        results.append(chunk)
+    return results
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import base64
+import logging
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Optional
+import httpx
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.core.metrics import storage_upload_bytes_total, storage_uploads_total
+
+# Imported for type hints only; the SDK loads when the first client is created
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+# Storage bucket holding every uploaded resource file
+STORAGE_BUCKET = "resources"
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+def resource_folder(user_id: str, mentor_id: str) -> str:
+    """Folder of a mentor's files in the resources bucket (``{user_id}/{mentor_id}/``)."""
+    return f"{user_id}/{mentor_id}/"
+
+def owned_storage_path(storage_path: Optional[str], user_id: str, mentor_id: str) -> Optional[str]:
+    """
+    Check that an object path lies in the folder of a user's mentor.
+
+    Workers act on storage with the service key, so every path they read
+    or remove is checked against the resource's owner first.
+
+    Args:
+        storage_path: Recorded object path of a resource (None for URL resources)
+        user_id: ID of the mentor's owner
+        mentor_id: ID of the resource's mentor
+
+    Returns:
+        Optional[str]: The path, or None if it is missing or outside the folder
+    """
+    if not storage_path or ".." in storage_path.split("/"):
+        return None
+    if not storage_path.startswith(resource_folder(user_id, mentor_id)):
+        return None
+    return storage_path
+
+def _encode_tus_metadata(metadata: Dict[str, str]) -> str:
+    """Encode a dict as a TUS ``Upload-Metadata`` header value."""
+    return ",".join(
+        f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in metadata.items()
+    )
+
+async def get_upload_size(file: UploadFile) -> int:
+    """
+    Get the size of an uploaded file without reading it into memory.
+
+    Args:
+        file: The uploaded file (spooled by Starlette to memory or disk)
+
+    Returns:
+        int: File size in bytes
+    """
+    if file.size is not None:
+        return file.size
+
+    file.file.seek(0, 2)
+    size = file.file.tell()
+    await file.seek(0)
+    return size
+
+async def upload_file_to_storage(
+    client: AsyncClient,
+    storage_path: str,
+    file: UploadFile,
+    content_type: str,
+) -> int:
+    """
+    Upload a file to Supabase Storage using bounded memory.
+
+    Files that fit in a single chunk go through the regular upload API.
+    Larger files use the resumable (TUS) endpoint and are sent one
+    fixed-size chunk at a time, so memory per upload stays at one chunk
+    regardless of the file size.
+
+    Args:
+        client: Async Supabase client instance
+        storage_path: Object path inside the resources bucket
+        file: The uploaded file
+        content_type: MIME type stored with the object
+
+    Returns:
+        int: Number of bytes uploaded
+
+    Raises:
+        Exception: If the upload fails
+    """
+    size = await get_upload_size(file)
+    chunk_size = settings.storage_upload_chunk_size
+
+    if size <= chunk_size:
+        await file.seek(0)
+        content = await file.read()
+        await client.storage.from_(STORAGE_BUCKET).upload(
+            path=storage_path,
+            file=content,
+            file_options={
+                "content-type": content_type,
+                "upsert": False
+            }
+        )
+        storage_upload_bytes_total.inc(len(content), mode="single")
+        storage_uploads_total.inc(mode="single")
+        return len(content)
+
+    uploaded = await _resumable_upload(client, storage_path, file, content_type, size, chunk_size)
+    storage_upload_bytes_total.inc(uploaded, mode="resumable")
+    storage_uploads_total.inc(mode="resumable")
+    return uploaded
+
+async def _resumable_upload(
+    client: AsyncClient,
+    storage_path: str,
+    file: UploadFile,
+    content_type: str,
+    size: int,
+    chunk_size: int,
+) -> int:
+    """
+    Stream a file to the Supabase TUS endpoint chunk by chunk.
+
+    A failed chunk is retried after asking the server for its current
+    offset, so an interrupted upload resumes instead of starting over.
+    """
+    http_client: httpx.AsyncClient = client.options.httpx_client
+    headers = {
+        **client.options.headers,
+        "tus-resumable": "1.0.0",
+    }
+
+    # Create the upload session
+    create_response = await http_client.post(
+        f"{client.storage_url}upload/resumable",
+        headers={
+            **headers,
+            "x-upsert": "false",
+            "upload-length": str(size),
+            "upload-metadata": _encode_tus_metadata({
+                "bucketName": STORAGE_BUCKET,
+                "objectName": storage_path,
+                "contentType": content_type,
+                "cacheControl": "3600",
+            }),
+        },
+    )
+    create_response.raise_for_status()
+    upload_url = create_response.headers["location"]
+
+    offset = 0
+    retries = 0
+    while offset < size:
+        length = min(chunk_size, size - offset)
+
+        try:
+            response = await http_client.patch(
+                upload_url,
+                content=_read_chunk(file, offset, length),
+                headers={
+                    **headers,
+                    "upload-offset": str(offset),
+                    "content-length": str(length),
+                    "content-type": "application/offset+octet-stream",
+                },
+            )
+            response.raise_for_status()
+            offset = int(response.headers["upload-offset"])
+            retries = 0
+        except httpx.HTTPError as e:
+            retries += 1
+            if retries > settings.storage_upload_max_retries:
+                raise Exception(f"Resumable upload failed at offset {offset}: {str(e)}")
+
+            logger.warning(f"Resumable upload chunk failed at offset {offset}, resuming: {str(e)}")
+            offset = await _get_upload_offset(http_client, upload_url, headers)
+
+    return size
+
+async def _read_chunk(file: UploadFile, offset: int, length: int) -> AsyncIterator[bytes]:
+    """
+    Yield one chunk of the file as a request body.
+
+    Streaming the chunk through a generator means the bytes are released as
+    soon as they are sent, instead of living on in the request object until
+    the garbage collector breaks httpx's request/response cycle.
+    """
+    await file.seek(offset)
+    yield await file.read(length)
+
+async def _get_upload_offset(http_client: httpx.AsyncClient, upload_url: str, headers: Dict[str, str]) -> int:
+    """Ask the TUS server how many bytes of an upload it has persisted."""
+    response = await http_client.head(upload_url, headers=headers)
+    response.raise_for_status()
+    return int(response.headers["upload-offset"])
@@ -0,0 +1,559 @@
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import numpy as np
+
+from app.core.config import settings
+from app.services.lexical_index import LexicalIndex
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "lock"
+LEXICAL_FILE = "lexical.sqlite3"
+
+# Mentor IDs become directory names, so only allow safe characters
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+@dataclass
+class SearchHit:
+    """A chunk returned by a vector search."""
+    row: int
+    score: float
+    resource_id: str
+    position: int
+    text: str
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so a dot product is the cosine similarity."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+class VectorIndex:
+    """
+    Embedding index for a single mentor.
+
+    Vectors live in one contiguous float32 file that is memory-mapped
+    read-only, so every API and worker process on the host shares the same
+    pages through the OS page cache instead of loading its own copy.
+
+    Writers (the ingestion workers) append under an exclusive file lock and
+    publish new rows by atomically replacing ``manifest.json``. Readers only
+    map the rows the manifest covers, so a concurrent append is never seen
+    half-written. Removing rows writes a new file generation ("version").
+
+    Large indexes also get an IVF (inverted file) structure: k-means
+    centroids plus a list assignment per row. Queries then only scan the
+    rows in the ``nprobe`` closest lists instead of the whole matrix.
+
+    The same chunks are also kept in a BM25 keyword index (``lexical``),
+    updated by the same writes one resource at a time.
+    """
+
+    def __init__(self, path: str, dimensions: int):
+        self.path = path
+        self.dimensions = dimensions
+        os.makedirs(path, exist_ok=True)
+
+        # Reader state, refreshed whenever the manifest changes
+        self._lock = threading.Lock()
+        self._manifest_key: Optional[tuple] = None
+        self._manifest: Dict[str, Any] = self._empty_manifest()
+        self._vectors: Optional[np.ndarray] = None
+        self._chunks: List[Dict[str, Any]] = []
+        self._chunks_offset = 0
+        self._assign: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._list_order: Optional[np.ndarray] = None
+        self._list_bounds: Optional[np.ndarray] = None
+        self._lexical: Optional[LexicalIndex] = None
+
+    # File layout
+
+    def _empty_manifest(self) -> Dict[str, Any]:
+        return {
+            "version": 0,
+            "rows": 0,
+            "dimensions": self.dimensions,
+            "chunks_bytes": 0,
+            "ivf_build": 0,
+            "ivf_rows": 0,
+        }
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _vectors_file(self, manifest: Dict[str, Any]) -> str:
+        return self._file(f"vectors-{manifest['version']}.f32")
+
+    def _chunks_file(self, manifest: Dict[str, Any]) -> str:
+        return self._file(f"chunks-{manifest['version']}.jsonl")
+
+    def _assign_file(self, manifest: Dict[str, Any]) -> str:
+        return self._file(f"assign-{manifest['version']}-{manifest['ivf_build']}.i32")
+
+    def _centroids_file(self, manifest: Dict[str, Any]) -> str:
+        return self._file(f"centroids-{manifest['version']}-{manifest['ivf_build']}.npy")
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self._file(MANIFEST_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return self._empty_manifest()
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp = self._file(MANIFEST_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file(MANIFEST_FILE))
+
+    def _remove_stale_files(self, manifest: Dict[str, Any]) -> None:
+        """Delete files of older generations. Readers that still map them keep working."""
+        current = {
+            MANIFEST_FILE,
+            LOCK_FILE,
+            LEXICAL_FILE,
+            LEXICAL_FILE + "-wal",
+            LEXICAL_FILE + "-shm",
+            os.path.basename(self._vectors_file(manifest)),
+            os.path.basename(self._chunks_file(manifest)),
+            os.path.basename(self._assign_file(manifest)),
+            os.path.basename(self._centroids_file(manifest)),
+        }
+        for name in os.listdir(self.path):
+            if name not in current:
+                try:
+                    os.remove(self._file(name))
+                except FileNotFoundError:
+                    pass
+
+    @contextmanager
+    def _writer_lock(self) -> Iterator[None]:
+        """Exclusive cross-process lock for writers."""
+        with open(self._file(LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @property
+    def lexical(self) -> LexicalIndex:
+        """BM25 keyword index over the same chunks (opened on first use)."""
+        with self._lock:
+            if self._lexical is None:
+                self._lexical = LexicalIndex(self._file(LEXICAL_FILE))
+            return self._lexical
+
+    # Reading
+
+    def _refresh(self) -> None:
+        """Re-map the index files if another process published new rows."""
+        try:
+            stat = os.stat(self._file(MANIFEST_FILE))
+        except FileNotFoundError:
+            return
+
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if key == self._manifest_key:
+            return
+
+        manifest = self._read_manifest()
+        if manifest["version"] != self._manifest["version"]:
+            self._chunks = []
+            self._chunks_offset = 0
+
+        rows = manifest["rows"]
+        self._vectors = (
+            np.memmap(self._vectors_file(manifest), dtype=np.float32, mode="r", shape=(rows, self.dimensions))
+            if rows else None
+        )
+
+        # Chunk metadata is append-only within a version: read only new lines
+        with open(self._chunks_file(manifest), "rb") as f:
+            f.seek(self._chunks_offset)
+            data = f.read(manifest["chunks_bytes"] - self._chunks_offset)
+        self._chunks.extend(json.loads(line) for line in data.splitlines() if line)
+        self._chunks_offset = manifest["chunks_bytes"]
+
+        if manifest["ivf_build"] and rows:
+            self._centroids = np.load(self._centroids_file(manifest))
+            self._assign = np.memmap(self._assign_file(manifest), dtype=np.int32, mode="r", shape=(rows,))
+            self._list_order = np.argsort(self._assign, kind="stable")
+            self._list_bounds = np.searchsorted(
+                self._assign[self._list_order], np.arange(len(self._centroids) + 1)
+            )
+        else:
+            self._centroids = self._assign = self._list_order = self._list_bounds = None
+
+        self._manifest = manifest
+        self._manifest_key = key
+
+    def refresh(self) -> None:
+        """Pick up rows published by other processes."""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    self._refresh()
+                    return
+                except FileNotFoundError:
+                    # A writer swapped generations between our reads; retry once
+                    if attempt:
+                        raise
+                    self._manifest_key = None
+
+    @property
+    def rows(self) -> int:
+        """Number of indexed chunks."""
+        self.refresh()
+        return self._manifest["rows"]
+
+    @property
+    def content_version(self) -> Tuple[int, int]:
+        """(file generation, rows): changes whenever chunks are added, replaced or removed."""
+        self.refresh()
+        manifest = self._manifest
+        return manifest["version"], manifest["rows"]
+
+    def resource_ids(self) -> Set[str]:
+        """IDs of every resource with chunks in the index."""
+        self.refresh()
+        return {chunk["resource_id"] for chunk in self._chunks}
+
+    def resource_chunks(self, resource_id: str) -> List[str]:
+        """Texts of a resource's chunks, in document order."""
+        self.refresh()
+        with self._lock:
+            chunks = self._chunks
+        return [
+            chunk["text"]
+            for chunk in sorted(
+                (chunk for chunk in chunks if chunk["resource_id"] == resource_id),
+                key=lambda chunk: chunk["position"]
+            )
+        ]
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 5,
+        exact: bool = False,
+        nprobe: Optional[int] = None,
+    ) -> List[SearchHit]:
+        """
+        Find the chunks most similar to a query embedding.
+
+        Args:
+            query: Query embedding
+            k: Number of results
+            exact: Scan every row even when an IVF structure is available
+            nprobe: IVF lists to scan (defaults to settings)
+
+        Returns:
+            List[SearchHit]: Up to k hits, highest cosine similarity first
+        """
+        self.refresh()
+        with self._lock:
+            vectors, chunks = self._vectors, self._chunks
+            centroids, order, bounds = self._centroids, self._list_order, self._list_bounds
+
+        if vectors is None or k <= 0:
+            return []
+
+        q = _normalize(query)
+
+        if centroids is not None and not exact:
+            nprobe = min(nprobe or settings.vector_ivf_nprobe, len(centroids))
+            probe = _top_k(centroids @ q, nprobe)
+            # Sorted row order turns the gather into a forward scan of the file
+            candidates = np.sort(np.concatenate([order[bounds[i]:bounds[i + 1]] for i in probe]))
+            scores = vectors[candidates] @ q
+            best = _top_k(scores, k)
+            rows, best_scores = candidates[best], scores[best]
+        else:
+            scores = vectors @ q
+            rows = _top_k(scores, k)
+            best_scores = scores[rows]
+
+        return [
+            SearchHit(
+                row=int(row),
+                score=float(score),
+                resource_id=chunks[row]["resource_id"],
+                position=chunks[row]["position"],
+                text=chunks[row]["text"],
+            )
+            for row, score in zip(rows, best_scores)
+        ]
+
+    # Writing
+
+    def add(self, resource_id: str, texts: List[str], vectors: np.ndarray) -> int:
+        """
+        Add (or replace) the chunks of a resource.
+
+        Args:
+            resource_id: Resource the chunks belong to
+            texts: Chunk texts, in document order
+            vectors: Embeddings for the chunks, one row per text
+
+        Returns:
+            int: Total rows in the index after the add
+        """
+        vectors = _normalize(vectors)
+        if vectors.shape != (len(texts), self.dimensions):
+            raise ValueError(f"Expected {len(texts)} vectors of dimension {self.dimensions}")
+
+        with self._writer_lock():
+            self.refresh()
+            manifest = dict(self._manifest)
+            stale_files = False
+
+            # Re-processing a resource replaces its previous chunks
+            if resource_id in self.resource_ids():
+                manifest = self._rewrite(manifest, exclude={resource_id})
+                stale_files = True
+
+            rows = manifest["rows"]
+            self._append(self._vectors_file(manifest), rows * self.dimensions * 4, vectors.tobytes())
+
+            lines = b"".join(
+                json.dumps({"resource_id": resource_id, "position": i, "text": text}).encode() + b"\n"
+                for i, text in enumerate(texts)
+            )
+            manifest["chunks_bytes"] = self._append(self._chunks_file(manifest), manifest["chunks_bytes"], lines)
+
+            if manifest["ivf_build"]:
+                centroids = np.load(self._centroids_file(manifest))
+                assign = np.argmax(vectors @ centroids.T, axis=1).astype(np.int32)
+                self._append(self._assign_file(manifest), rows * 4, assign.tobytes())
+
+            manifest["rows"] = rows + len(texts)
+
+            # Build IVF once the index is large, and rebuild when it doubles
+            if manifest["rows"] >= settings.vector_ivf_min_rows and manifest["rows"] >= 2 * manifest["ivf_rows"]:
+                manifest = self._build_ivf(manifest)
+                stale_files = True
+
+            self._write_manifest(manifest)
+            if stale_files:
+                self._remove_stale_files(manifest)
+
+            self.lexical.add(resource_id, texts)
+
+        return manifest["rows"]
+
+    def remove_resource(self, resource_id: str) -> int:
+        """
+        Remove every chunk of a resource.
+
+        Returns:
+            int: Number of rows removed
+        """
+        return self.remove_resources([resource_id])
+
+    def remove_resources(self, resource_ids: Iterable[str]) -> int:
+        """
+        Remove every chunk of several resources with a single rewrite.
+
+        Returns:
+            int: Number of rows removed
+        """
+        resource_ids = set(resource_ids)
+
+        with self._writer_lock():
+            self.refresh()
+            self.lexical.remove_resources(resource_ids)
+            exclude = resource_ids & self.resource_ids()
+            if not exclude:
+                return 0
+
+            manifest = self._rewrite(dict(self._manifest), exclude=exclude)
+            removed = self._manifest["rows"] - manifest["rows"]
+            self._write_manifest(manifest)
+            self._remove_stale_files(manifest)
+
+        return removed
+
+    def sync_lexical(self) -> int:
+        """
+        Make the keyword index hold exactly the resources of the vector index.
+
+        Indexes built before keyword search existed are backfilled one
+        resource at a time; a worker that died between the two writes
+        leaves at most one resource to repair.
+
+        Returns:
+            int: Number of resources added to or removed from the keyword index
+        """
+        with self._writer_lock():
+            self.refresh()
+            indexed = self.resource_ids()
+            lexical = self.lexical.resource_ids()
+
+            stale = lexical - indexed
+            if stale:
+                self.lexical.remove_resources(stale)
+            missing = indexed - lexical
+            for resource_id in missing:
+                self.lexical.add(resource_id, self.resource_chunks(resource_id))
+
+        return len(stale) + len(missing)
+
+    def close(self) -> None:
+        """Close the keyword index connection (the index is being deleted)."""
+        with self._lock:
+            if self._lexical is not None:
+                self._lexical.close()
+                self._lexical = None
+
+    @staticmethod
+    def _append(path: str, expected_size: int, data: bytes) -> int:
+        """
+        Append to a file after trimming bytes beyond the published size.
+
+        A writer that crashed mid-append may have left unpublished bytes;
+        they are discarded before appending.
+        """
+        with open(path, "ab") as f:
+            if f.tell() != expected_size:
+                f.truncate(expected_size)
+            f.seek(expected_size)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return expected_size + len(data)
+
+    def _rewrite(self, manifest: Dict[str, Any], exclude: Set[str]) -> Dict[str, Any]:
+        """Copy the rows not belonging to ``exclude`` into a new file generation."""
+        keep = np.array(
+            [i for i, chunk in enumerate(self._chunks) if chunk["resource_id"] not in exclude],
+            dtype=np.int64,
+        )
+        new = dict(manifest, version=manifest["version"] + 1, rows=len(keep))
+
+        with open(self._vectors_file(new), "wb") as f:
+            for start in range(0, len(keep), 16384):
+                f.write(np.ascontiguousarray(self._vectors[keep[start:start + 16384]]).tobytes())
+
+        lines = b"".join(json.dumps(self._chunks[i]).encode() + b"\n" for i in keep)
+        with open(self._chunks_file(new), "wb") as f:
+            f.write(lines)
+        new["chunks_bytes"] = len(lines)
+
+        if manifest["ivf_build"]:
+            np.save(self._centroids_file(new), np.load(self._centroids_file(manifest)))
+            with open(self._assign_file(new), "wb") as f:
+                f.write(np.asarray(self._assign[keep], dtype=np.int32).tobytes())
+
+        return new
+
+    def _build_ivf(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Train spherical k-means centroids and assign every row to a list."""
+        rows = manifest["rows"]
+        vectors = np.memmap(self._vectors_file(manifest), dtype=np.float32, mode="r", shape=(rows, self.dimensions))
+
+        nlist = int(np.clip(np.sqrt(rows), 16, 4096))
+        rng = np.random.default_rng(0)
+        sample = np.asarray(vectors[np.sort(rng.choice(rows, min(rows, nlist * 64), replace=False))])
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(10):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            # Keep the previous centroid for empty lists
+            centroids = np.where(counts[:, None] > 0, _normalize(sums), centroids)
+
+        new = dict(manifest, ivf_build=manifest["ivf_build"] + 1, ivf_rows=rows)
+        np.save(self._centroids_file(new), centroids)
+        with open(self._assign_file(new), "wb") as f:
+            for start in range(0, rows, 16384):
+                block = np.asarray(vectors[start:start + 16384])
+                f.write(np.argmax(block @ centroids.T, axis=1).astype(np.int32).tobytes())
+
+        logger.info(f"Built IVF index with {nlist} lists over {rows} rows in {self.path}")
+        return new
+
+# Per-process index handles, one per mentor
+_indexes: Dict[str, VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_vector_index(mentor_id: str) -> VectorIndex:
+    """
+    Get the vector index of a mentor.
+
+    Args:
+        mentor_id: ID of the mentor that owns the index
+
+    Returns:
+        VectorIndex: The mentor's index (created empty if it does not exist)
+
+    Raises:
+        ValueError: If the mentor ID is not a safe directory name
+    """
+    if not _SAFE_ID.match(mentor_id):
+        raise ValueError(f"Invalid mentor ID: {mentor_id}")
+
+    with _indexes_lock:
+        index = _indexes.get(mentor_id)
+        if index is None:
+            index = VectorIndex(
+                os.path.join(settings.vector_index_dir, mentor_id),
+                settings.embedding_dimensions,
+            )
+            _indexes[mentor_id] = index
+        return index
+
+def list_vector_indexes() -> List[str]:
+    """IDs of the mentors that have an index on this node."""
+    if not os.path.isdir(settings.vector_index_dir):
+        return []
+    return [
+        name for name in os.listdir(settings.vector_index_dir)
+        if _SAFE_ID.match(name) and os.path.isdir(os.path.join(settings.vector_index_dir, name))
+    ]
+
+def delete_vector_index(mentor_id: str) -> bool:
+    """
+    Delete a mentor's index from disk (e.g. after the mentor was deleted).
+
+    Returns:
+        bool: True if an index existed
+
+    Raises:
+        ValueError: If the mentor ID is not a safe directory name
+    """
+    if not _SAFE_ID.match(mentor_id):
+        raise ValueError(f"Invalid mentor ID: {mentor_id}")
+
+    path = os.path.join(settings.vector_index_dir, mentor_id)
+    with _indexes_lock:
+        index = _indexes.pop(mentor_id, None)
+        if index is not None:
+            index.close()
+        if not os.path.isdir(path):
+            return False
+        shutil.rmtree(path)
+    return True
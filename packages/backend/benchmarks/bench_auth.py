@@ -0,0 +1,59 @@
+"""
+Microbenchmark for per-request authentication overhead.
+
+Compares ``get_current_user`` with the verified-token cache disabled
+(full JWT verification and User construction on every call) and enabled.
+
+Run from packages/backend:
+
+    python -m benchmarks.bench_auth
+"""
+import asyncio
+import json
+import time
+from typing import Dict
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.security import create_access_token, get_current_user, token_cache
+
+def _time_per_call(credentials: HTTPAuthorizationCredentials, iterations: int) -> float:
+    """Average microseconds per ``get_current_user`` call."""
+    async def run() -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await get_current_user(credentials)
+        return time.perf_counter() - started
+
+    return asyncio.run(run()) / iterations * 1e6
+
+def run(iterations: int = 20000) -> Dict[str, float]:
+    token = create_access_token({
+        "sub": "bench@example.com",
+        "user_id": "00000000-0000-0000-0000-000000000000",
+        "email": "bench@example.com",
+        "full_name": "Bench User"
+    })
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    maxsize = token_cache.maxsize
+    try:
+        token_cache.maxsize = 0
+        token_cache.clear()
+        uncached = _time_per_call(credentials, iterations)
+
+        token_cache.maxsize = maxsize
+        token_cache.clear()
+        cached = _time_per_call(credentials, iterations)
+    finally:
+        token_cache.maxsize = maxsize
+        token_cache.clear()
+
+    return {
+        "auth_uncached_us_per_request": uncached,
+        "auth_cached_us_per_request": cached,
+        "auth_speedup": uncached / cached,
+    }
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
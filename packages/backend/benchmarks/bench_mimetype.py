@@ -0,0 +1,47 @@
+"""
+Microbenchmark for MIME type classification of uploads.
+
+Times ``get_resource_type_from_mimetype`` for each supported family and
+for an unsupported type (which raises).
+
+Run from packages/backend:
+
+    python -m benchmarks.bench_mimetype
+"""
+import json
+import time
+from typing import Dict
+
+from app.api.v1.endpoints.resources import get_resource_type_from_mimetype
+
+CASES = {
+    "pdf": "application/pdf",
+    "image": "image/webp",
+    "text": "text/markdown",
+}
+
+def _ns_per_call(mimetype: str, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        get_resource_type_from_mimetype(mimetype)
+    return (time.perf_counter() - started) / iterations * 1e9
+
+def _ns_per_rejection(mimetype: str, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        try:
+            get_resource_type_from_mimetype(mimetype)
+        except ValueError:
+            pass
+    return (time.perf_counter() - started) / iterations * 1e9
+
+def run(iterations: int = 200000) -> Dict[str, float]:
+    results = {
+        f"mimetype_{name}_ns": _ns_per_call(mimetype, iterations)
+        for name, mimetype in CASES.items()
+    }
+    results["mimetype_unsupported_ns"] = _ns_per_rejection("video/mp4", iterations)
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
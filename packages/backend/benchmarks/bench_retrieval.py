@@ -0,0 +1,123 @@
+"""
+Benchmark for hybrid (vector + BM25) retrieval on a 100k-chunk mentor index.
+
+Builds a throwaway index of 100 resources x 1000 chunks of synthetic
+Spanish study text (Zipf-distributed vocabulary plus rare exact terms
+such as dates and formula names) with random unit embeddings, then
+measures:
+
+- query latency of vector search, keyword (BM25) search and the fused
+  hybrid search, over questions mixing common words and one rare term;
+- adding one more 200-chunk resource to the full index, which must only
+  write that resource's rows.
+
+Embeddings are 256-dimensional to keep the throwaway index small; vector
+search time scales linearly with the dimensions.
+
+Run from packages/backend:
+
+    python -m benchmarks.bench_retrieval
+"""
+import itertools
+import json
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from app.services.retrieval import hybrid_search
+from app.services.vector_index import VectorIndex
+
+RESOURCES = 100
+CHUNKS_PER_RESOURCE = 1000
+WORDS_PER_CHUNK = 150
+DIMENSIONS = 256
+QUERIES = 100
+
+COMMON_WORDS = ["de", "la", "que", "el", "en", "y", "los", "del", "se", "las", "por", "un", "para", "con", "una"]
+RARE_TERMS = ["1789", "1492", "1917", "bayes", "pitagoras", "avogadro", "kirchhoff", "mendel", "ohm", "bernoulli"]
+
+def _vocabulary(rng: random.Random, size: int = 30000) -> List[str]:
+    letters = "abcdefghijklmnopqrstuvwxyzáéíóúñ"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 11))) for _ in range(size)]
+
+def _chunk(rng: random.Random, vocabulary: List[str], cum_weights: List[float]) -> str:
+    words = rng.choices(vocabulary, cum_weights=cum_weights, k=WORDS_PER_CHUNK - 40) + rng.choices(COMMON_WORDS, k=40)
+    if rng.random() < 0.01:
+        words.append(rng.choice(RARE_TERMS))
+    rng.shuffle(words)
+    return " ".join(words)
+
+def _unit_vectors(rng: np.random.Generator, count: int) -> np.ndarray:
+    vectors = rng.standard_normal((count, DIMENSIONS)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def _latencies_ms(function: Callable[[int], object], count: int) -> List[float]:
+    latencies = []
+    for i in range(count):
+        started = time.perf_counter()
+        function(i)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+def _p95(values: List[float]) -> float:
+    return sorted(values)[int(len(values) * 0.95) - 1]
+
+def run() -> Dict[str, float]:
+    rng = random.Random(0)
+    vector_rng = np.random.default_rng(0)
+    vocabulary = _vocabulary(rng)
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocabulary))))
+
+    path = tempfile.mkdtemp(prefix="bench-retrieval-")
+    try:
+        index = VectorIndex(path, DIMENSIONS)
+
+        started = time.perf_counter()
+        for resource in range(RESOURCES):
+            texts = [_chunk(rng, vocabulary, cum_weights) for _ in range(CHUNKS_PER_RESOURCE)]
+            index.add(f"resource-{resource}", texts, _unit_vectors(vector_rng, len(texts)))
+        build_seconds = time.perf_counter() - started
+
+        # Adding a resource to the full index only writes its own rows
+        texts = [_chunk(rng, vocabulary, cum_weights) for _ in range(200)]
+        vectors = _unit_vectors(vector_rng, len(texts))
+        started = time.perf_counter()
+        index.add("resource-new", texts, vectors)
+        add_resource_ms = (time.perf_counter() - started) * 1000
+
+        questions = [
+            " ".join(rng.choices(COMMON_WORDS, k=3) + rng.choices(vocabulary[:5000], k=4) + [rng.choice(RARE_TERMS)])
+            for _ in range(QUERIES)
+        ]
+        queries = _unit_vectors(vector_rng, QUERIES)
+
+        # Warm up mappings and the SQLite page cache
+        index.search(queries[0], 20)
+        index.lexical.search(questions[0], 20)
+
+        vector_ms = _latencies_ms(lambda i: index.search(queries[i], 20), QUERIES)
+        lexical_ms = _latencies_ms(lambda i: index.lexical.search(questions[i], 20), QUERIES)
+        hybrid_ms = _latencies_ms(lambda i: hybrid_search(index, queries[i], questions[i], 5), QUERIES)
+
+        results = {
+            "chunks": float(index.rows),
+            "build_seconds": build_seconds,
+            "add_resource_ms": add_resource_ms,
+            "vector_search_p50_ms": statistics.median(vector_ms),
+            "lexical_search_p50_ms": statistics.median(lexical_ms),
+            "lexical_search_p95_ms": _p95(lexical_ms),
+            "hybrid_search_p50_ms": statistics.median(hybrid_ms),
+            "hybrid_search_p95_ms": _p95(hybrid_ms),
+        }
+        index.close()
+        return results
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
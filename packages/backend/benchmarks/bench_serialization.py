@@ -0,0 +1,77 @@
+"""
+Microbenchmark for response serialization of mentor and resource listings.
+
+Measures a full page (``MAX_PAGE_SIZE`` items) going through FastAPI's
+response pipeline (``response_model`` validation, encoding and the ASGI
+response), and the pydantic-core part of it on its own.
+
+Run from packages/backend:
+
+    python -m benchmarks.bench_serialization
+"""
+import asyncio
+import json
+import time
+from typing import Callable, Dict, Type
+
+import httpx
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from app.crud.rows import decode_rows
+from app.schemas.mentor import Mentor
+from app.schemas.pagination import MAX_PAGE_SIZE, Page
+from app.schemas.resource import Resource
+from benchmarks.fixtures import mentor_rows, resource_rows
+
+def _best_time(function: Callable[[], object], iterations: int, repeats: int = 5) -> float:
+    """Best-of-``repeats`` seconds per call."""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        best = min(best, (time.perf_counter() - started) / iterations)
+    return best
+
+def _fastapi_response_time(page_model: Type[BaseModel], page: BaseModel, iterations: int, repeats: int = 5) -> float:
+    """Best-of-``repeats`` seconds per in-process GET of an endpoint returning ``page``."""
+    app = FastAPI()
+
+    @app.get("/page", response_model=page_model)
+    async def get_page():
+        return page
+
+    async def run() -> float:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.get("/page")
+            best = float("inf")
+            for _ in range(repeats):
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    await client.get("/page")
+                best = min(best, (time.perf_counter() - started) / iterations)
+            return best
+
+    return asyncio.run(run())
+
+def run(iterations: int = 200) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for name, model, make_rows in (
+        ("mentor", Mentor, mentor_rows),
+        ("resource", Resource, resource_rows),
+    ):
+        page_model = Page[model]
+        page = page_model(items=decode_rows(model, make_rows(MAX_PAGE_SIZE)), next_cursor="cursor")
+
+        dump_json = _best_time(page.model_dump_json, iterations)
+        response = _fastapi_response_time(page_model, page, iterations)
+
+        results[f"{name}_page_dump_json_us"] = dump_json * 1e6
+        results[f"{name}_page_fastapi_response_us"] = response * 1e6
+        results[f"{name}_fastapi_items_per_second"] = MAX_PAGE_SIZE / response
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,119 @@
+"""
+Cold-start benchmark: time from launching the API to its first /health response.
+
+Starts ``uvicorn main:app`` in a fresh interpreter (as a scale-to-zero
+platform would), polls ``/health`` until it answers 200 and reports the
+wall-clock time, plus the application import time the API attributes to
+itself in the ``startup`` section of /health. Runs offline: nothing is
+contacted before the first request, so no Supabase or broker is needed.
+
+Run directly, it fails (exit 1) when the median cold start exceeds the
+budget (``--budget-ms``, default ``COLD_START_BUDGET_MS``); the test
+suite enforces the default budget (tests/test_startup.py). Run from
+packages/backend:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --budget-ms 1000
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Tuple
+
+# Default cold-start budget for time-to-first-/health
+COLD_START_BUDGET_MS = 1500.0
+
+# Give up on a start that never answers
+START_TIMEOUT_SECONDS = 30.0
+
+# packages/backend, where main.py lives
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _get_health(port: int) -> Tuple[int, bytes]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request("GET", "/health")
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+def cold_start() -> Tuple[float, float]:
+    """
+    Launch one API process and wait for its first /health response.
+
+    Returns:
+        Tuple[float, float]: Time to first response and application
+        import time, both in milliseconds
+    """
+    port = _free_port()
+    env = dict(os.environ, SENTRY_DSN="")
+    if not env.get("REDIS_URL") and not env.get("WORKER_EAGER"):
+        # Never contacted before the first enqueue, but required to boot
+        env["REDIS_URL"] = "redis://127.0.0.1:6379/0"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"API exited with status {process.returncode} before serving /health")
+            if time.perf_counter() - started > START_TIMEOUT_SECONDS:
+                raise RuntimeError("API did not answer /health in time")
+            try:
+                status, body = _get_health(port)
+            except OSError:
+                time.sleep(0.005)
+                continue
+            if status == 200:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                return elapsed_ms, json.loads(body)["startup"]["import_seconds"] * 1000
+    finally:
+        process.terminate()
+        process.wait()
+
+def run(starts: int = 5) -> Dict[str, float]:
+    samples = [cold_start() for _ in range(starts)]
+    return {
+        "time_to_first_health_ms": statistics.median(sample[0] for sample in samples),
+        "app_import_ms": statistics.median(sample[1] for sample in samples),
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--starts", type=int, default=5, help="Cold starts to measure (median is reported)")
+    parser.add_argument(
+        "--budget-ms", type=float, default=COLD_START_BUDGET_MS,
+        help="Fail above this time to first /health, in ms (0 disables the check)"
+    )
+    args = parser.parse_args()
+
+    results = run(max(1, args.starts))
+    print(json.dumps(results, indent=2))
+
+    if args.budget_ms and results["time_to_first_health_ms"] > args.budget_ms:
+        print(
+            f"Cold start {results['time_to_first_health_ms']:.0f} ms exceeds the {args.budget_ms:.0f} ms budget",
+            file=sys.stderr
+        )
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Synthetic PostgREST rows shared by the benchmarks.
+
+Rows have the shape and value formats Supabase returns (string UUIDs,
+ISO 8601 timestamps with offsets, enum values as strings).
+"""
+import uuid
+from typing import Any, Dict, List
+
+def mentor_rows(count: int) -> List[Dict[str, Any]]:
+    """Rows of the mentors table for a single user."""
+    user_id = str(uuid.uuid4())
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "name": f"Mentor {i}",
+            "description": "Mentor de matemáticas para el curso de cálculo",
+            "expertise": "Cálculo",
+            "avatar_url": None,
+            "color": "#4F46E5",
+            "created_at": "2026-10-17T10:00:00.123456+00:00",
+            "updated_at": "2026-10-17T10:05:00.654321+00:00"
+        }
+        for i in range(count)
+    ]
+
+def resource_rows(count: int) -> List[Dict[str, Any]]:
+    """Rows of the resources table for a single mentor."""
+    mentor_id = str(uuid.uuid4())
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "mentor_id": mentor_id,
+            "name": f"apuntes-{i}.pdf",
+            "type": "pdf",
+            "url": f"https://example.supabase.co/storage/v1/object/public/resources/apuntes-{i}.pdf",
+            "status": "analyzed",
+            "created_at": "2026-10-17T10:00:00.123456+00:00",
+            "updated_at": None
+        }
+        for i in range(count)
+    ]
@@ -0,0 +1,134 @@
+"""
+Run every backend microbenchmark and write machine-readable results.
+
+All benchmarks run offline (no Supabase, no LLM or embedding API). The
+output is one JSON document with the environment and each benchmark's
+metrics, so results from two releases can be diffed or compared with
+``--baseline``.
+
+Metric names encode their direction: names ending in ``_us``, ``_ns``,
+``_ms`` or ``_us_per_request`` are lower-is-better; names ending in
+``_per_second`` are higher-is-better. Other metrics (e.g. ``_speedup``
+ratios) are informational and not compared.
+
+Run from packages/backend:
+
+    python -m benchmarks.run_all --output bench-results.json
+    python -m benchmarks.run_all --repeats 3 --baseline bench-results.json --tolerance 0.2
+"""
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Benchmark modules, each exposing run() -> Dict[str, float]
+BENCHMARKS = {
+    "auth": "benchmarks.bench_auth",
+    "rows": "benchmarks.bench_rows",
+    "serialization": "benchmarks.bench_serialization",
+    "mimetype": "benchmarks.bench_mimetype",
+    "startup": "benchmarks.bench_startup",
+    "retrieval": "benchmarks.bench_retrieval",
+}
+
+LOWER_IS_BETTER = ("_us", "_ns", "_ms", "_us_per_request")
+HIGHER_IS_BETTER = ("_per_second",)
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def _best(metric: str, values: List[float]) -> float:
+    """Best of several runs of a metric (last run for informational metrics)."""
+    if metric.endswith(LOWER_IS_BETTER):
+        return min(values)
+    if metric.endswith(HIGHER_IS_BETTER):
+        return max(values)
+    return values[-1]
+
+def run(names: List[str], repeats: int = 1) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name in names:
+        benchmark = importlib.import_module(BENCHMARKS[name])
+        runs = []
+        for attempt in range(repeats):
+            print(f"Running {name} ({attempt + 1}/{repeats})...", file=sys.stderr)
+            runs.append(benchmark.run())
+        results[name] = {metric: _best(metric, [r[metric] for r in runs]) for metric in runs[0]}
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "repeats": repeats,
+        "results": results,
+    }
+
+def find_regressions(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare two result documents.
+
+    Returns:
+        List[str]: One line per metric that got worse by more than ``tolerance``
+        (a fraction, e.g. 0.2 for 20%)
+    """
+    regressions = []
+    for benchmark, metrics in current["results"].items():
+        previous = baseline.get("results", {}).get(benchmark, {})
+        for metric, value in metrics.items():
+            old = previous.get(metric)
+            if not old:
+                continue
+
+            if metric.endswith(LOWER_IS_BETTER):
+                change = value / old - 1
+            elif metric.endswith(HIGHER_IS_BETTER):
+                change = old / value - 1
+            else:
+                continue
+
+            if change > tolerance:
+                regressions.append(f"{benchmark}.{metric}: {old:.4g} -> {value:.4g} ({change:+.0%} worse)")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run (default: all)")
+    parser.add_argument("--output", help="Write results JSON to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Results JSON of a previous run to compare against")
+    parser.add_argument("--repeats", type=int, default=1, help="Run each benchmark N times and keep the best result")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before failing (fraction)")
+    args = parser.parse_args()
+
+    document = run(args.only or list(BENCHMARKS), max(1, args.repeats))
+
+    output = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(document, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline", file=sys.stderr)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,17 @@
 from app.main import app
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the MentorIA API")
+    parser.add_argument("--reload", action="store_true", help="Single-process development server with auto-reload")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: WEB_CONCURRENCY or one per core)")
+    args = parser.parse_args()
+
+    if args.reload:
+        import uvicorn
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # Production: preforked workers sharing the app imported above
+        from app.core.server import run_production_server
+        run_production_server(app, args.workers)
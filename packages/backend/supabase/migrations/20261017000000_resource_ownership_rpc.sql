@@ -0,0 +1,43 @@
+-- Ownership-checked resource writes in a single round trip.
+--
+-- Resources have no user_id column: ownership goes through mentors.user_id.
+-- These functions fold the ownership check into the write itself so the API
+-- does not need a separate "does this mentor belong to the user" query.
+
+-- Insert a resource only if its mentor belongs to the user.
+-- Returns the created row, or no rows if the mentor is missing or not owned.
+create or replace function public.create_resource_for_user(
+    p_user_id public.mentors.user_id%type,
+    p_mentor_id public.resources.mentor_id%type,
+    p_name public.resources.name%type,
+    p_type public.resources.type%type,
+    p_url public.resources.url%type,
+    p_status public.resources.status%type
+)
+returns setof public.resources
+language sql
+as $$
+    insert into public.resources (name, type, mentor_id, url, status, created_at, updated_at)
+    select p_name, p_type, m.id, p_url, p_status, now(), now()
+    from public.mentors m
+    where m.id = p_mentor_id
+      and m.user_id = p_user_id
+    returning *;
+$$;
+
+-- Delete a resource only if its mentor belongs to the user.
+-- Returns the deleted row, or no rows if the resource is missing or not owned.
+create or replace function public.delete_resource_for_user(
+    p_user_id public.mentors.user_id%type,
+    p_resource_id public.resources.id%type
+)
+returns setof public.resources
+language sql
+as $$
+    delete from public.resources r
+    using public.mentors m
+    where r.id = p_resource_id
+      and m.id = r.mentor_id
+      and m.user_id = p_user_id
+    returning r.*;
+$$;
@@ -0,0 +1,12 @@
+-- Indexes backing keyset pagination of the mentor and resource listings.
+--
+-- Listings are ordered by (created_at desc, id desc) and filtered by owner
+-- (mentors) or mentor (resources). With these indexes every page is an
+-- index range scan starting at the cursor, so deep pages cost the same as
+-- the first one.
+
+create index if not exists mentors_user_id_created_at_id_idx
+    on public.mentors (user_id, created_at desc, id desc);
+
+create index if not exists resources_mentor_id_created_at_id_idx
+    on public.resources (mentor_id, created_at desc, id desc);
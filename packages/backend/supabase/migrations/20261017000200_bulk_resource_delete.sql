@@ -0,0 +1,19 @@
+-- Ownership-checked bulk delete of resources in a single round trip.
+--
+-- Same contract as delete_resource_for_user, for a list of IDs: resources
+-- that are missing or whose mentor belongs to another user are skipped.
+-- Returns the deleted rows so the API can schedule their storage cleanup.
+create or replace function public.delete_resources_for_user(
+    p_user_id public.mentors.user_id%type,
+    p_resource_ids uuid[]
+)
+returns setof public.resources
+language sql
+as $$
+    delete from public.resources r
+    using public.mentors m
+    where r.id = any(p_resource_ids)
+      and m.id = r.mentor_id
+      and m.user_id = p_user_id
+    returning r.*;
+$$;
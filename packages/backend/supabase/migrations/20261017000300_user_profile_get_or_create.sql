@@ -0,0 +1,25 @@
+-- Profile read that creates the default profile on first access, in a
+-- single round trip and without a select-then-insert race.
+--
+-- The insert is skipped when the profile exists (on conflict do nothing), in
+-- which case the existing row is returned instead. Both branches read the
+-- same snapshot, so exactly one of them yields the row. If a concurrent
+-- first access commits between that snapshot and the insert, no row is
+-- returned and the caller simply calls again.
+create or replace function public.get_or_create_user_profile(
+    p_user_id public.user_profiles.id%type
+)
+returns setof public.user_profiles
+language sql
+as $$
+    with created as (
+        insert into public.user_profiles (id, notifications_enabled, subscription_status, mentor_count, resource_upload_mb)
+        values (p_user_id, true, 'free', 0, 0)
+        on conflict (id) do nothing
+        returning *
+    )
+    select * from created
+    union all
+    select * from public.user_profiles where id = p_user_id
+    limit 1;
+$$;
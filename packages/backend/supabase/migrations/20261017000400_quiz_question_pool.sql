@@ -0,0 +1,36 @@
+-- Precomputed quiz question pool of each mentor.
+--
+-- Questions are generated in the background, per analyzed resource and
+-- difficulty, and stamped with the resource version (its updated_at) they
+-- were generated from. Quiz requests only sample from this table, so they
+-- never wait for the LLM.
+--
+-- quiz_pools records the hash of the analyzed resource set the pool was
+-- last brought up to date with. A mismatch with the current set means
+-- resources were added, re-processed or removed; the refresh then only
+-- generates questions for new resource versions and drops the rest.
+
+create table if not exists public.quiz_questions (
+    id uuid primary key default gen_random_uuid(),
+    mentor_id uuid not null references public.mentors (id) on delete cascade,
+    resource_id uuid not null references public.resources (id) on delete cascade,
+    resource_version text not null,
+    difficulty text not null check (difficulty in ('easy', 'medium', 'hard')),
+    position integer not null,
+    question text not null,
+    options jsonb not null,
+    answer_index integer not null,
+    explanation text,
+    created_at timestamptz not null default now(),
+    -- Makes concurrent refreshes of the same resource version idempotent
+    unique (resource_id, resource_version, difficulty, position)
+);
+
+create index if not exists quiz_questions_mentor_id_difficulty_idx
+    on public.quiz_questions (mentor_id, difficulty, resource_id, position);
+
+create table if not exists public.quiz_pools (
+    mentor_id uuid primary key references public.mentors (id) on delete cascade,
+    resource_hash text not null,
+    updated_at timestamptz not null default now()
+);
@@ -0,0 +1,59 @@
+-- Flashcards with spaced-repetition scheduling.
+--
+-- Each card carries its SM-2 state (ease factor, interval, consecutive
+-- successful reviews) and the time it is next due. "Cards due now" reads
+-- walk the (user_id, due_at) indexes from the earliest due time, so they
+-- never scan the rest of a user's cards.
+
+create table if not exists public.flashcards (
+    id uuid primary key default gen_random_uuid(),
+    user_id uuid not null,
+    mentor_id uuid not null references public.mentors (id) on delete cascade,
+    resource_id uuid references public.resources (id) on delete set null,
+    front text not null,
+    back text not null,
+    ease_factor real not null default 2.5,
+    interval_days real not null default 0,
+    repetitions integer not null default 0,
+    due_at timestamptz not null default now(),
+    last_reviewed_at timestamptz,
+    created_at timestamptz not null default now()
+);
+
+create index if not exists flashcards_user_id_due_at_idx
+    on public.flashcards (user_id, due_at, id);
+
+create index if not exists flashcards_user_id_mentor_id_due_at_idx
+    on public.flashcards (user_id, mentor_id, due_at, id);
+
+-- Store a batch of reviews in a single round trip.
+--
+-- p_reviews is a JSON array of the new scheduling state of each reviewed
+-- card: {id, ease_factor, interval_days, repetitions, due_at, last_reviewed_at}.
+-- Cards that are missing or belong to another user are skipped. Returns
+-- the updated cards.
+create or replace function public.review_flashcards(
+    p_user_id public.flashcards.user_id%type,
+    p_reviews jsonb
+)
+returns setof public.flashcards
+language sql
+as $$
+    update public.flashcards f
+    set ease_factor = r.ease_factor,
+        interval_days = r.interval_days,
+        repetitions = r.repetitions,
+        due_at = r.due_at,
+        last_reviewed_at = r.last_reviewed_at
+    from jsonb_to_recordset(p_reviews) as r(
+        id uuid,
+        ease_factor real,
+        interval_days real,
+        repetitions integer,
+        due_at timestamptz,
+        last_reviewed_at timestamptz
+    )
+    where f.id = r.id
+      and f.user_id = p_user_id
+    returning f.*;
+$$;
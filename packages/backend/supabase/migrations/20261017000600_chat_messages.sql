@@ -0,0 +1,17 @@
+-- Conversation history of each user with each mentor.
+--
+-- Chat reads the latest messages of one (mentor, user) conversation, newest
+-- first, so the index matches that order and the read never touches other
+-- conversations. Messages go with their mentor.
+
+create table if not exists public.chat_messages (
+    id uuid primary key default gen_random_uuid(),
+    mentor_id uuid not null references public.mentors (id) on delete cascade,
+    user_id uuid not null,
+    role text not null check (role in ('user', 'assistant')),
+    content text not null,
+    created_at timestamptz not null default now()
+);
+
+create index if not exists chat_messages_mentor_id_user_id_created_at_idx
+    on public.chat_messages (mentor_id, user_id, created_at desc);
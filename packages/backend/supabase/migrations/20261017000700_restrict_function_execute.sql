@@ -0,0 +1,22 @@
+-- Only the API may call the user-scoped database functions.
+--
+-- These functions take the acting user as a parameter (p_user_id) and trust
+-- it: the API passes the ID from the token it verified. Postgres grants
+-- execute on new functions to public, and Supabase exposes every function
+-- in the public schema through PostgREST, so anyone holding the anon key
+-- could act as any user. Keep execute for the service role the API uses.
+
+revoke execute on function public.create_resource_for_user from public, anon, authenticated;
+grant execute on function public.create_resource_for_user to service_role;
+
+revoke execute on function public.delete_resource_for_user from public, anon, authenticated;
+grant execute on function public.delete_resource_for_user to service_role;
+
+revoke execute on function public.delete_resources_for_user from public, anon, authenticated;
+grant execute on function public.delete_resources_for_user to service_role;
+
+revoke execute on function public.get_or_create_user_profile from public, anon, authenticated;
+grant execute on function public.get_or_create_user_profile to service_role;
+
+revoke execute on function public.review_flashcards from public, anon, authenticated;
+grant execute on function public.review_flashcards to service_role;
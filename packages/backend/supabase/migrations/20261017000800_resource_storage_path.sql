@@ -0,0 +1,52 @@
+-- Object path of each uploaded resource file.
+--
+-- Resource URLs are user input (POST /resources/url takes any URL), so a
+-- storage path parsed out of a URL could point at another user's file. The
+-- API now records the path it uploaded to, and cleanup only ever removes
+-- recorded paths. Resources created from URLs have none.
+
+alter table public.resources add column if not exists storage_path text;
+
+-- Backfill uploads made before the column existed: the public URL of a file
+-- in the owner's own {user_id}/{mentor_id}/ folder
+update public.resources r
+set storage_path = split_part(substring(r.url from '/object/public/resources/(.*)$'), '?', 1)
+from public.mentors m
+where m.id = r.mentor_id
+  and r.storage_path is null
+  and split_part(substring(r.url from '/object/public/resources/(.*)$'), '?', 1)
+      like m.user_id::text || '/' || r.mentor_id::text || '/%';
+
+-- create_resource_for_user gains the path; drop the old signature so the
+-- function is not left overloaded
+drop function if exists public.create_resource_for_user(
+    public.mentors.user_id%type,
+    public.resources.mentor_id%type,
+    public.resources.name%type,
+    public.resources.type%type,
+    public.resources.url%type,
+    public.resources.status%type
+);
+
+create or replace function public.create_resource_for_user(
+    p_user_id public.mentors.user_id%type,
+    p_mentor_id public.resources.mentor_id%type,
+    p_name public.resources.name%type,
+    p_type public.resources.type%type,
+    p_url public.resources.url%type,
+    p_status public.resources.status%type,
+    p_storage_path public.resources.storage_path%type default null
+)
+returns setof public.resources
+language sql
+as $$
+    insert into public.resources (name, type, mentor_id, url, status, storage_path, created_at, updated_at)
+    select p_name, p_type, m.id, p_url, p_status, p_storage_path, now(), now()
+    from public.mentors m
+    where m.id = p_mentor_id
+      and m.user_id = p_user_id
+    returning *;
+$$;
+
+revoke execute on function public.create_resource_for_user from public, anon, authenticated;
+grant execute on function public.create_resource_for_user to service_role;
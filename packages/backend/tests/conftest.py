@@ -0,0 +1,215 @@
+"""
+Shared test setup.
+
+Tests run offline: Supabase is played by ``FakeSupabase`` (or a custom
+test transport, see ``make_supabase_client``), embeddings and chat completions use the
+local fake providers and background tasks run eagerly. The environment
+is set before any application module is imported, since
+``app.core.config.settings`` is read at import time.
+"""
+import email
+import json
+import os
+import tempfile
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import httpx
+import pytest
+
+_data_dir = tempfile.mkdtemp(prefix="mentoria-tests-")
+
+os.environ.update({
+    "SUPABASE_URL": "https://test.supabase.co",
+    "SUPABASE_KEY": "test-service-role-key",
+    "DATABASE_URL": "",
+    "SENTRY_DSN": "",
+    "REDIS_URL": "",
+    "WORKER_EAGER": "true",
+    "EMBEDDING_PROVIDER": "fake",
+    "LLM_PROVIDER": "fake",
+    "EMBEDDING_CACHE_PATH": os.path.join(_data_dir, "embedding_cache.sqlite3"),
+    "VECTOR_INDEX_DIR": os.path.join(_data_dir, "vector_index"),
+    "RESPONSE_CACHE_BACKEND": "none",
+    "RATE_LIMIT_BACKEND": "none",
+})
+
+@pytest.fixture
+def make_supabase_client():
+    """
+    Build an async Supabase client whose HTTP calls go to a test transport.
+
+    The transport (an ``httpx.AsyncBaseTransport``) plays the Supabase
+    REST and Storage APIs, so tests can count and inspect every call.
+    """
+    from supabase import AsyncClient, AsyncClientOptions
+
+    def make(transport: httpx.AsyncBaseTransport) -> AsyncClient:
+        return AsyncClient(
+            os.environ["SUPABASE_URL"],
+            os.environ["SUPABASE_KEY"],
+            AsyncClientOptions(httpx_client=httpx.AsyncClient(transport=transport))
+        )
+
+    return make
+
+class FakeSupabase:
+    """
+    In-memory stand-in for the Supabase REST and Storage APIs.
+
+    Understands what the application sends: PostgREST ``eq`` filters,
+    inserts, upserts, updates and deletes on ``tables``, calls to the
+    database functions in ``functions`` (the resource ownership functions
+    of the migrations, plus whatever a test registers),
+    and object uploads, downloads and removals on ``objects``. Other query
+    parameters (``select``, ``order``, ``or``...) are ignored. Every
+    request is recorded in ``calls`` as ``(method, path)``.
+    """
+
+    def __init__(self):
+        self.tables: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.functions: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "create_resource_for_user": self._create_resource_for_user,
+            "delete_resource_for_user": lambda params: self._delete_resources_for_user(
+                {**params, "p_resource_ids": [params["p_resource_id"]]}
+            ),
+            "delete_resources_for_user": self._delete_resources_for_user,
+        }
+        self.objects: Dict[str, bytes] = {}
+        self.calls: List[tuple] = []
+
+    def _owns(self, user_id: str, mentor_id: str) -> bool:
+        return any(mentor["id"] == mentor_id and mentor["user_id"] == user_id for mentor in self.tables["mentors"])
+
+    def _create_resource_for_user(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if not self._owns(params["p_user_id"], params["p_mentor_id"]):
+            return []
+        now = datetime.now(timezone.utc).isoformat()
+        row = {
+            "id": str(uuid.uuid4()),
+            "mentor_id": params["p_mentor_id"],
+            "name": params["p_name"],
+            "type": params["p_type"],
+            "url": params["p_url"],
+            "status": params["p_status"],
+            "storage_path": params.get("p_storage_path"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.tables["resources"].append(row)
+        return [row]
+
+    def _delete_resources_for_user(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        rows = [
+            row for row in self.tables["resources"]
+            if row["id"] in params["p_resource_ids"] and self._owns(params["p_user_id"], row["mentor_id"])
+        ]
+        for row in rows:
+            self.tables["resources"].remove(row)
+        return rows
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.calls.append((request.method, path))
+
+        if path.startswith("/rest/v1/rpc/"):
+            function = self.functions[path.rsplit("/", 1)[1]]
+            return httpx.Response(200, json=function(json.loads(request.content or b"{}")))
+        if path.startswith("/rest/v1/"):
+            return self._table(request, path.split("/")[3])
+        if path.startswith("/storage/v1/object/"):
+            return self._object(request, path.split("/", 4)[4])
+        return httpx.Response(404, json={"message": f"{request.method} {path} not faked"})
+
+    @staticmethod
+    def _matches(row: Dict[str, Any], params: httpx.QueryParams) -> bool:
+        return all(
+            str(row.get(column)) == value[3:]
+            for column, value in params.multi_items() if value.startswith("eq.")
+        )
+
+    def _table(self, request: httpx.Request, name: str) -> httpx.Response:
+        table = self.tables[name]
+        rows = [row for row in table if self._matches(row, request.url.params)]
+
+        if request.method == "POST":
+            body = json.loads(request.content)
+            rows = []
+            for values in body if isinstance(body, list) else [body]:
+                keys = request.url.params.get("on_conflict", "id").split(",")
+                existing = next(
+                    (row for row in table if all(row.get(key) == values.get(key) for key in keys)), None
+                ) if "merge-duplicates" in request.headers.get("prefer", "") else None
+                if existing is not None:
+                    existing.update(values)
+                    rows.append(existing)
+                    continue
+                now = datetime.now(timezone.utc).isoformat()
+                row = {"id": str(uuid.uuid4()), "created_at": now, "updated_at": now, **values}
+                table.append(row)
+                rows.append(row)
+            return httpx.Response(201, json=rows)
+        if request.method == "PATCH":
+            for row in rows:
+                row.update(json.loads(request.content))
+        elif request.method == "DELETE":
+            for row in rows:
+                table.remove(row)
+
+        if "vnd.pgrst.object" in request.headers.get("accept", ""):
+            if len(rows) != 1:
+                return httpx.Response(406, json={"code": "PGRST116", "message": f"{len(rows)} rows"})
+            return httpx.Response(200, json=rows[0])
+        return httpx.Response(200, json=rows)
+
+    def _object(self, request: httpx.Request, path: str) -> httpx.Response:
+        if request.method == "DELETE":
+            # Bulk removal: the path is the bucket, the body lists the objects
+            removed = [name for name in json.loads(request.content)["prefixes"] if f"{path}/{name}" in self.objects]
+            for name in removed:
+                del self.objects[f"{path}/{name}"]
+            return httpx.Response(200, json=[{"name": name} for name in removed])
+        if request.method == "GET":
+            if path not in self.objects:
+                return httpx.Response(404, json={"message": "Object not found"})
+            return httpx.Response(200, content=self.objects[path])
+
+        # Multipart form upload: keep the file part
+        message = email.message_from_bytes(
+            f"content-type: {request.headers['content-type']}\r\n\r\n".encode() + request.content
+        )
+        for part in message.walk():
+            if part.get_filename():
+                self.objects[path] = part.get_payload(decode=True)
+        return httpx.Response(200, json={"Key": path})
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    """Serve the application's Supabase clients (sync and async) from a ``FakeSupabase``."""
+    from supabase import AsyncClient, AsyncClientOptions, Client, ClientOptions
+
+    import app.db.client as db_client
+
+    fake = FakeSupabase()
+    transport = httpx.MockTransport(fake.handle)
+    url, key = os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"]
+
+    monkeypatch.setattr(db_client, "_supabase_client", Client(
+        url, key, ClientOptions(httpx_client=httpx.Client(transport=transport))
+    ))
+    monkeypatch.setattr(db_client, "_async_supabase_client", AsyncClient(
+        url, key, AsyncClientOptions(httpx_client=httpx.AsyncClient(transport=transport))
+    ))
+    return fake
+
+@pytest.fixture
+def auth_headers():
+    """Authorization header of a signed-in test user (ID ``user-1``)."""
+    from app.core.security import create_access_token
+
+    token = create_access_token({
+        "sub": "student@example.com", "user_id": "user-1", "email": "student@example.com", "full_name": "Student"
+    })
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,41 @@
+import asyncio
+
+from app.db.client import async_supabase
+from app.services.answer_cache import CachedAnswer, get_answer_cache
+from app.services.chat import load_chat_context
+from app.services.embeddings import embed_chunks, get_embedding_cache, get_embedding_provider
+from app.services.vector_index import get_vector_index
+
+MATERIAL = ["La ecuación de Nernst relaciona el potencial de membrana con las concentraciones iónicas."]
+
+def _load(question):
+    return asyncio.run(load_chat_context(async_supabase(), "mentor-cache", "user-1", question))
+
+def test_answer_cache_is_only_used_for_opening_questions(fake_supabase):
+    """A follow-up depends on its conversation, so it never replays an answer cached for another."""
+    fake_supabase.tables["mentors"].append({
+        "id": "mentor-cache", "user_id": "user-1", "name": "Fisiología", "expertise": "Medicina",
+        "created_at": "2026-01-01T00:00:00+00:00", "updated_at": None,
+    })
+    get_vector_index("mentor-cache").add(
+        "resource-1", MATERIAL, embed_chunks(MATERIAL, get_embedding_provider(), get_embedding_cache()).vectors
+    )
+
+    # The opening question is looked up, so its answer can be stored
+    context = _load("dame un ejemplo")
+    assert context.query is not None and context.cached is None
+    get_answer_cache().store("mentor-cache", context.version, context.query, CachedAnswer(
+        question="dame un ejemplo", answer="Un ejemplo de la ecuación de Nernst...", sources=context.sources,
+        completion_tokens=10, prompt_tokens=100,
+    ))
+    assert _load("dame un ejemplo").cached is not None
+
+    # The same words later in a conversation are neither looked up nor stored
+    fake_supabase.tables["chat_messages"].extend([
+        {"mentor_id": "mentor-cache", "user_id": "user-1", "role": "user",
+         "content": "¿Qué es la fotosíntesis?", "created_at": "2026-01-01T00:00:00+00:00"},
+        {"mentor_id": "mentor-cache", "user_id": "user-1", "role": "assistant",
+         "content": "Es el proceso...", "created_at": "2026-01-01T00:00:01+00:00"},
+    ])
+    context = _load("dame un ejemplo")
+    assert context.history and context.cached is None and context.query is None
@@ -0,0 +1,39 @@
+import asyncio
+
+import app.services.chat as chat_service
+
+def _run(monkeypatch, mentor):
+    events = []
+
+    async def get_mentor_by_id(client, mentor_id, user_id):
+        events.append("mentor")
+        return mentor
+
+    async def get_chat_history(client, mentor_id, user_id, limit):
+        events.append("history started")
+        await asyncio.sleep(0.05)
+        events.append("history loaded")
+        return []
+
+    async def retrieve_sources(mentor_id, question, k):
+        events.append("retrieval started")
+        return None, (0, 0), []
+
+    monkeypatch.setattr(chat_service, "get_mentor_by_id", get_mentor_by_id)
+    monkeypatch.setattr(chat_service, "get_chat_history", get_chat_history)
+    monkeypatch.setattr(chat_service, "retrieve_sources", retrieve_sources)
+
+    context = asyncio.run(chat_service.load_chat_context(None, "mentor-1", "user-1", "¿Qué es la mitosis?"))
+    return context, events
+
+def test_retrieval_overlaps_the_history_load(monkeypatch):
+    context, events = _run(monkeypatch, mentor=object())
+
+    assert context is not None
+    assert events.index("retrieval started") < events.index("history loaded")
+
+def test_foreign_mentor_is_never_retrieved_from(monkeypatch):
+    context, events = _run(monkeypatch, mentor=None)
+
+    assert context is None
+    assert "retrieval started" not in events and "history loaded" not in events
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.vector_index import get_vector_index
+
+NOTES = "\n\n".join(
+    f"Tema {number}: la fotosíntesis convierte la luz en energía química en los cloroplastos. "
+    f"La ecuación de Nernst relaciona el potencial con las concentraciones ({number})."
+    for number in range(40)
+).encode()
+
+def test_uploaded_file_is_processed_to_analyzed(fake_supabase, auth_headers):
+    """With eager workers, an upload runs download, extraction, embedding and indexing."""
+    fake_supabase.tables["mentors"].append({
+        "id": "mentor-1", "user_id": "user-1", "name": "Biología", "expertise": "Ciencias",
+        "created_at": "2026-01-01T00:00:00+00:00", "updated_at": None,
+    })
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/resources/upload",
+            headers=auth_headers,
+            data={"mentor_id": "mentor-1"},
+            files={"file": ("apuntes.txt", NOTES, "text/plain")},
+        )
+
+    assert response.status_code == 201, response.text
+    resource_id = response.json()["id"]
+
+    # The API answered with the PENDING record; the eager worker finished it
+    assert response.json()["status"] == "pending"
+    [resource] = fake_supabase.tables["resources"]
+    assert resource["status"] == "analyzed"
+    assert list(fake_supabase.objects.values()) == [NOTES]
+
+    chunks = get_vector_index("mentor-1").resource_chunks(resource_id)
+    assert chunks and "Nernst" in chunks[0]
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import workers.quiz as quiz_worker
+from app.core.config import settings
+from app.schemas.quiz import QuizDifficulty
+from app.services.quiz import resource_set_hash, resource_versions
+
+class FailingGenerator:
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, text, difficulty, count):
+        self.calls += 1
+        raise RuntimeError("model unavailable")
+
+def test_failed_generation_is_retried_a_bounded_number_of_times(fake_supabase, monkeypatch):
+    """A persistently failing model is called a bounded number of times, not on every quiz request."""
+    fake_supabase.tables["resources"].append({
+        "id": "resource-1", "mentor_id": "mentor-1", "name": "Apuntes", "type": "text", "url": "",
+        "status": "analyzed", "created_at": "2026-01-01T00:00:00+00:00", "updated_at": None,
+    })
+    generator = FailingGenerator()
+    monkeypatch.setattr(quiz_worker, "get_question_generator", lambda: generator)
+    monkeypatch.setattr(quiz_worker, "get_vector_index", lambda mentor_id: SimpleNamespace(
+        resource_chunks=lambda resource_id: ["La fotosíntesis ocurre en los cloroplastos."]
+    ))
+    monkeypatch.setattr(settings, "quiz_generation_max_retries", 2)
+
+    # Background jobs run eagerly, so the delayed retries run inline
+    assert quiz_worker.refresh_quiz_pool("mentor-1") == 0
+    assert generator.calls == 3 * len(QuizDifficulty)
+
+    # The pool is recorded as refreshed, so quiz requests stop enqueueing refreshes
+    [pool] = fake_supabase.tables["quiz_pools"]
+    assert pool["resource_hash"] == resource_set_hash(resource_versions(fake_supabase.tables["resources"]))
+    assert quiz_worker.refresh_quiz_pool("mentor-1") == 0
+    assert generator.calls == 3 * len(QuizDifficulty)
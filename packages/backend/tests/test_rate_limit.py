@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.v1.endpoints.resources as resources_endpoint
+import app.core.ratelimit as ratelimit
+from app.core.ratelimit import BucketPolicy, MemoryRateLimitBackend, RateLimiter
+from app.main import app
+
+BOUNDARY = "upload-boundary"
+
+@pytest.fixture
+def client(fake_supabase, monkeypatch):
+    """API client whose user may upload 3 files (no refill); background jobs are not run."""
+    fake_supabase.tables["mentors"].append({
+        "id": "mentor-1", "user_id": "user-1", "name": "Historia", "expertise": "Historia",
+        "created_at": "2026-01-01T00:00:00+00:00", "updated_at": None,
+    })
+    for name in ("enqueue_resource", "enqueue_resources"):
+        monkeypatch.setattr(resources_endpoint, name, lambda *args: None)
+    monkeypatch.setattr(ratelimit, "_rate_limiter", RateLimiter(MemoryRateLimitBackend(100), {
+        "api": BucketPolicy(rate=1e-9, burst=100),
+        "upload": BucketPolicy(rate=1e-9, burst=3),
+        "chat": BucketPolicy(rate=1e-9, burst=100),
+    }))
+
+    with TestClient(app) as client:
+        yield client
+
+def _upload(client, auth_headers, received):
+    """Upload a file through a streamed body, recording the parts the server pulled."""
+    def body():
+        for part in (
+            f'--{BOUNDARY}\r\ncontent-disposition: form-data; name="mentor_id"\r\n\r\nmentor-1\r\n',
+            f'--{BOUNDARY}\r\ncontent-disposition: form-data; name="file"; filename="a.txt"\r\n'
+            "content-type: text/plain\r\n\r\nApuntes\r\n",
+            f"--{BOUNDARY}--\r\n",
+        ):
+            received.append(part)
+            yield part.encode()
+
+    return client.post(
+        "/api/v1/resources/upload",
+        headers={**auth_headers, "content-type": f"multipart/form-data; boundary={BOUNDARY}"},
+        content=body(),
+    )
+
+def test_upload_is_limited_before_the_body_is_read(client, auth_headers):
+    for _ in range(3):
+        assert _upload(client, auth_headers, []).status_code == 201
+
+    received = []
+    response = _upload(client, auth_headers, received)
+
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
+    assert received == []
+
+def test_batch_upload_is_charged_per_file(client, auth_headers):
+    files = [("files", (f"{number}.txt", b"Apuntes", "text/plain")) for number in range(2)]
+
+    response = client.post(
+        "/api/v1/resources/upload/batch", headers=auth_headers, data={"mentor_id": "mentor-1"}, files=files
+    )
+    assert response.status_code == 200, response.text
+
+    # One token is left: it covers the second batch's first file, not its second
+    response = client.post(
+        "/api/v1/resources/upload/batch", headers=auth_headers, data={"mentor_id": "mentor-1"}, files=files
+    )
+    assert response.status_code == 429
@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+import app.api.v1.endpoints.resources as resources_endpoint
+from app.main import app
+
+VICTIM_OBJECT = "resources/user-2/mentor-2/apuntes.pdf"
+
+def test_deleting_resources_only_removes_the_owners_uploads(fake_supabase, auth_headers, monkeypatch):
+    """A URL naming another user's file never gets that file removed (cleanup runs eagerly)."""
+    for user_id, mentor_id in (("user-1", "mentor-1"), ("user-2", "mentor-2")):
+        fake_supabase.tables["mentors"].append({
+            "id": mentor_id, "user_id": user_id, "name": "Historia", "expertise": "Historia",
+            "created_at": "2026-01-01T00:00:00+00:00", "updated_at": None,
+        })
+    fake_supabase.objects[VICTIM_OBJECT] = b"%PDF-1.4"
+    monkeypatch.setattr(resources_endpoint, "enqueue_resource", lambda *args: None)
+
+    with TestClient(app) as client:
+        uploaded = client.post(
+            "/api/v1/resources/upload", headers=auth_headers, data={"mentor_id": "mentor-1"},
+            files={"file": ("notas.txt", b"Apuntes", "text/plain")},
+        ).json()
+        crafted = client.post("/api/v1/resources/url", headers=auth_headers, data={
+            "mentor_id": "mentor-1", "name": "Ajeno",
+            "url": f"https://test.supabase.co/storage/v1/object/public/{VICTIM_OBJECT}",
+        }).json()
+        assert "storage_path" not in uploaded
+
+        response = client.post(
+            "/api/v1/resources/delete", headers=auth_headers, json={"resource_ids": [uploaded["id"], crafted["id"]]}
+        )
+
+    assert response.status_code == 200, response.text
+    assert list(fake_supabase.objects) == [VICTIM_OBJECT]
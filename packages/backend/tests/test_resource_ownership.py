@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.v1.endpoints.resources as resources_endpoint
+from app.main import app
+
+@pytest.fixture
+def client(fake_supabase, monkeypatch):
+    """API client with one mentor per user; background jobs are not run."""
+    for user_id, mentor_id in (("user-1", "mentor-1"), ("user-2", "mentor-2")):
+        fake_supabase.tables["mentors"].append({
+            "id": mentor_id, "user_id": user_id, "name": "Historia", "expertise": "Historia",
+            "created_at": "2026-01-01T00:00:00+00:00", "updated_at": None,
+        })
+    for name in ("enqueue_resource", "enqueue_resources", "enqueue_resource_cleanup"):
+        monkeypatch.setattr(resources_endpoint, name, lambda *args: None)
+
+    with TestClient(app) as client:
+        yield client
+
+def _rest_calls(fake_supabase):
+    return [call for call in fake_supabase.calls if call[1].startswith("/rest/v1/")]
+
+def _create(client, auth_headers, mentor_id="mentor-1"):
+    return client.post(
+        "/api/v1/resources/url",
+        headers=auth_headers,
+        data={"mentor_id": mentor_id, "url": "https://youtu.be/abc", "name": "Clase 1"},
+    )
+
+def test_create_is_one_round_trip(client, fake_supabase, auth_headers):
+    response = _create(client, auth_headers)
+
+    assert response.status_code == 201, response.text
+    assert _rest_calls(fake_supabase) == [("POST", "/rest/v1/rpc/create_resource_for_user")]
+
+def test_create_in_foreign_mentor_is_rejected_in_the_same_call(client, fake_supabase, auth_headers):
+    response = _create(client, auth_headers, mentor_id="mentor-2")
+
+    assert response.status_code >= 400
+    assert _rest_calls(fake_supabase) == [("POST", "/rest/v1/rpc/create_resource_for_user")]
+    assert fake_supabase.tables["resources"] == []
+
+def test_delete_is_one_round_trip(client, fake_supabase, auth_headers):
+    resource_id = _create(client, auth_headers).json()["id"]
+    fake_supabase.calls.clear()
+
+    response = client.delete(f"/api/v1/resources/{resource_id}", headers=auth_headers)
+
+    assert response.status_code == 204, response.text
+    assert _rest_calls(fake_supabase) == [("POST", "/rest/v1/rpc/delete_resource_for_user")]
+    assert fake_supabase.tables["resources"] == []
+
+def test_delete_of_foreign_resource_is_not_found_in_the_same_call(client, fake_supabase, auth_headers):
+    fake_supabase.tables["resources"].append({
+        "id": "resource-2", "mentor_id": "mentor-2", "name": "Ajena", "type": "text",
+        "url": "https://example.com", "status": "analyzed",
+        "created_at": "2026-01-01T00:00:00+00:00", "updated_at": None,
+    })
+
+    response = client.delete("/api/v1/resources/resource-2", headers=auth_headers)
+
+    assert response.status_code == 404
+    assert _rest_calls(fake_supabase) == [("POST", "/rest/v1/rpc/delete_resource_for_user")]
+    assert len(fake_supabase.tables["resources"]) == 1
+
+def test_bulk_delete_is_one_round_trip(client, fake_supabase, auth_headers):
+    resource_ids = [_create(client, auth_headers).json()["id"] for _ in range(3)]
+    fake_supabase.calls.clear()
+
+    response = client.post(
+        "/api/v1/resources/delete", headers=auth_headers, json={"resource_ids": resource_ids + ["missing"]}
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"deleted": resource_ids, "not_found": ["missing"]}
+    assert _rest_calls(fake_supabase) == [("POST", "/rest/v1/rpc/delete_resources_for_user")]
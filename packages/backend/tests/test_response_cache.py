@@ -0,0 +1,44 @@
+import asyncio
+
+import fakeredis
+import fakeredis.aioredis
+from pydantic import BaseModel
+
+from app.services.cache import MemoryCacheBackend, RedisCacheBackend, ResponseCache, TieredCacheBackend
+
+class Listing(BaseModel):
+    names: list
+
+def _process_cache(server) -> ResponseCache:
+    """The response cache of one API worker, sharing a Redis server with the others."""
+    # Redis clients connect lazily, so the URL is never dialled
+    shared = RedisCacheBackend("redis://localhost:6379/0", generation_ttl=3600)
+    shared._client = fakeredis.aioredis.FakeRedis(server=server)
+    shared._sync_client = fakeredis.FakeRedis(server=server)
+    return ResponseCache(TieredCacheBackend(shared, MemoryCacheBackend(100), local_ttl=30), ttl=60, backend_name="redis")
+
+def test_local_tier_serves_warm_reads_and_sees_other_processes_invalidations():
+    server = fakeredis.FakeServer()
+    api_worker, other_worker = _process_cache(server), _process_cache(server)
+    loads = []
+
+    def read(cache):
+        async def load():
+            loads.append(1)
+            return Listing(names=[f"version {len(loads)}"])
+
+        return asyncio.run(cache.get_or_load(["mentor:1:resources"], "resources:1", Listing, load))
+
+    assert read(api_worker).names == ["version 1"]
+    assert read(api_worker).names == ["version 1"]
+    assert api_worker.stats()["local_hits"] == 1
+
+    # Another worker finds the entry in Redis, then in its own tier
+    assert read(other_worker).names == ["version 1"]
+    assert read(other_worker).names == ["version 1"]
+    assert other_worker.stats()["local_hits"] == 1 and len(loads) == 1
+
+    # A background job invalidates through Redis; neither local copy is served again
+    other_worker.invalidate_sync("mentor:1:resources")
+    assert read(api_worker).names == ["version 2"]
+    assert read(other_worker).names == ["version 2"]
@@ -0,0 +1,6 @@
+from benchmarks.bench_startup import COLD_START_BUDGET_MS, run
+
+def test_cold_start_within_budget():
+    """The first /health response of a fresh API process arrives within the cold-start budget."""
+    results = run(starts=3)
+    assert results["time_to_first_health_ms"] <= COLD_START_BUDGET_MS, results
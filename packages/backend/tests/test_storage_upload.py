@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import tracemalloc
+
+import httpx
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.services.storage import upload_file_to_storage
+
+UPLOAD_URL = "https://test.supabase.co/storage/v1/upload/resumable/upload-1"
+
+class FakeTusServer(httpx.AsyncBaseTransport):
+    """
+    Supabase's resumable (TUS) upload endpoint, keeping only a digest.
+
+    Request bodies are consumed as they stream in, so the memory measured
+    in a test is the client's. ``fail_at`` lists chunk numbers whose
+    request fails after the server persisted half of it.
+    """
+
+    def __init__(self, fail_at=()):
+        self.fail_at = set(fail_at)
+        self.length = 0
+        self.offset = 0
+        self.digest = hashlib.sha256()
+        self.patches = 0
+        self.heads = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST" and request.url.path.endswith("/upload/resumable"):
+            self.length = int(request.headers["upload-length"])
+            return httpx.Response(201, headers={"location": UPLOAD_URL})
+
+        if request.method == "HEAD" and str(request.url) == UPLOAD_URL:
+            self.heads += 1
+            return httpx.Response(200, headers={"upload-offset": str(self.offset)})
+
+        if request.method == "PATCH" and str(request.url) == UPLOAD_URL:
+            assert int(request.headers["upload-offset"]) == self.offset
+            self.patches += 1
+            failing = self.patches in self.fail_at
+            keep = int(request.headers["content-length"]) // 2 if failing else None
+
+            async for part in request.stream:
+                if keep is not None:
+                    part = part[:max(0, keep)]
+                    keep -= len(part)
+                self.digest.update(part)
+                self.offset += len(part)
+
+            if failing:
+                return httpx.Response(500)
+            return httpx.Response(204, headers={"upload-offset": str(self.offset)})
+
+        return httpx.Response(404)
+
+def _write_file(path, size: int) -> str:
+    """Write ``size`` bytes of varied content and return their SHA-256."""
+    digest = hashlib.sha256()
+    block = bytes(range(256)) * 4096  # 1 MiB
+    with open(path, "wb") as file:
+        for number in range(size // len(block)):
+            data = number.to_bytes(8, "big") + block[8:]
+            file.write(data)
+            digest.update(data)
+    return digest.hexdigest()
+
+def _upload(client, path, size: int) -> int:
+    async def upload() -> int:
+        with open(path, "rb") as file:
+            upload_file = UploadFile(
+                file, size=size, filename="big.pdf", headers=Headers({"content-type": "application/pdf"})
+            )
+            return await upload_file_to_storage(client, "u1/m1/big.pdf", upload_file, "application/pdf")
+
+    return asyncio.run(upload())
+
+def test_large_upload_memory_bounded_by_chunk_size(tmp_path, make_supabase_client):
+    """A multi-hundred-MB file is streamed with memory bounded by one chunk."""
+    size = 300 * 1024 * 1024
+    path = tmp_path / "big.pdf"
+    expected = _write_file(path, size)
+    server = FakeTusServer()
+    client = make_supabase_client(server)
+
+    tracemalloc.start()
+    try:
+        uploaded = _upload(client, path, size)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    chunk_size = settings.storage_upload_chunk_size
+    assert uploaded == size
+    assert server.length == size and server.offset == size
+    assert server.patches == -(-size // chunk_size)
+    assert server.digest.hexdigest() == expected
+    assert peak < 2 * chunk_size, f"peak traced memory {peak} bytes"
+
+def test_upload_resumes_from_server_offset_after_failure(tmp_path, make_supabase_client):
+    """A failed chunk is resumed from the offset the server reports (HEAD)."""
+    size = 20 * 1024 * 1024
+    path = tmp_path / "big.pdf"
+    expected = _write_file(path, size)
+    server = FakeTusServer(fail_at={2, 3})
+    client = make_supabase_client(server)
+
+    uploaded = _upload(client, path, size)
+
+    assert uploaded == size
+    assert server.heads == 2
+    assert server.offset == size
+    # Every byte arrived exactly once, in order
+    assert server.digest.hexdigest() == expected
@@ -0,0 +1,83 @@
+import functools
+import socket
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app.services.url_fetch as url_fetch
+import workers.tasks as tasks
+from app.core.config import settings
+from app.main import app
+
+ADDRESSES = {"public.example": "93.184.216.34", "internal.example": "10.0.0.5", "metadata.example": "169.254.169.254"}
+
+def _handle(request: httpx.Request) -> httpx.Response:
+    assert request.url.host in ADDRESSES.values(), "requests go to the checked address"
+    path = request.url.path
+    if path == "/notes.txt":
+        return httpx.Response(200, content=b"Apuntes de clase", headers={"content-type": "text/plain"})
+    if path == "/to-internal":
+        return httpx.Response(302, headers={"location": "http://internal.example/secret"})
+    if path == "/big":
+        return httpx.Response(200, content=iter([b"x" * 1024] * 64))
+    return httpx.Response(404)
+
+@pytest.fixture
+def fake_internet(monkeypatch):
+    """Name resolution from ``ADDRESSES`` and HTTP served by ``_handle``."""
+    resolve = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host not in ADDRESSES:
+            # IP literals resolve to themselves; other names are unknown
+            return resolve(host, port, *args, flags=socket.AI_NUMERICHOST, **kwargs)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (ADDRESSES[host], port))]
+
+    monkeypatch.setattr(url_fetch.socket, "getaddrinfo", getaddrinfo)
+    monkeypatch.setattr(url_fetch.httpx, "Client", functools.partial(httpx.Client, transport=httpx.MockTransport(_handle)))
+
+def test_public_url_is_fetched(fake_internet):
+    assert url_fetch.fetch_url("http://public.example/notes.txt") == b"Apuntes de clase"
+
+@pytest.mark.parametrize("url", [
+    "file:///etc/passwd",
+    "http://127.0.0.1/",
+    "http://[::1]/",
+    "http://internal.example/secret",
+    "http://metadata.example/latest/meta-data/",
+    "http://public.example/to-internal",
+])
+def test_non_public_urls_are_refused(fake_internet, url):
+    with pytest.raises(ValueError):
+        url_fetch.fetch_url(url)
+
+def test_download_size_is_capped(fake_internet, monkeypatch):
+    monkeypatch.setattr(settings, "url_fetch_max_bytes", 16 * 1024)
+
+    with pytest.raises(ValueError, match="byte limit"):
+        url_fetch.fetch_url("http://public.example/big")
+
+def test_url_resource_never_reads_the_bucket(fake_supabase, auth_headers, monkeypatch):
+    """A URL naming another user's stored file is fetched as a URL (here refused), not read with the service key."""
+    fake_supabase.tables["mentors"].append({
+        "id": "mentor-1", "user_id": "user-1", "name": "Historia", "expertise": "Historia",
+        "created_at": "2026-01-01T00:00:00+00:00", "updated_at": None,
+    })
+    fake_supabase.objects["resources/user-2/mentor-2/apuntes.txt"] = b"Apuntes ajenos"
+
+    def refuse(url):
+        raise ValueError("not allowed")
+
+    monkeypatch.setattr(tasks, "fetch_url", refuse)
+
+    with TestClient(app) as client:
+        response = client.post("/api/v1/resources/url", headers=auth_headers, data={
+            "mentor_id": "mentor-1", "name": "Ajeno",
+            "url": "https://test.supabase.co/storage/v1/object/public/resources/user-2/mentor-2/apuntes.txt",
+        })
+
+    assert response.status_code == 201, response.text
+    [resource] = fake_supabase.tables["resources"]
+    assert resource["status"] == "error"
+    assert not [call for call in fake_supabase.calls if call[1].startswith("/storage/")]
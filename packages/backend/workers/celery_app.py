@@ -0,0 +1,49 @@
+import os
+from celery import Celery
+from app.core.config import settings
+from workers.enqueue import check_broker_configured
+
+# Use Redis; Celery's in-memory broker is only acceptable in eager mode
+# (tests, local runs), where tasks never leave the process
+check_broker_configured()
+broker_url = settings.redis_url or "memory://"
+result_backend = settings.redis_url or "cache+memory://"
+
+celery_app = Celery(
+    "mentoria",
+    broker=broker_url,
+    backend=result_backend,
+    include=["workers.tasks", "workers.storage_gc", "workers.quiz", "workers.flashcards"]
+)
+
+celery_app.conf.update(
+    # Extraction is CPU-bound: run it in a pool of worker processes
+    worker_pool="prefork",
+    worker_concurrency=settings.worker_concurrency or os.cpu_count() or 1,
+    # Recycle children periodically to bound memory used by PDF parsing
+    worker_max_tasks_per_child=100,
+    # Long tasks: fetch one at a time and only ack once finished, so a
+    # crashed worker's resource is redelivered instead of lost
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # Run tasks inline (no broker round trip) when enabled, e.g. in tests
+    task_always_eager=settings.worker_eager,
+    task_eager_propagates=settings.worker_eager,
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    result_expires=3600,
+    # Periodically pick up resources that were never enqueued or got stuck
+    beat_schedule={
+        "enqueue-pending-resources": {
+            "task": "workers.tasks.enqueue_pending_resources",
+            "schedule": float(settings.pending_sweep_interval_seconds),
+        },
+        # Reclaim storage left behind by deleted resources and mentors
+        "collect-storage-garbage": {
+            "task": "workers.storage_gc.collect_storage_garbage",
+            "schedule": float(settings.storage_gc_interval_seconds),
+        },
+    },
+)
@@ -0,0 +1,114 @@
+"""
+Enqueue background jobs from the API.
+
+Kept separate from the task modules so the API does not import Celery
+and the ingestion pipeline at startup: the task modules are imported on
+the first enqueue. Failing to reach the broker is never fatal; the
+periodic sweeps pick up whatever was not enqueued.
+
+Publishing is blocking network I/O (with retries when the broker is slow
+or down), so async request handlers call these helpers through
+``asyncio.to_thread`` instead of on the event loop.
+"""
+import logging
+from typing import List, Optional
+
+from app.core.config import settings
+from app.schemas.resource import Resource
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+def check_broker_configured() -> None:
+    """
+    Make sure enqueued jobs can reach a worker.
+
+    Without ``REDIS_URL``, Celery would publish to an in-process memory
+    broker that no worker ever consumes, and every resource would sit
+    PENDING. Only eager mode (``WORKER_EAGER``, for tests and local runs)
+    works without a broker.
+
+    Raises:
+        RuntimeError: If neither a broker nor eager mode is configured
+    """
+    if not settings.redis_url and not settings.worker_eager:
+        raise RuntimeError(
+            "REDIS_URL is not set, so background jobs would never reach a worker. "
+            "Set REDIS_URL, or WORKER_EAGER=true to run jobs inline (tests and local runs only)."
+        )
+
+def enqueue_resource(resource_id: str) -> None:
+    """
+    Enqueue a newly created resource for processing.
+
+    If the broker is unreachable the resource stays PENDING and the
+    periodic sweep will pick it up.
+    """
+    enqueue_resources([resource_id])
+
+def enqueue_resources(resource_ids: List[str]) -> None:
+    """Enqueue several newly created resources for processing."""
+    for resource_id in resource_ids:
+        try:
+            from workers.tasks import process_resource
+
+            process_resource.delay(resource_id)
+        except Exception as e:
+            logger.warning(f"Could not enqueue resource {resource_id}, leaving it for the sweep: {str(e)}")
+
+def enqueue_resource_cleanup(user_id: str, resources: List[Resource]) -> None:
+    """
+    Schedule cleanup of deleted resources of a user.
+
+    If the broker is unreachable the periodic storage sweep will collect
+    the files later.
+    """
+    try:
+        from workers.storage_gc import cleanup_deleted_resources
+
+        cleanup_deleted_resources.delay([
+            {"id": resource.id, "mentor_id": resource.mentor_id, "user_id": user_id, "storage_path": resource.storage_path}
+            for resource in resources
+        ])
+    except Exception as e:
+        logger.warning(f"Could not enqueue cleanup of {len(resources)} resources, leaving it for the sweep: {str(e)}")
+
+def enqueue_mentor_cleanup(user_id: str, mentor_id: str) -> None:
+    """
+    Schedule cleanup of a deleted mentor.
+
+    If the broker is unreachable the periodic storage sweep will collect
+    the files later.
+    """
+    try:
+        from workers.storage_gc import cleanup_deleted_mentor
+
+        cleanup_deleted_mentor.delay(user_id, mentor_id)
+    except Exception as e:
+        logger.warning(f"Could not enqueue cleanup of mentor {mentor_id}, leaving it for the sweep: {str(e)}")
+
+def enqueue_quiz_refresh(mentor_id: str) -> None:
+    """
+    Schedule a refresh of a mentor's quiz question pool.
+
+    If the broker is unreachable the pool stays stale, and a later quiz
+    request enqueues the refresh again.
+    """
+    try:
+        from workers.quiz import refresh_quiz_pool
+
+        refresh_quiz_pool.delay(mentor_id)
+    except Exception as e:
+        logger.warning(f"Could not enqueue quiz pool refresh of mentor {mentor_id}: {str(e)}")
+
+def enqueue_flashcard_generation(user_id: str, mentor_id: str, resource_id: Optional[str], card_count: int) -> None:
+    """
+    Schedule generation of a batch of flashcards.
+
+    Raises:
+        Exception: If the broker is unreachable (the request has nothing
+        to fall back on, so the caller must report it)
+    """
+    from workers.flashcards import generate_flashcards
+
+    generate_flashcards.delay(user_id, mentor_id, resource_id, card_count)
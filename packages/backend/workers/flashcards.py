@@ -0,0 +1,72 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.db.client import supabase
+from app.schemas.resource import ResourceStatus
+from app.services.cache import get_response_cache, user_flashcards_scope
+from app.services.flashcards import get_card_generator, split_card_count
+from app.services.quiz import source_text
+from app.services.vector_index import get_vector_index
+from workers.celery_app import celery_app
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+@celery_app.task(name="workers.flashcards.generate_flashcards")
+def generate_flashcards(user_id: str, mentor_id: str, resource_id: Optional[str], card_count: int) -> int:
+    """
+    Generate a batch of flashcards from a mentor's analyzed resources.
+
+    The cards are spread evenly over the resources (or all taken from
+    ``resource_id``), each resource's share is written by one generation
+    request, and all cards are stored with a single insert. New cards are
+    due immediately.
+
+    Args:
+        user_id: ID of the user the cards are for
+        mentor_id: ID of the mentor whose resources to use
+        resource_id: Only use this resource (None for every analyzed resource)
+        card_count: Number of cards wanted
+
+    Returns:
+        int: Number of cards created
+    """
+    client = supabase()
+
+    query = client.table("resources").select("id").eq("mentor_id", mentor_id).eq("status", ResourceStatus.ANALYZED.value)
+    if resource_id is not None:
+        query = query.eq("id", resource_id)
+    resources = query.order("created_at").execute()
+
+    index = get_vector_index(mentor_id)
+    sources = [
+        (row["id"], chunks)
+        for row in resources.data
+        if (chunks := index.resource_chunks(row["id"]))
+    ][:card_count]
+    if not sources:
+        logger.info(f"No analyzed material to generate flashcards for mentor {mentor_id}")
+        return 0
+
+    generator = get_card_generator()
+    rows: List[Dict[str, Any]] = []
+    for (source_id, chunks), count in zip(sources, split_card_count(card_count, len(sources))):
+        try:
+            cards = generator.generate(source_text(chunks, settings.flashcard_source_max_chars), count)
+        except Exception as e:
+            logger.error(f"Failed to generate flashcards for resource {source_id}: {str(e)}")
+            continue
+
+        rows.extend(
+            {"user_id": user_id, "mentor_id": mentor_id, "resource_id": source_id, "front": card.front, "back": card.back}
+            for card in cards
+        )
+
+    if rows:
+        client.table("flashcards").insert(rows).execute()
+        # Due queues of the user reload and pick up the new cards
+        get_response_cache().invalidate_sync(user_flashcards_scope(user_id))
+
+    logger.info(f"Generated {len(rows)} flashcards for mentor {mentor_id}")
+    return len(rows)
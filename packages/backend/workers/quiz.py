@@ -0,0 +1,152 @@
+import logging
+from datetime import datetime
+from typing import Set, Tuple
+from supabase import Client
+
+from app.core.config import settings
+from app.db.client import supabase
+from app.schemas.quiz import MAX_QUIZ_QUESTIONS, QuizDifficulty
+from app.schemas.resource import ResourceStatus
+from app.services.cache import get_response_cache, mentor_quiz_scope
+from app.services.quiz import get_question_generator, resource_set_hash, resource_versions, source_text
+from app.services.vector_index import get_vector_index
+from workers.celery_app import celery_app
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+# Rows per PostgREST page when listing pooled question sets
+PAGE_SIZE = 1000
+
+def _pooled_sets(client: Client, mentor_id: str) -> Set[Tuple[str, str, str]]:
+    """
+    (resource_id, resource_version, difficulty) of every question set in a pool.
+
+    Each generated set has a question at position 0, so only those rows
+    are read.
+    """
+    sets: Set[Tuple[str, str, str]] = set()
+    offset = 0
+    while True:
+        response = client.table("quiz_questions").select(
+            "resource_id, resource_version, difficulty"
+        ).eq("mentor_id", mentor_id).eq("position", 0).order("id").range(offset, offset + PAGE_SIZE - 1).execute()
+
+        sets.update((row["resource_id"], row["resource_version"], row["difficulty"]) for row in response.data)
+        if len(response.data) < PAGE_SIZE:
+            return sets
+        offset += PAGE_SIZE
+
+@celery_app.task(name="workers.quiz.refresh_quiz_pool")
+def refresh_quiz_pool(mentor_id: str, attempt: int = 0) -> int:
+    """
+    Bring a mentor's quiz question pool up to date with its analyzed resources.
+
+    Does nothing if the pool was already refreshed for the current
+    resource set. Otherwise only resource versions without questions get
+    new ones (one generation request per difficulty), and questions of
+    removed or re-processed resources are dropped.
+
+    The pool is recorded as refreshed even if a generation fails, so quiz
+    requests do not enqueue refresh after refresh (each calling the model
+    again). The failed sets are instead retried by a delayed refresh with
+    exponential backoff, up to ``quiz_generation_max_retries`` times; after
+    that they wait for the next change to the mentor's resources.
+
+    Args:
+        mentor_id: ID of the mentor whose pool to refresh
+        attempt: Number of retries of failed generations before this one
+
+    Returns:
+        int: Number of questions generated
+    """
+    client = supabase()
+
+    resources = client.table("resources").select("id, created_at, updated_at").eq(
+        "mentor_id", mentor_id
+    ).eq("status", ResourceStatus.ANALYZED.value).execute()
+    versions = resource_versions(resources.data)
+    resource_hash = resource_set_hash(versions)
+
+    pool = client.table("quiz_pools").select("resource_hash").eq("mentor_id", mentor_id).execute()
+    if not attempt and pool.data and pool.data[0]["resource_hash"] == resource_hash:
+        return 0
+
+    pooled = _pooled_sets(client, mentor_id)
+
+    # Questions of deleted resources go with them (on delete cascade);
+    # drop those of resources that were re-processed or are no longer analyzed
+    outdated = {(resource_id, version) for resource_id, version, _ in pooled if versions.get(resource_id) != version}
+    for resource_id, version in outdated:
+        client.table("quiz_questions").delete().eq("resource_id", resource_id).eq("resource_version", version).execute()
+
+    generator = get_question_generator()
+    index = get_vector_index(mentor_id)
+    generated = 0
+    failed = False
+
+    for resource_id, version in versions.items():
+        missing = [
+            difficulty for difficulty in QuizDifficulty
+            if (resource_id, version, difficulty.value) not in pooled
+        ]
+        if not missing:
+            continue
+
+        chunks = index.resource_chunks(resource_id)
+        if not chunks:
+            # Nothing to ask about (e.g. a YouTube link)
+            continue
+        text = source_text(chunks, settings.quiz_source_max_chars)
+
+        for difficulty in missing:
+            try:
+                questions = generator.generate(text, difficulty, MAX_QUIZ_QUESTIONS)
+            except Exception as e:
+                logger.error(f"Failed to generate {difficulty.value} quiz questions for resource {resource_id}: {str(e)}")
+                failed = True
+                continue
+
+            rows = [
+                {
+                    "mentor_id": mentor_id,
+                    "resource_id": resource_id,
+                    "resource_version": version,
+                    "difficulty": difficulty.value,
+                    "position": position,
+                    "question": question.question,
+                    "options": question.options,
+                    "answer_index": question.answer_index,
+                    "explanation": question.explanation,
+                }
+                for position, question in enumerate(questions)
+            ]
+            if rows:
+                # A concurrent refresh may have stored the same set; keep its rows
+                client.table("quiz_questions").upsert(
+                    rows, on_conflict="resource_id,resource_version,difficulty,position", ignore_duplicates=True
+                ).execute()
+                generated += len(rows)
+
+    client.table("quiz_pools").upsert({
+        "mentor_id": mentor_id,
+        "resource_hash": resource_hash,
+        "updated_at": datetime.utcnow().isoformat()
+    }, on_conflict="mentor_id").execute()
+
+    if failed and attempt < settings.quiz_generation_max_retries:
+        countdown = settings.quiz_generation_retry_seconds * 2 ** attempt
+        refresh_quiz_pool.apply_async((mentor_id, attempt + 1), countdown=countdown)
+        logger.info(f"Retrying failed quiz generation of mentor {mentor_id} in {countdown}s")
+    elif failed:
+        logger.error(
+            f"Giving up on failed quiz generation of mentor {mentor_id} after {attempt} retries, "
+            f"until its resources change"
+        )
+
+    get_response_cache().invalidate_sync(mentor_quiz_scope(mentor_id))
+    logger.info(
+        f"Refreshed quiz pool of mentor {mentor_id}: {generated} questions generated, "
+        f"{len(outdated)} outdated sets dropped"
+    )
+    return generated
@@ -0,0 +1,198 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Set
+from supabase import Client
+
+from app.core.config import settings
+from app.db.client import supabase
+from app.services.storage import STORAGE_BUCKET, owned_storage_path
+from app.services.vector_index import delete_vector_index, get_vector_index, list_vector_indexes
+from workers.celery_app import celery_app
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+# Maximum entries per storage list call
+LIST_PAGE_SIZE = 1000
+
+def _list_folder(client: Client, path: str) -> Iterator[Dict[str, Any]]:
+    """
+    List every entry directly under a storage folder.
+
+    Files have an ``id``; sub-folders are returned with ``id`` set to None.
+    """
+    offset = 0
+    while True:
+        entries = client.storage.from_(STORAGE_BUCKET).list(path, {
+            "limit": LIST_PAGE_SIZE,
+            "offset": offset,
+            "sortBy": {"column": "name", "order": "asc"}
+        })
+        yield from entries
+        if len(entries) < LIST_PAGE_SIZE:
+            return
+        offset += LIST_PAGE_SIZE
+
+def _created_before(entry: Dict[str, Any], cutoff: datetime) -> bool:
+    """Whether a storage file is older than the cutoff (unknown age counts as new)."""
+    created_at = entry.get("created_at")
+    if not created_at:
+        return False
+    return datetime.fromisoformat(created_at.replace('Z', '+00:00')) < cutoff
+
+def remove_storage_objects(client: Client, paths: List[str]) -> int:
+    """
+    Remove objects from the resources bucket in batches.
+
+    Returns:
+        int: Number of objects requested for removal
+    """
+    batch_size = settings.storage_gc_batch_size
+    for start in range(0, len(paths), batch_size):
+        client.storage.from_(STORAGE_BUCKET).remove(paths[start:start + batch_size])
+    return len(paths)
+
+@celery_app.task(name="workers.storage_gc.cleanup_deleted_resources")
+def cleanup_deleted_resources(resources: List[Dict[str, str]]) -> int:
+    """
+    Remove the stored files and index rows of deleted resources.
+
+    Only recorded upload paths inside the owner's folder for the mentor are
+    removed; resources created from URLs have no stored file.
+
+    Args:
+        resources: ``id``, ``mentor_id``, ``user_id`` (the owner) and
+            ``storage_path`` of each deleted resource
+
+    Returns:
+        int: Number of storage objects removed
+    """
+    client = supabase()
+
+    by_mentor: Dict[str, List[str]] = defaultdict(list)
+    for resource in resources:
+        by_mentor[resource["mentor_id"]].append(resource["id"])
+    for mentor_id, resource_ids in by_mentor.items():
+        get_vector_index(mentor_id).remove_resources(resource_ids)
+
+    paths = [
+        path for path in (
+            owned_storage_path(resource.get("storage_path"), resource.get("user_id", ""), resource["mentor_id"])
+            for resource in resources
+        ) if path
+    ]
+    removed = remove_storage_objects(client, paths)
+    logger.info(f"Cleaned up {len(resources)} deleted resources ({removed} storage objects)")
+    return removed
+
+@celery_app.task(name="workers.storage_gc.cleanup_deleted_mentor")
+def cleanup_deleted_mentor(user_id: str, mentor_id: str) -> int:
+    """
+    Remove every stored file and the vector index of a deleted mentor.
+
+    Args:
+        user_id: ID of the mentor's owner
+        mentor_id: ID of the deleted mentor
+
+    Returns:
+        int: Number of storage objects removed
+    """
+    client = supabase()
+
+    delete_vector_index(mentor_id)
+
+    prefix = f"{user_id}/{mentor_id}"
+    paths = [f"{prefix}/{entry['name']}" for entry in _list_folder(client, prefix) if entry.get("id")]
+    removed = remove_storage_objects(client, paths)
+    logger.info(f"Cleaned up deleted mentor {mentor_id} ({removed} storage objects)")
+    return removed
+
+def _referenced_paths(client: Client, mentor_id: str) -> Set[str]:
+    """Storage paths of the files still referenced by a mentor's resources."""
+    response = client.table("resources").select("storage_path").eq("mentor_id", mentor_id).execute()
+    return {row["storage_path"] for row in response.data if row["storage_path"]}
+
+def _collect_orphaned_files(client: Client) -> int:
+    """Remove files under ``{user_id}/{mentor_id}/`` that no resource references."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.storage_gc_grace_seconds)
+    removed = 0
+
+    for user_entry in _list_folder(client, ""):
+        if user_entry.get("id"):
+            continue
+        user_id = user_entry["name"]
+
+        mentor_folders = [entry["name"] for entry in _list_folder(client, user_id) if not entry.get("id")]
+        if not mentor_folders:
+            continue
+
+        response = client.table("mentors").select("id").eq("user_id", user_id).execute()
+        existing_mentors = {str(row["id"]) for row in response.data}
+
+        for mentor_id in mentor_folders:
+            prefix = f"{user_id}/{mentor_id}"
+
+            # Young files may belong to an upload whose resource row is not written yet
+            candidates = [
+                f"{prefix}/{entry['name']}" for entry in _list_folder(client, prefix)
+                if entry.get("id") and _created_before(entry, cutoff)
+            ]
+            if not candidates:
+                continue
+
+            referenced = _referenced_paths(client, mentor_id) if mentor_id in existing_mentors else set()
+            orphans = [path for path in candidates if path not in referenced]
+            removed += remove_storage_objects(client, orphans)
+
+    return removed
+
+def _prune_vector_indexes(client: Client) -> int:
+    """
+    Drop local index data of deleted mentors and deleted resources.
+
+    Also brings each keyword index in line with its vector index
+    (backfilling indexes created before keyword search existed).
+    """
+    mentor_ids = list_vector_indexes()
+    pruned = 0
+
+    for start in range(0, len(mentor_ids), 100):
+        batch = mentor_ids[start:start + 100]
+        response = client.table("mentors").select("id, resources(id)").in_("id", batch).execute()
+        existing = {str(row["id"]): {str(resource["id"]) for resource in row["resources"]} for row in response.data}
+
+        for mentor_id in batch:
+            if mentor_id not in existing:
+                pruned += int(delete_vector_index(mentor_id))
+                continue
+
+            index = get_vector_index(mentor_id)
+            stale = index.resource_ids() - existing[mentor_id]
+            if stale:
+                index.remove_resources(stale)
+                pruned += 1
+            if index.sync_lexical():
+                pruned += 1
+
+    return pruned
+
+@celery_app.task(name="workers.storage_gc.collect_storage_garbage")
+def collect_storage_garbage() -> int:
+    """
+    Periodic sweep for storage objects and index data nothing refers to.
+
+    Catches what the per-delete cleanup misses: files of uploads whose
+    resource row was never created, cleanups that were lost because the
+    broker was down, and index data on this worker for deleted mentors or
+    resources. Files younger than ``storage_gc_grace_seconds`` are kept.
+
+    Returns:
+        int: Number of storage objects removed
+    """
+    client = supabase()
+
+    removed = _collect_orphaned_files(client)
+    pruned = _prune_vector_indexes(client)
+    logger.info(f"Storage GC removed {removed} orphaned objects and pruned {pruned} vector indexes")
+    return removed
@@ -0,0 +1,159 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from supabase import Client
+
+from app.core.config import settings
+from app.db.client import supabase
+from app.schemas.resource import ResourceStatus, ResourceType
+from app.services.cache import get_response_cache, mentor_resources_scope
+from app.services.chunking import chunk_text
+from app.services.embeddings import embed_chunks, get_embedding_cache, get_embedding_provider
+from app.services.extraction import extract_text
+from app.services.storage import STORAGE_BUCKET, owned_storage_path
+from app.services.url_fetch import fetch_url
+from app.services.vector_index import get_vector_index
+from workers.celery_app import celery_app
+from workers.enqueue import enqueue_quiz_refresh
+
+# Logger for debugging
+logger = logging.getLogger(__name__)
+
+def _claimable_filter() -> str:
+    """
+    PostgREST filter matching resources a worker may claim.
+
+    Pending resources are always claimable. Resources stuck in PROCESSING
+    longer than ``processing_stale_after_seconds`` (e.g. the worker died)
+    are claimable again.
+    """
+    stale_before = (
+        datetime.utcnow() - timedelta(seconds=settings.processing_stale_after_seconds)
+    ).isoformat()
+    return (
+        f"status.eq.{ResourceStatus.PENDING.value},"
+        f'and(status.eq.{ResourceStatus.PROCESSING.value},updated_at.lt."{stale_before}")'
+    )
+
+def _claim_resource(client: Client, resource_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Atomically move a resource to PROCESSING.
+
+    The status filter is part of the UPDATE, so when several workers race
+    for the same resource only one of them gets a row back.
+
+    Returns:
+        Optional[Dict[str, Any]]: The claimed resource row, or None if it was
+        already claimed, finished or deleted
+    """
+    response = client.table("resources").update({
+        "status": ResourceStatus.PROCESSING.value,
+        "updated_at": datetime.utcnow().isoformat()
+    }).eq("id", resource_id).or_(_claimable_filter()).execute()
+
+    return response.data[0] if response.data else None
+
+def _set_status(client: Client, resource_id: str, resource_status: ResourceStatus) -> None:
+    """Set the processing status of a resource."""
+    client.table("resources").update({
+        "status": resource_status.value,
+        "updated_at": datetime.utcnow().isoformat()
+    }).eq("id", resource_id).execute()
+
+def _invalidate_listing(mentor_id: str) -> None:
+    """Drop cached resource listings of a mentor after a status change."""
+    get_response_cache().invalidate_sync(mentor_resources_scope(mentor_id))
+
+def _download_content(client: Client, resource: Dict[str, Any]) -> bytes:
+    """
+    Download the raw content of a resource.
+
+    Uploaded files are read from the resources bucket, by their recorded
+    path and only inside the owner's folder for the mentor (the URL is user
+    input and never selects a stored object). URL resources are fetched
+    from public hosts only, see ``fetch_url``. YouTube links have no
+    downloadable content.
+
+    Raises:
+        ValueError: If the stored path is not the owner's or the URL is not allowed
+    """
+    if resource["type"] == ResourceType.YOUTUBE_LINK.value:
+        return b""
+
+    if resource.get("storage_path"):
+        mentor = client.table("mentors").select("user_id").eq("id", resource["mentor_id"]).execute()
+        owner_id = str(mentor.data[0]["user_id"]) if mentor.data else ""
+        storage_path = owned_storage_path(resource["storage_path"], owner_id, resource["mentor_id"])
+        if storage_path is None:
+            raise ValueError(f"Stored file {resource['storage_path']} is outside the mentor's folder")
+        return client.storage.from_(STORAGE_BUCKET).download(storage_path)
+
+    return fetch_url(resource["url"])
+
+@celery_app.task(name="workers.tasks.process_resource")
+def process_resource(resource_id: str) -> str:
+    """
+    Claim a resource and run it through the ingestion pipeline.
+
+    Moves the resource PENDING -> PROCESSING -> ANALYZED, or to ERROR if
+    download, extraction, embedding or indexing fails.
+
+    Args:
+        resource_id: ID of the resource to process
+
+    Returns:
+        str: Final status of the resource, or "skipped" if it was not claimable
+    """
+    client = supabase()
+
+    resource = _claim_resource(client, resource_id)
+    if resource is None:
+        logger.info(f"Resource {resource_id} is not claimable, skipping")
+        return "skipped"
+
+    _invalidate_listing(resource["mentor_id"])
+
+    try:
+        content = _download_content(client, resource)
+        text = extract_text(ResourceType(resource["type"]), content)
+        logger.info(f"Extracted {len(text)} characters from resource {resource_id}")
+
+        chunks = chunk_text(text)
+        if chunks:
+            result = embed_chunks(chunks, get_embedding_provider(), get_embedding_cache())
+            get_vector_index(resource["mentor_id"]).add(resource_id, chunks, result.vectors)
+    except Exception as e:
+        logger.error(f"Failed to process resource {resource_id}: {str(e)}")
+        _set_status(client, resource_id, ResourceStatus.ERROR)
+        _invalidate_listing(resource["mentor_id"])
+        return ResourceStatus.ERROR.value
+
+    _set_status(client, resource_id, ResourceStatus.ANALYZED)
+    _invalidate_listing(resource["mentor_id"])
+
+    # Generate quiz questions for the new resource ahead of quiz requests
+    enqueue_quiz_refresh(resource["mentor_id"])
+    return ResourceStatus.ANALYZED.value
+
+@celery_app.task(name="workers.tasks.enqueue_pending_resources")
+def enqueue_pending_resources(limit: int = 100) -> int:
+    """
+    Enqueue processing for claimable resources (periodic sweep).
+
+    Picks up resources whose enqueue from the API was lost and resources
+    left in PROCESSING by a crashed worker.
+
+    Args:
+        limit: Maximum number of resources to enqueue per sweep
+
+    Returns:
+        int: Number of resources enqueued
+    """
+    client = supabase()
+
+    response = client.table("resources").select("id").or_(_claimable_filter()).order("created_at").limit(limit).execute()
+
+    for row in response.data:
+        process_resource.delay(row["id"])
+
+    return len(response.data)
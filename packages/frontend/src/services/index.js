@@ -6,4 +6,4 @@ export * as resourceService from './resourceService';
 // Re-export specific functions for convenience
 export { login, logout, refreshToken, updateProfile } from './authService';
 export { getMentors, createMentor, getMentorById, updateMentor, deleteMentor } from './mentorService';
-export { getResources, uploadResource, uploadResourceFromUrl, deleteResource } from './resourceService'; 
\ No newline at end of file
+export { getResources, uploadResource, uploadResources, uploadResourceFromUrl, deleteResource } from './resourceService'; 
\ No newline at end of file
@@ -110,13 +110,17 @@ let mockMentors = [
   }
 ];
 
-// Get all mentors - REAL API CALL
-export const getMentors = async () => {
+// Get a page of mentors - REAL API CALL
+// Pass the previous page's nextCursor to load the next page
+export const getMentors = async (cursor = null) => {
   try {
-    const response = await api.get('/mentors/');
+    const response = await api.get('/mentors/', {
+      params: cursor ? { cursor } : {}
+    });
     return {
-      mentors: response.data,
-      totalCount: response.data.length,
+      mentors: response.data.items,
+      totalCount: response.data.items.length,
+      nextCursor: response.data.next_cursor,
       timestamp: new Date().toISOString()
     };
   } catch (error) {
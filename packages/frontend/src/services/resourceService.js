@@ -64,13 +64,17 @@ const formatFileSize = (bytes) => {
   return parseFloat((bytes / Math.pow(k, i)).toFixed(2)) + ' ' + sizes[i];
 };
 
-// Get resources for a specific mentor - REAL API CALL
-export const getResources = async (mentorId) => {
+// Get a page of resources for a specific mentor - REAL API CALL
+// Pass the previous page's nextCursor to load the next page
+export const getResources = async (mentorId, cursor = null) => {
   try {
-    const response = await api.get(`/resources/mentor/${mentorId}`);
+    const response = await api.get(`/resources/mentor/${mentorId}`, {
+      params: cursor ? { cursor } : {}
+    });
     return {
-      resources: response.data,
-      totalCount: response.data.length,
+      resources: response.data.items,
+      totalCount: response.data.items.length,
+      nextCursor: response.data.next_cursor,
       mentorId: mentorId,
       timestamp: new Date().toISOString()
     };
@@ -175,6 +179,76 @@ export const uploadResource = async (mentorId, file) => {
   }
 };
 
+// Upload several files to a mentor in one request - REAL API CALL
+// Returns one result per file ({ filename, resource, error }) so a failed
+// file doesn't discard the others
+export const uploadResources = async (mentorId, files) => {
+  try {
+    if (!files || files.length === 0) {
+      throw {
+        error: 'NO_FILE',
+        message: 'No se ha seleccionado ningún archivo'
+      };
+    }
+
+    if (!mentorId) {
+      throw {
+        error: 'NO_MENTOR_ID',
+        message: 'ID de mentor requerido'
+      };
+    }
+
+    // File size validation (max 50MB per file)
+    const maxSize = 50 * 1024 * 1024; // 50MB
+    const tooLarge = Array.from(files).find((file) => file.size > maxSize);
+    if (tooLarge) {
+      throw {
+        error: 'FILE_TOO_LARGE',
+        message: `El archivo ${tooLarge.name} es demasiado grande. Máximo 50MB.`
+      };
+    }
+
+    const formData = new FormData();
+    Array.from(files).forEach((file) => formData.append('files', file));
+    formData.append('mentor_id', mentorId);
+
+    const response = await api.post('/resources/upload/batch', formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+    });
+
+    return {
+      results: response.data,
+      resources: response.data.filter((result) => result.resource).map((result) => result.resource),
+      failed: response.data.filter((result) => result.error),
+      uploadedAt: new Date().toISOString()
+    };
+  } catch (error) {
+    console.error('Error uploading resources:', error);
+
+    if (error.response) {
+      throw {
+        error: 'API_ERROR',
+        message: error.response.data.detail || 'Error del servidor al subir archivos',
+        status: error.response.status
+      };
+    } else if (error.request) {
+      throw {
+        error: 'NETWORK_ERROR',
+        message: 'Error de conexión. Intenta nuevamente.'
+      };
+    } else if (error.error) {
+      throw error;
+    } else {
+      throw {
+        error: 'UNKNOWN_ERROR',
+        message: 'Error inesperado al subir archivos'
+      };
+    }
+  }
+};
+
 // Upload resource from URL
 export const uploadResourceFromUrl = async (mentorId, url, title) => {
   return new Promise((resolve, reject) => {
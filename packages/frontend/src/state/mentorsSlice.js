@@ -9,13 +9,25 @@ const compareIds = (id1, id2) => {
   return id1.toString() === id2.toString();
 };
 
+// Listings are paginated: follow nextCursor until the last page, so users
+// with more mentors or resources than fit in one page still get all of them
+const fetchAllPages = async (fetchPage, key) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const page = await fetchPage(cursor);
+    items.push(...page[key]);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return items;
+};
+
 // Async Thunk for fetching mentors from the API
 export const fetchMentors = createAsyncThunk(
   'mentors/fetchMentors',
   async (_, { rejectWithValue }) => {
     try {
-      const response = await getMentors();
-      return response.mentors;
+      return await fetchAllPages((cursor) => getMentors(cursor), 'mentors');
     } catch (error) {
       return rejectWithValue(error);
     }
@@ -53,10 +65,10 @@ export const fetchResourcesForMentor = createAsyncThunk(
   'mentors/fetchResourcesForMentor',
   async (mentorId, { rejectWithValue }) => {
     try {
-      const response = await getResources(mentorId);
+      const resources = await fetchAllPages((cursor) => getResources(mentorId, cursor), 'resources');
       return {
         mentorId,
-        resources: response.resources
+        resources
       };
     } catch (error) {
       return rejectWithValue(error);